@@ -0,0 +1,153 @@
+import math
+
+from src.event_bus import BALL_HIT, BALL_LOST, BRICK_DESTROYED, LEVEL_CLEARED
+from src.level_handler import LevelManager
+from src.level_pack import compile_level
+from src.sprite_engine.ball import ball_pool
+from src.sprite_engine.pools import release_group
+
+"""Helpers shared by the benchmarks that play a level with many balls.
+
+A benchmark must measure the same thing for its whole window, two ways to keep a level in play:
+RepeatLevel plays the level for real, bricks break and drop their powers and lost balls respawn like in the game, but
+a cleared level is loaded again instead of the next one. SteadyLevel is for the ball storms: the number of balls is
+what is measured, so a destroyed brick gets its hit back (the level is never cleared) and a lost ball is launched
+again from the bat. Bricks that can not break are not what a player sees, balls can bounce between them for a long
+time, use it only when the brick field does not matter.
+Both count the bricks broken, the balls lost and the ball hits by surface. check() is called after every frame or tick
+and records the first time the level is not what the benchmark asked for, a run with problems is reported as invalid.
+"""
+
+
+def launch(ball, angle: float):
+    """Sends the ball away from the bat, angle in degrees from straight up."""
+    angle = math.radians(angle)
+    ball.is_sticky = False
+    ball.velocity.x = ball.velocity.speed * math.sin(angle)
+    ball.velocity.y = -ball.velocity.speed * math.cos(angle)
+
+
+def release_balls(game_state, count: int):
+    """Turns the ball of the level into count balls leaving the bat at spread out angles."""
+    first = next(iter(game_state.ball_sprite_group))
+    coords = (first.rect.centerx, first.rect.centery, first.rect.w / 2)
+    for _ in range(count - 1):
+        game_state.ball_sprite_group.add(ball_pool.acquire(coords, game_state))
+    for idx, ball in enumerate(game_state.ball_sprite_group):
+        launch(ball, -60 + 120 * idx / max(count - 1, 1))
+
+
+def autopilot(game_state):
+    balls = game_state.ball_sprite_group.sprites()
+    bat = game_state.bat_sprite
+    if not balls or bat is None:
+        return
+    lowest = max(balls, key=lambda ball: ball.rect.bottom)
+    bat.set_position(lowest.rect.centerx - bat.rect.w / 2, bat.pos[1])
+
+
+def load_custom_level(runner, level_json: dict):
+    """start_game for a level that is not a file in assets/levels."""
+    game_state = runner._game_state
+    game_state.current_screen = "game"
+    handle = game_state.game_handle
+    handle.level = LevelManager(game_state)
+    handle.level.load_compiled = lambda: compile_level(level_json)
+    handle.level.load_level()
+
+
+class LevelMonitor:
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self.level = game_state.level
+        self.bricks_broken = 0
+        self.balls_lost = 0
+        self.hits: dict[str, int] = {}
+        self.problems: list[str] = []
+        game_state.events.subscribe(BRICK_DESTROYED, self.count_brick)
+        game_state.events.subscribe(BALL_LOST, self.count_ball_lost)
+        game_state.events.subscribe(BALL_HIT, self.count_hit)
+
+    def count_brick(self, tile):
+        self.bricks_broken += 1
+
+    def count_ball_lost(self):
+        self.balls_lost += 1
+
+    def count_hit(self, surface: str):
+        self.hits[surface] = self.hits.get(surface, 0) + 1
+
+    def check(self, step: int):
+        if not self.problems and self.game_state.level != self.level:
+            self.problems.append(f"step {step}: on level {self.game_state.level} instead of {self.level}")
+
+    def report(self) -> dict:
+        game_state = self.game_state
+        return {"level": game_state.level,
+                "bricks": len(game_state.tiles_group),
+                "bricks_broken": self.bricks_broken,
+                "balls": len(game_state.ball_sprite_group),
+                "balls_lost": self.balls_lost,
+                "hits": dict(self.hits),
+                "valid": not self.problems,
+                "problems": self.problems}
+
+
+class RepeatLevel(LevelMonitor):
+    def __init__(self, game_state, balls: int):
+        super().__init__(game_state)
+        self.balls = balls
+        self.loads = 0
+        handle = game_state.game_handle
+        game_state.events.unsubscribe(LEVEL_CLEARED, handle.on_level_cleared)
+        game_state.events.subscribe(LEVEL_CLEARED, self.on_level_cleared)
+
+    def on_level_cleared(self, level: int):
+        """GameScreen.on_level_cleared without moving to the next level, the balls are released again."""
+        game_state = self.game_state
+        handle = game_state.game_handle
+        game_state.scheduler.cancel(handle.respawn_timer)
+        handle.respawn_timer = None
+        release_group(game_state.ball_sprite_group)
+        release_group(game_state.bullets_group)
+        game_state.bat_sprite = None
+        handle.level.load_level()
+        release_balls(game_state, self.balls)
+        self.loads += 1
+
+    def report(self) -> dict:
+        return {**super().report(), "level_loads": self.loads}
+
+
+class SteadyLevel(LevelMonitor):
+    def __init__(self, game_state, balls: int):
+        super().__init__(game_state)
+        self.balls = balls
+        self.bricks = len(game_state.tiles_group)
+        self.radius = next(iter(game_state.ball_sprite_group)).rect.w / 2
+        handle = game_state.game_handle
+        game_state.events.unsubscribe(BRICK_DESTROYED, handle.on_brick_destroyed)
+        game_state.events.unsubscribe(BALL_LOST, handle.on_ball_lost)
+        game_state.events.subscribe(BRICK_DESTROYED, self.on_brick_destroyed)
+        game_state.events.subscribe(BALL_LOST, self.on_ball_lost)
+
+    def on_brick_destroyed(self, tile):
+        # not through the setter, that would announce a damaged brick
+        tile._hits_to_break = 1
+
+    def on_ball_lost(self):
+        bat = self.game_state.bat_sprite
+        coords = (bat.rect.centerx, bat.rect.top - self.radius * 2, self.radius)
+        ball = ball_pool.acquire(coords, self.game_state)
+        launch(ball, -60 + (self.balls_lost * 37) % 120)
+        self.game_state.ball_sprite_group.add(ball)
+
+    def check(self, step: int):
+        super().check(step)
+        if self.problems:
+            return
+        game_state = self.game_state
+        if len(game_state.ball_sprite_group) != self.balls:
+            self.problems.append(f"step {step}: {len(game_state.ball_sprite_group)} balls instead of {self.balls}")
+        if len(game_state.tiles_group) != self.bricks:
+            self.problems.append(f"step {step}: {len(game_state.tiles_group)} bricks instead of {self.bricks}")
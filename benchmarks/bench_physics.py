@@ -0,0 +1,101 @@
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from src.game_run import GameRunner, SIM_DT  # noqa: E402
+from bench_common import RepeatLevel, SteadyLevel, autopilot, load_custom_level, release_balls  # noqa: E402
+
+"""Compares the time the hand rolled and the pymunk physics backends spend moving and colliding the balls. Every run
+starts with the same random seed, releases BALLS balls from the bat at spread out angles and runs TICKS simulation
+ticks, the bat follows the lowest ball.
+
+The backends follow the same rules but bounce differently, after a few bounces the balls are not where they would be
+with the other backend, so the same level is not the same work for both: one can break many more bricks while the
+other spends its time on the bat. Two workloads:
+open: no bricks, only the walls and the bat, lost balls are launched again (SteadyLevel), closest to the same work.
+The hand backend still loses some balls the pymunk bat catches, a relaunch costs next to nothing.
+level1: level 1 played for real (RepeatLevel), bricks break and the level is loaded again when cleared.
+Every ball hit is counted by surface. A workload where the brick or the bat hits of the two backends differ by more
+than HIT_TOLERANCE is reported as not comparable and gets no ratio, a run that left its level is invalid. The script
+exits with 1 when a workload can not be compared.
+Run from the repository root: python benchmarks/bench_physics.py"""
+
+BALLS = 32
+TICKS = 1200
+HIT_TOLERANCE = 0.25
+OPEN_LEVEL = {"matrix": [[""] * 10 for _ in range(4)],
+              "num_powers": 0, "num_cols": 10, "num_rows": 4,
+              "double_hit_tiles": [], "background_music": None, "background_image": None,
+              "tiles_offsets": {"x": 0.05, "y": 0.1},
+              "tiles_dims": {"width": 0.08, "height": 0.04}}
+
+
+def run(backend: str, workload: str) -> dict:
+    runner = GameRunner(headless=True, resolution=(1920, 1080), physics=backend, seed=1)
+    game_state = runner._game_state
+    if workload == "open":
+        load_custom_level(runner, OPEN_LEVEL)
+        release_balls(game_state, BALLS)
+        level = SteadyLevel(game_state, BALLS)
+    else:
+        runner.start_game(1)
+        release_balls(game_state, BALLS)
+        level = RepeatLevel(game_state, BALLS)
+    ball_time = 0.0
+    update_balls = game_state.physics.update_balls
+
+    def timed(balls, dt):
+        nonlocal ball_time
+        start = time.perf_counter()
+        update_balls(balls, dt)
+        ball_time += time.perf_counter() - start
+    game_state.physics.update_balls = timed
+
+    start = time.perf_counter()
+    for tick in range(TICKS):
+        autopilot(game_state)
+        runner.simulation_step(SIM_DT)
+        game_state.events.dispatch()
+        level.check(tick)
+    total = time.perf_counter() - start
+    return {"backend": backend,
+            "tick_us": total / TICKS * 1e6,
+            "balls_us": ball_time / TICKS * 1e6,
+            **level.report()}
+
+
+def hit_gaps(hand: dict, pymunk: dict) -> list[str]:
+    """Surfaces where the hit counts of the two runs differ by more than HIT_TOLERANCE."""
+    gaps = []
+    for surface in ("brick", "paddle"):
+        counts = (hand["hits"].get(surface, 0), pymunk["hits"].get(surface, 0))
+        if abs(counts[0] - counts[1]) > HIT_TOLERANCE * max(counts):
+            gaps.append(f"{surface} hits {counts[0]} hand, {counts[1]} pymunk")
+    return gaps
+
+
+def compare(workload: str) -> bool:
+    """Runs the workload with both backends and prints the ratio, False when it can not be compared."""
+    results = [run(backend, workload) for backend in ("hand", "pymunk")]
+    for result in results:
+        hits = " ".join(f"{surface}={count}" for surface, count in sorted(result["hits"].items()))
+        print(f"{workload:>7} {result['backend']:>7} tick={result['tick_us']:8.1f}us "
+              f"balls={result['balls_us']:8.1f}us bricks_broken={result['bricks_broken']:>4} "
+              f"balls_lost={result['balls_lost']:>3} {hits}")
+    problems = [f"{result['backend']} " + "; ".join(result["problems"]) for result in results if result["problems"]]
+    problems += hit_gaps(*results)
+    if problems:
+        print(f"{workload:>7} pymunk/hand ball time: not comparable, " + "; ".join(problems))
+        return False
+    print(f"{workload:>7} pymunk/hand ball time: {results[1]['balls_us'] / results[0]['balls_us']:.2f}x")
+    return True
+
+
+def main() -> int:
+    comparable = [compare(workload) for workload in ("open", "level1")]
+    return 0 if all(comparable) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+
+import pygame  # noqa: E402
+
+import src.game_run as game_run  # noqa: E402
+from src.game_run import GameRunner, SIM_DT  # noqa: E402
+from src.level_handler import LevelManager  # noqa: E402
+from src.level_pack import level_pack  # noqa: E402
+from bench_common import RepeatLevel, SteadyLevel, autopilot, load_custom_level, release_balls  # noqa: E402
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+"""Scenario benchmarks of the real GameRunner update and draw path, headless. Every scenario loads a level, scripts
+the input (an autopilot keeps the bat under the lowest ball) and runs FRAMES frames of one fixed tick each, the first
+WARMUP frames are not measured. Each scenario runs in its own process so pools, caches and peak memory do not leak
+from one scenario into the next.
+
+Scenarios: every assets/levels/level*.json, a multi ball storm of 1 to 512 balls, continuous bullet fire, level 1
+cleared over and over by CLEAR_BALLS balls and a dense level of 5000 bricks. The levels, bullets, clears and dense
+scenarios are played for real: bricks break and drop powers and a cleared level is loaded again (RepeatLevel in
+benchmarks/bench_common.py). The ball storms keep the brick field and the number of balls the same for every frame
+(SteadyLevel). A run that left its level is invalid and fails.
+The report is json: per frame p50/p95/p99/mean in ms, the time per phase (simulation, events, ui, sprites, present
+and level_load, the level loads after a clear) in ms per frame, the peak resident memory in MB, the bricks broken,
+balls lost, ball hits by surface and level loads.
+
+Run from the repository root:
+    python benchmarks/bench_scenarios.py list
+    python benchmarks/bench_scenarios.py run --output baseline.json
+    python benchmarks/bench_scenarios.py run --scenario level1 --scenario balls_512 --output current.json
+    python benchmarks/bench_scenarios.py compare baseline.json current.json --threshold 0.1
+compare exits with 1 when a scenario got slower than the threshold on p50, p95 or p99.
+"""
+
+FRAMES = 600
+WARMUP = 60
+SEED = 1
+RESOLUTION = (1920, 1080)
+BALL_COUNTS = (1, 8, 64, 512)
+CLEAR_BALLS = 64
+PERCENTILES = ("p50", "p95", "p99")
+
+
+def dense_level(rows: int, cols: int) -> dict:
+    return {"matrix": [["blue"] * cols for _ in range(rows)],
+            "num_powers": 0, "num_cols": cols, "num_rows": rows,
+            "double_hit_tiles": [], "background_music": None, "background_image": None,
+            "tiles_offsets": {"x": 0.02, "y": 0.06},
+            "tiles_dims": {"width": 0.9 / cols / 1.08, "height": 0.6 / rows / 1.08}}
+
+
+def shipped_levels() -> list[int]:
+    return level_pack().levels()
+
+
+def scenario_names() -> list[str]:
+    return ([f"level{level}" for level in shipped_levels()] +
+            [f"balls_{count}" for count in BALL_COUNTS] +
+            ["bullets", "clears", "dense_5000"])
+
+
+def scenario_balls(name: str) -> int:
+    if name == "clears":
+        return CLEAR_BALLS
+    return int(name[6:]) if name.startswith("balls_") else 1
+
+
+def monitor(game_state, name: str) -> RepeatLevel | SteadyLevel:
+    if name.startswith("balls_"):
+        return SteadyLevel(game_state, scenario_balls(name))
+    return RepeatLevel(game_state, scenario_balls(name))
+
+
+def setup(runner: GameRunner, name: str):
+    """Loads the level of the scenario and returns the input script run before every frame."""
+    game_state = runner._game_state
+    if name.startswith("level"):
+        runner.start_game(int(name[5:]))
+        release_balls(game_state, 1)
+        return autopilot
+    if name.startswith("balls_") or name == "clears":
+        runner.start_game(1)
+        release_balls(game_state, scenario_balls(name))
+        return autopilot
+    if name == "bullets":
+        runner.start_game(1)
+        release_balls(game_state, 1)
+
+        def fire(game_state):
+            if game_state.bat_sprite is not None and game_state.bat_sprite.current_bat != "bullets":
+                game_state.bat_sprite.change_bat("bullets")
+            game_state.space_pressed = True
+            autopilot(game_state)
+        return fire
+    if name == "dense_5000":
+        load_custom_level(runner, dense_level(50, 100))
+        release_balls(game_state, 1)
+        return autopilot
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+class PhaseTimer:
+    """Wraps the functions of each phase of a frame and adds up the time spent in them. The time goes to the innermost
+    phase: a level load inside the events dispatch counts as level_load only, and a phase function calling another
+    function of the same phase (draw_tiles calling draw_group) is only counted once."""
+
+    def __init__(self):
+        self.totals: dict[str, float] = {}
+        self.stack: list[str] = []
+        self.since = 0.0
+
+    def wrap(self, phase: str, func):
+        self.totals[phase] = 0.0
+
+        def timed(*args, **kwargs):
+            if self.stack and self.stack[-1] == phase:
+                return func(*args, **kwargs)
+            self.__switch(phase)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.__switch(None)
+        return timed
+
+    def __switch(self, phase: str | None):
+        """Adds the time since the last switch to the running phase, then enters phase or leaves the running one."""
+        now = time.perf_counter()
+        if self.stack:
+            self.totals[self.stack[-1]] += now - self.since
+        if phase is None:
+            self.stack.pop()
+        else:
+            self.stack.append(phase)
+        self.since = now
+
+    def reset(self):
+        for phase in self.totals:
+            self.totals[phase] = 0.0
+
+
+def peak_memory_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_scenario(name: str, frames: int, physics: str, vectorised: bool, dirty_rects: bool) -> dict:
+    runner = GameRunner(headless=True, resolution=RESOLUTION, uncapped=True, seed=SEED, physics=physics,
+                        vectorised_balls=vectorised, dirty_rects=dirty_rects)
+    game_state = runner._game_state
+    script = setup(runner, name)
+    level = monitor(game_state, name)
+    phases = PhaseTimer()
+    runner.simulation_step = phases.wrap("simulation", runner.simulation_step)
+    game_state.events.dispatch = phases.wrap("events", game_state.events.dispatch)
+    LevelManager.load_level = phases.wrap("level_load", LevelManager.load_level)
+    runner.draw_tiles = phases.wrap("sprites", runner.draw_tiles)
+    runner.draw_group = phases.wrap("sprites", runner.draw_group)
+    game_run.draw_ui = phases.wrap("ui", game_run.draw_ui)
+    pygame.display.update = phases.wrap("present", pygame.display.update)
+    if runner._renderer is not None:
+        runner._renderer.present = phases.wrap("present", runner._renderer.present)
+    draw_frame = runner.draw_full_frame if runner._renderer is None else runner.draw_dirty_frame
+
+    frame_times = []
+    for frame in range(WARMUP + frames):
+        if frame == WARMUP:
+            phases.reset()
+        script(game_state)
+        start = time.perf_counter()
+        runner.calculate_mouse_pos()
+        draw_frame(SIM_DT)
+        if frame >= WARMUP:
+            frame_times.append((time.perf_counter() - start) * 1000)
+        level.check(frame)
+    return {"scenario": name,
+            "frames": frames,
+            "p50": percentile(frame_times, 50),
+            "p95": percentile(frame_times, 95),
+            "p99": percentile(frame_times, 99),
+            "mean": statistics.fmean(frame_times),
+            "phases": {phase: total * 1000 / frames for phase, total in phases.totals.items()},
+            "peak_memory_mb": peak_memory_mb(),
+            **level.report()}
+
+
+def run(args) -> int:
+    names = args.scenario or scenario_names()
+    results = {"settings": {"frames": args.frames, "physics": args.physics, "vectorised": args.vectorised,
+                            "dirty_rects": args.dirty_rects, "resolution": list(RESOLUTION)},
+               "scenarios": {}}
+    invalid = []
+    for name in names:
+        with tempfile.TemporaryDirectory() as tmp:
+            result_path = os.path.join(tmp, "result.json")
+            command = [sys.executable, __file__, "_child", name, result_path,
+                       "--frames", str(args.frames), "--physics", args.physics]
+            if args.vectorised:
+                command.append("--vectorised")
+            if args.dirty_rects:
+                command.append("--dirty-rects")
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+            with open(result_path) as fp:
+                result = json.load(fp)
+        results["scenarios"][name] = result
+        if not result["valid"]:
+            invalid.append(name)
+            print(f"{name:>12} INVALID " + "; ".join(result["problems"]), file=sys.stderr)
+            continue
+        print(f"{name:>12} p50={result['p50']:7.2f}ms p95={result['p95']:7.2f}ms p99={result['p99']:7.2f}ms "
+              f"mem={result['peak_memory_mb'] or 0:7.1f}MB level={result['level']} balls={result['balls']} "
+              f"broken={result['bricks_broken']} lost={result['balls_lost']} loads={result.get('level_loads', 0)}",
+              file=sys.stderr)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(output)
+    else:
+        print(output)
+    return 1 if invalid else 0
+
+
+def compare(args) -> int:
+    with open(args.baseline) as fp:
+        baseline = json.load(fp)["scenarios"]
+    with open(args.current) as fp:
+        current = json.load(fp)["scenarios"]
+    regressions = 0
+    for name, result in current.items():
+        if not result.get("valid", True) or not baseline.get(name, {}).get("valid", True):
+            regressions += 1
+            print(f"{name:>12} INVALID run, not compared")
+            continue
+        if name not in baseline:
+            print(f"{name:>12} no baseline")
+            continue
+        flags = []
+        for key in PERCENTILES:
+            ratio = result[key] / baseline[name][key] if baseline[name][key] else 1.0
+            if ratio > 1 + args.threshold:
+                flags.append(f"{key} {baseline[name][key]:.2f}->{result[key]:.2f}ms (+{(ratio - 1) * 100:.0f}%)")
+        if flags:
+            regressions += 1
+            print(f"{name:>12} REGRESSION " + ", ".join(flags))
+        else:
+            print(f"{name:>12} ok p50 {baseline[name]['p50']:.2f}->{result['p50']:.2f}ms")
+    return 1 if regressions else 0
+
+
+def child(args) -> int:
+    result = run_scenario(args.name, args.frames, args.physics, args.vectorised, args.dirty_rects)
+    with open(args.result_path, "w") as fp:
+        json.dump(result, fp)
+    return 0
+
+
+def add_run_options(parser):
+    parser.add_argument("--frames", type=int, default=FRAMES, help="measured frames per scenario")
+    parser.add_argument("--physics", choices=["hand", "pymunk"], default="hand")
+    parser.add_argument("--vectorised", action="store_true", help="numpy batched ball update")
+    parser.add_argument("--dirty-rects", action="store_true", help="dirty rectangle rendering")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Scenario benchmarks of the game loop")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="print the scenario names")
+    run_parser = commands.add_parser("run", help="run scenarios and report json")
+    run_parser.add_argument("--scenario", action="append", choices=scenario_names(),
+                            help="scenario to run, can be repeated, all by default")
+    run_parser.add_argument("--output", default=None, help="write the json here instead of stdout")
+    add_run_options(run_parser)
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown, 0.1 is 10%%")
+    child_parser = commands.add_parser("_child")
+    child_parser.add_argument("name")
+    child_parser.add_argument("result_path")
+    add_run_options(child_parser)
+    args = parser.parse_args()
+
+    match args.command:
+        case "list":
+            print("\n".join(scenario_names()))
+            return 0
+        case "run":
+            return run(args)
+        case "compare":
+            return compare(args)
+        case "_child":
+            return child(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import random
+import sys
+import timeit
+
+import pygame
+
+sys.path.insert(0, ".")
+
+from src.game_run import GameRunner  # noqa: E402
+from src.level_handler import LevelManager  # noqa: E402
+from src.level_pack import CompiledLevel, compile_level, level_pack  # noqa: E402
+
+"""Compares TileGrid.query with pygame.sprite.spritecollide for ball sized rects over the shipped levels and a
+dense synthetic level. Run from the repository root: python benchmarks/bench_tile_grid.py"""
+
+QUERIES = 20000
+
+
+class Probe(pygame.sprite.Sprite):
+    def __init__(self, rect: pygame.Rect):
+        super().__init__()
+        self.rect = rect
+
+
+def dense_level(rows: int, cols: int) -> dict:
+    return {"matrix": [["blue"] * cols for _ in range(rows)],
+            "num_powers": 0, "num_cols": cols, "num_rows": rows,
+            "double_hit_tiles": [], "background_music": None, "background_image": None,
+            "tiles_offsets": {"x": 0.02, "y": 0.06},
+            "tiles_dims": {"width": 0.9 / cols / 1.08, "height": 0.85 / rows / 1.08}}
+
+
+def load(game_state, compiled: CompiledLevel):
+    game_state.tiles_group.empty()
+    manager = LevelManager(game_state)
+    manager.build_level(compiled)
+    manager.initialize_random_powers()
+    manager.load_tiles()
+
+
+def bench(name: str, game_state):
+    rng = random.Random(1)
+    size = max(4, int(game_state.screen_width * 0.014))
+    probes = [Probe(pygame.Rect(rng.randrange(game_state.screen_width), rng.randrange(game_state.screen_height),
+                                size, size)) for _ in range(QUERIES)]
+    tiles_group, grid = game_state.tiles_group, game_state.tile_grid
+    for probe in probes:
+        expected = pygame.sprite.spritecollide(probe, tiles_group, dokill=False)
+        assert grid.query(probe.rect) == expected, f"{name}: grid and spritecollide disagree"
+    brute = timeit.timeit(lambda: [pygame.sprite.spritecollide(p, tiles_group, False) for p in probes], number=3)
+    gridded = timeit.timeit(lambda: [grid.query(p.rect) for p in probes], number=3)
+    per_query = 1e6 / (QUERIES * 3)
+    print(f"{name:>12} bricks={len(tiles_group):>5} spritecollide={brute * per_query:8.2f}us "
+          f"grid={gridded * per_query:6.2f}us speedup={brute / gridded:6.1f}x")
+
+
+def main():
+    runner = GameRunner(headless=True, resolution=(1920, 1080))
+    game_state = runner._game_state
+    pack = level_pack()
+    for level in pack.levels():
+        load(game_state, pack.get(level))
+        bench(f"level{level}", game_state)
+    load(game_state, compile_level(dense_level(50, 100), "dense"))
+    bench("dense", game_state)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,60 @@
+import argparse
+import sys
+
+from src.game_configs import PHYSICS_BACKEND
 from src.game_run import GameRunner
 
+
+def parse_resolution(value: str) -> tuple:
+    width, height = value.lower().split("x")
+    return (int(width), int(height))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="A python clone to breakout")
+    parser.add_argument("--compile-levels", action="store_true",
+                        help="validate the level jsons, build the level pack and exit")
+    parser.add_argument("--warm-cache", action="store_true",
+                        help="scale all the assets for this display into the disk cache and exit")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without a display or sound card using the SDL dummy drivers")
+    parser.add_argument("--resolution", type=parse_resolution, default=None,
+                        help="screen size as WIDTHxHEIGHT, windowed unless headless")
+    parser.add_argument("--uncapped", action="store_true", help="do not cap the frame rate")
+    parser.add_argument("--frames", type=int, default=None, help="quit after this many frames")
+    parser.add_argument("--level", type=int, default=None, help="skip the main menu and start this level")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the power placement")
+    parser.add_argument("--record", default=None, metavar="PATH", help="record the session to a replay file")
+    parser.add_argument("--replay", default=None, metavar="PATH", help="play back a replay file")
+    parser.add_argument("--trace", default=None, metavar="PATH",
+                        help="write a Chrome trace event json of the session")
+    parser.add_argument("--physics", choices=["hand", "pymunk"], default=PHYSICS_BACKEND,
+                        help="collision backend for the balls")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    game = GameRunner()
-    game.game_loop()
\ No newline at end of file
+    args = parse_args()
+    if args.compile_levels:
+        from src.level_pack import compile_pack, LevelError
+        try:
+            compile_pack()
+        except LevelError as error:
+            sys.exit(f"Invalid level: {error}")
+    elif args.warm_cache:
+        from src.asset_warmup import warm_up
+        warm_up()
+    else:
+        game = GameRunner(headless=args.headless,
+                          resolution=args.resolution,
+                          uncapped=args.uncapped,
+                          max_frames=args.frames,
+                          physics=args.physics,
+                          seed=args.seed,
+                          record=args.record,
+                          replay=args.replay,
+                          trace=args.trace)
+        level = game.replay_level if args.replay else args.level
+        if level is not None:
+            game.start_game(level)
+        game.game_loop()
@@ -0,0 +1,29 @@
+import pygame
+
+from src.game_state_management import GameState
+from src.level_handler import LevelManager
+from src.level_pack import level_pack
+from src.log_handle import get_logger
+from src.ui.ui_build import build_ui
+from src.utils.asset_cache import asset_cache
+
+logger = get_logger(__name__)
+
+"""Fills the on disk asset cache for the current display resolution, so that the first launch on a monitor
+does not pay for decoding and scaling all the images. Run it with `python main.py --warm-cache`."""
+
+
+def warm_up():
+    pygame.init()
+    game_state = GameState()
+    game_state.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN | pygame.DOUBLEBUF)
+    build_ui(game_state)
+    pack = level_pack()
+    for level in pack.levels():
+        game_state.level = level
+        manager = LevelManager(game_state)
+        manager.build_level(pack.get(level))
+        manager.preload_assets()
+        logger.info(f"Warmed up assets of level {level}")
+    asset_cache.log_stats()
+    pygame.quit()
@@ -0,0 +1,114 @@
+import math
+
+import pygame
+
+from src.game_configs import SOUND_CHANNELS, SOUND_VOLUMES, SOUND_MERGE_GAIN
+from src.log_handle import get_logger
+
+logger = get_logger(__name__)
+
+"""Voice pool for the sound effects. A fire ball or a swarm of balls can trigger dozens of bricks_hit, wall_hit and
+paddle_hit in a single frame, every one of them used to start on whatever channel pygame picked.
+
+Every category (ui, hits, events) owns a fixed range of reserved channels. play_sound only queues a trigger, triggers
+of the same sound within a frame are merged into one voice whose volume grows with the number of merged hits.
+flush() runs once per frame and starts the queued voices: on a free channel of the category if there is one,
+otherwise it steals the channel of the lowest priority (then oldest) voice when that priority is not above the new
+one, otherwise the voice is dropped. The work per frame is bounded by the number of distinct sounds, not by the
+number of hits. The counters in stats() show how much was merged, cooled down, stolen and dropped.
+"""
+
+
+class Voice:
+    __slots__ = ("name", "priority", "started")
+
+    def __init__(self, name: str, priority: int, started: float):
+        self.name = name
+        self.priority = priority
+        self.started = started
+
+
+class VoiceMixer:
+    def __init__(self, channels: dict[str, int]=SOUND_CHANNELS):
+        self.channel_counts = channels
+        self.pools: dict[str, list[pygame.mixer.Channel]] = {}
+        self.voices: dict[pygame.mixer.Channel, Voice] = {}
+        self._pending: dict[str, list] = {}
+        self._last_played: dict[str, float] = {}
+        self.counters = {"requested": 0, "merged": 0, "cooled": 0, "played": 0, "stolen": 0, "dropped": 0}
+
+    def __init_channels(self) -> bool:
+        """The channels are reserved on the first flush, the mixer is not always initialised when the mixer is built."""
+        if self.pools:
+            return True
+        if not pygame.mixer.get_init():
+            return False
+        total = sum(self.channel_counts.values())
+        pygame.mixer.set_num_channels(max(total, pygame.mixer.get_num_channels()))
+        pygame.mixer.set_reserved(total)
+        first = 0
+        for category, count in self.channel_counts.items():
+            self.pools[category] = [pygame.mixer.Channel(idx) for idx in range(first, first + count)]
+            first += count
+        return True
+
+    def request(self, name: str, sound: pygame.mixer.Sound, category: str, priority: int, cool_down: float,
+                now: float):
+        """Queues a trigger of name for this frame, merged with the triggers of the same sound already queued."""
+        self.counters["requested"] += 1
+        pending = self._pending.get(name)
+        if pending is not None:
+            pending[3] += 1
+            self.counters["merged"] += 1
+            return
+        if now - self._last_played.get(name, -math.inf) <= cool_down:
+            self.counters["cooled"] += 1
+            return
+        self._last_played[name] = now
+        self._pending[name] = [sound, category, priority, 1]
+
+    def __channel(self, category: str, priority: int) -> pygame.mixer.Channel | None:
+        pool = self.pools.get(category, ())
+        victim = None
+        for channel in pool:
+            if not channel.get_busy():
+                self.voices.pop(channel, None)
+                return channel
+            voice = self.voices.get(channel)
+            if voice is None:
+                continue
+            if victim is None or (voice.priority, voice.started) < (self.voices[victim].priority,
+                                                                   self.voices[victim].started):
+                victim = channel
+        if victim is not None and self.voices[victim].priority <= priority:
+            victim.stop()
+            self.counters["stolen"] += 1
+            return victim
+        return None
+
+    def flush(self, now: float):
+        """Starts the voices queued this frame, called once per frame."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        if not self.__init_channels():
+            return
+        for name, (sound, category, priority, hits) in sorted(pending.items(), key=lambda item: -item[1][2]):
+            channel = self.__channel(category, priority)
+            if channel is None:
+                self.counters["dropped"] += 1
+                continue
+            base = SOUND_VOLUMES.get(category, 1.0)
+            channel.set_volume(min(1.0, base * (1 + SOUND_MERGE_GAIN * math.log2(hits))))
+            channel.play(sound)
+            self.voices[channel] = Voice(name, priority, now)
+            self.counters["played"] += 1
+
+    def busy(self) -> dict[str, int]:
+        return {category: sum(channel.get_busy() for channel in pool) for category, pool in self.pools.items()}
+
+    def stats(self) -> dict:
+        return {**self.counters, "busy": self.busy()}
+
+    def log_stats(self):
+        logger.info(f"Voice mixer stats: {self.stats()}")
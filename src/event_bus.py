@@ -0,0 +1,74 @@
+from collections import defaultdict, deque
+from typing import Callable
+
+from src.log_handle import get_logger
+
+logger = get_logger(__name__)
+
+"""In process event bus for game events. The simulation code only says what happened (a brick lost a hit, a ball
+fell off the screen), the listeners decide what to do about it: spawning powers, killing bricks, playing sounds,
+respawning the ball, loading the next level. Nothing polls every brick or every group on every frame anymore.
+
+emit queues the event, GameRunner calls dispatch once per frame before drawing and every queued event is handed to
+its listeners in the order it was emitted. Events emitted by listeners are dispatched in the same batch.
+The payload of an event is its keyword arguments, the listeners get them as keyword arguments too.
+
+Events and their payload:
+    brick_damaged    tile              a brick lost a hit, by a ball or a bullet
+    brick_destroyed  tile              a brick has no hits left, it is still in tiles_group until a listener kills it
+    ball_hit         surface           a ball bounced on "wall", "paddle" or "brick"
+    ball_lost        -                 a ball fell below the screen, it is already back in its pool
+    power_collected  power_name        the bat caught a power
+    level_cleared    level             the last brick of the level is gone
+"""
+
+BRICK_DAMAGED = "brick_damaged"
+BRICK_DESTROYED = "brick_destroyed"
+BALL_HIT = "ball_hit"
+BALL_LOST = "ball_lost"
+POWER_COLLECTED = "power_collected"
+LEVEL_CLEARED = "level_cleared"
+
+EVENT_TYPES = (BRICK_DAMAGED, BRICK_DESTROYED, BALL_HIT, BALL_LOST, POWER_COLLECTED, LEVEL_CLEARED)
+
+MAX_DISPATCH = 10000
+
+
+class EventBus:
+    def __init__(self):
+        self._listeners: dict[str, list[Callable]] = defaultdict(list)
+        self._queue: deque[tuple[str, dict]] = deque()
+        self.emitted = 0
+
+    def subscribe(self, event_type: str, listener: Callable):
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type: {event_type}")
+        self._listeners[event_type].append(listener)
+
+    def unsubscribe(self, event_type: str, listener: Callable):
+        if listener in self._listeners[event_type]:
+            self._listeners[event_type].remove(listener)
+
+    def emit(self, event_type: str, **payload):
+        self._queue.append((event_type, payload))
+        self.emitted += 1
+
+    def dispatch(self) -> int:
+        """Hands the queued events to their listeners, returns how many were dispatched. A listener emitting
+        events forever would hang the game, we stop after MAX_DISPATCH events and keep the rest for next frame."""
+        queue = self._queue
+        count = 0
+        while queue and count < MAX_DISPATCH:
+            event_type, payload = queue.popleft()
+            for listener in self._listeners.get(event_type, ()):
+                listener(**payload)
+            count += 1
+        if queue:
+            logger.warning(f"{len(queue)} events left in the queue after dispatching {count}")
+        return count
+
+    def clear(self):
+        self._queue.clear()
+
+    def __len__(self) -> int:
+        return len(self._queue)
@@ -39,6 +39,8 @@ class EventHandler:
                 self._game_state.space_pressed = True
             case pygame.K_BACKSPACE:
                 self._game_state.current_screen="main_menu"
+            case pygame.K_F3:
+                self._game_state.profiler.toggle()
 
     def key_up(self, event):
         """Handles key up events"""
@@ -1,5 +1,6 @@
 import math
 import os
+from collections.abc import Mapping
 
 TILES_PATH = "assets/tiles/tile_sprites/"
 LEVELS_PATH = "assets/levels/"
@@ -13,8 +14,29 @@ def map_files_list(path):
         item_dict[item] = path + item
     return item_dict
 
-TILES_DICT = map_files_list(TILES_PATH)
-LEVELS_DICT = map_files_list(LEVELS_PATH)
+
+class FilesMap(Mapping):
+    """map_files_list of path, the directory is listed the first time the map is used instead of on import."""
+
+    def __init__(self, path):
+        self.path = path
+        self._items = None
+
+    def __items(self):
+        if self._items is None:
+            self._items = map_files_list(self.path)
+        return self._items
+
+    def __getitem__(self, key):
+        return self.__items()[key]
+
+    def __iter__(self):
+        return iter(self.__items())
+
+    def __len__(self):
+        return len(self.__items())
+
+TILES_DICT = FilesMap(TILES_PATH)
 
 BULLETS_BAT = ["assets/tiles/bats/bullets.png", 
                'assets/tiles/bats/bullets2.png',
@@ -41,4 +63,47 @@ BULLET_SPEED = 660
 POWER_FALL_SPEED = 310
 BAT_MOVEMENT_SPEED = 660
 BALL_SPEED = 12
-MAX_ANGLE = math.radians(60)
\ No newline at end of file
+MAX_ANGLE = math.radians(60)
+ASSET_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DIRTY_RECT_RENDERING = False
+TEXT_CACHE_MAX_ENTRIES = 256
+DISK_CACHE_ENABLED = True
+DISK_CACHE_PATH = ".asset_cache/"
+SIMULATION_HZ = 60
+MAX_FRAME_TIME = 0.25
+VECTORISED_BALLS = False
+POOL_PREWARM = {"ball": 8, "bullet": 24, "power": 8}
+POOL_MAX_FREE = 256
+PHYSICS_BACKEND = "hand"
+PYMUNK_SUBSTEPS = 4
+BALL_RESPAWN_DELAY = 2000
+PROFILER_HISTORY = 240
+TRACE_FLUSH_EVENTS = 4096
+LOG_FILE = "game.log"
+LOG_LEVELS = {"": "INFO"}
+LOG_THROTTLE = 1.0
+PREFETCH_LEVELS = True
+PREFETCH_WORKERS = 2
+LEVEL_PACK_PATH = ".level_cache/levels.pack"
+SOUND_LOADERS = 1
+# load: decode order, menu first. category: channel pool of SOUND_CHANNELS. priority: higher steals lower voices
+# resident: kept decoded, otherwise kept compressed and decoded on demand within AUDIO_BUDGET_BYTES
+SOUND_MANIFEST = {"button_hover": {"file": "option_select.wav", "cool_down": 100, "load": 0,
+                                   "category": "ui", "priority": 1, "resident": False},
+                  "bricks_hit": {"file": "bricks_hit.mp3", "cool_down": 100, "load": 1,
+                                 "category": "hits", "priority": 1, "resident": True},
+                  "paddle_hit": {"file": "paddle_hit.mp3", "cool_down": 100, "load": 1,
+                                 "category": "hits", "priority": 2, "resident": True},
+                  "wall_hit": {"file": "wall_hit.mp3", "cool_down": 100, "load": 1,
+                               "category": "hits", "priority": 1, "resident": True},
+                  "bullet": {"file": "bullet.mp3", "cool_down": 100, "load": 2,
+                             "category": "hits", "priority": 0, "resident": True},
+                  "power_gain": {"file": "game_start.mp3", "cool_down": 100, "load": 2,
+                                 "category": "events", "priority": 2, "resident": False},
+                  "ball_dead": {"file": "ball_dead.wav", "cool_down": 100, "load": 2,
+                                "category": "events", "priority": 3, "resident": False}}
+SOUND_CHANNELS = {"ui": 1, "hits": 6, "events": 2}
+# volume of a single trigger per category, merged triggers raise it by SOUND_MERGE_GAIN per doubling, up to 1.0
+SOUND_VOLUMES = {"ui": 1.0, "hits": 0.7, "events": 1.0}
+SOUND_MERGE_GAIN = 0.2
+AUDIO_BUDGET_BYTES = 4 * 1024 * 1024
@@ -1,68 +1,337 @@
+import os
+import random
+import time
+
 import pygame
 
 from src.event_management import EventHandler
 from src.game_state_management import GameState
 from src.ui.ui_build import build_ui
-from src.ui.ui_handle import draw_ui, initialize_ui_handles
-from src.sound_manager import SoundManager
+from src.ui.ui_handle import draw_ui, update_ui, initialize_ui_handles
+from src.sound_manager import SoundManager, NullSoundManager
 from src.log_handle import get_logger
+from src.game_configs import DIRTY_RECT_RENDERING, SIMULATION_HZ, MAX_FRAME_TIME, VECTORISED_BALLS, PHYSICS_BACKEND, \
+    PREFETCH_LEVELS
+from src.sprite_engine.ball_swarm import create_ball_group
+from src.sprite_engine.interpolation import render_rect
+from src.sprite_engine.physics import create_physics, HAND
+from src.utils.dirty_rects import DirtyRectRenderer
+from src.utils import text_cache
+from src.utils.game_profiling import PerformanceOverlay
+from src.utils.tracing import Tracer
+from src.level_prefetch import LevelPrefetcher
+from src.utils.sound_utils import subscribe_sounds
+from src.replay import ReplayRecorder, ReplayPlayer
 
 logger = get_logger(__name__)
 
+SIM_DT = 1 / SIMULATION_HZ
+GROUP_NAMES = ("bat", "balls", "powers", "bullets")
+
 """
 This module contains the class GameRunner, this class has the method that starts the game loop.
 This is the entry point where pygame is initialized and all the required game objects are created.
-The gameloop updates the state and runs 60 times a second.
+The gameloop draws as fast as the FPS cap allows, the simulation runs on a fixed tick of SIMULATION_HZ.
+With dirty_rects=True only the parts of the screen that changed are redrawn and pushed to the display,
+check src/utils/dirty_rects.py.
+
+headless=True selects the SDL dummy video and audio drivers, so the real update and draw code runs on machines without
+a display or a sound card (benchmarks, soak tests). The screen is an offscreen surface of the given resolution, sounds
+are disabled and with uncapped=True the loop does not wait for the FPS cap.
+
+vectorised_balls=True updates all the balls in one numpy batch, check src/sprite_engine/ball_swarm.py.
+physics picks the collision backend, "hand" or "pymunk", check src/sprite_engine/physics.py.
+The events emitted during the ticks of a frame are dispatched in one batch before drawing, check src/event_bus.py.
+The game clock and timers (src/scheduler.py) advance with the simulation ticks, so they stop while the game is paused.
+
+record=path saves the input, frame times and level seed of the session to a replay file, replay=path plays one back
+instead of reading the clock and the keyboard, with the resolution, physics and seed it was recorded with.
+Check src/replay.py.
+
+F3 toggles the performance overlay, every phase of the loop (events, draw_ui, update and draw of each sprite group,
+display update) is timed by game_state.profiler while it is shown. Check src/utils/frame_profiler.py.
+The next level is prefetched while a level is played (prefetch=True), check src/level_prefetch.py.
+trace=path writes those phases, level loads and game events as a Chrome trace, check src/utils/tracing.py.
 """
 
 
 class GameRunner:
-    def __init__(self):
+    def __init__(self,
+                 dirty_rects: bool=DIRTY_RECT_RENDERING,
+                 headless: bool=False,
+                 resolution: tuple | None=None,
+                 uncapped: bool=False,
+                 max_frames: int | None=None,
+                 vectorised_balls: bool=VECTORISED_BALLS,
+                 physics: str=PHYSICS_BACKEND,
+                 seed: int | None=None,
+                 record: str | None=None,
+                 replay: str | None=None,
+                 trace: str | None=None,
+                 prefetch: bool=PREFETCH_LEVELS):
+        self._player = ReplayPlayer.load(replay) if replay else None
+        if self._player is not None:
+            header = self._player.header
+            resolution = tuple(header["resolution"])
+            physics = header["physics"]
+            vectorised_balls = header["vectorised_balls"]
+            seed = header["seed"]
         self._game_state = GameState()
+        self._game_state.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self._game_state.rng.seed(self._game_state.seed)
+        self._game_state.physics = create_physics(self._game_state, physics)
+        self._game_state.prefetcher = LevelPrefetcher() if prefetch else None
+        if vectorised_balls and physics != HAND:
+            logger.warning(f"Vectorised balls only work with the hand physics, not with {physics}")
+            vectorised_balls = False
+        self._game_state.ball_sprite_group = create_ball_group(self._game_state, vectorised_balls)
         self._event_handler = EventHandler(self._game_state)
+        self.headless = headless
+        self.uncapped = uncapped
+        self.max_frames = max_frames
+        self.frame_count = 0
+        self._accumulator = 0.0
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
         pygame.init()
-        self._screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN | pygame.DOUBLEBUF)
+        self._screen = self.__create_screen(resolution)
         pygame.display.set_caption("Breakout")
         self._game_state.screen = self._screen
         build_ui(self._game_state)
         initialize_ui_handles(self._game_state)
-        self._game_state.sound_manager = SoundManager()
+        self._game_state.sound_manager = NullSoundManager() if headless else SoundManager(self._game_state.scheduler)
         self._game_state.sound_manager.play_music()
-        self._font = pygame.font.Font(None, 24)
+        subscribe_sounds(self._game_state)
+        self._font = text_cache.get_font(None, 24)
+        self._renderer = DirtyRectRenderer(self._screen) if dirty_rects else None
+        self._overlay = PerformanceOverlay(self._screen.get_width())
+        if trace:
+            self._game_state.tracer = Tracer(trace)
+            self._game_state.tracer.subscribe(self._game_state.events)
+            self._game_state.profiler.attach_tracer(self._game_state.tracer)
+        self._recorder = None
+        if record:
+            self._recorder = ReplayRecorder(record, {"seed": self._game_state.seed,
+                                                     "level": None,
+                                                     "resolution": list(self._screen.get_size()),
+                                                     "physics": physics,
+                                                     "vectorised_balls": vectorised_balls})
+
+    def __create_screen(self, resolution: tuple | None) -> pygame.Surface:
+        if self.headless:
+            return pygame.display.set_mode(resolution or (1920, 1080))
+        if resolution:
+            return pygame.display.set_mode(resolution, pygame.DOUBLEBUF)
+        return pygame.display.set_mode((0, 0), pygame.FULLSCREEN | pygame.DOUBLEBUF)
 
-    def event_loop(self):
-        """Iterates the events and calls handle_events method"""
-        events = pygame.event.get()
+    @property
+    def replay_level(self) -> int | None:
+        """Level the replayed session started on with start_game, None when it started on the main menu."""
+        return self._player.header["level"] if self._player is not None else None
+
+    def start_game(self, level: int=1):
+        """Skips the main menu and loads the level, the headless mode has nobody to press PLAY."""
+        if self._recorder is not None:
+            self._recorder.header["level"] = level
+        self._game_state.level = level
+        self._game_state.current_screen = "game"
+        self._game_state.game_handle.load_game_screen()
+
+    def event_loop(self, events: list | None=None):
+        """Iterates the events and calls handle_events method. A replay passes the recorded events,
+        the queue is still pumped so the window keeps responding."""
+        if events is None:
+            events = pygame.event.get()
+        else:
+            pygame.event.pump()
         for event in events:
-            self._event_handler.handle_events(event)
+            handled = self._event_handler.handle_events(event)
+            if handled and self._recorder is not None:
+                self._recorder.record_event(event)
 
     def calculate_mouse_pos(self):
+        if self._player is not None:
+            self._game_state.mouse_pos = self._player.mouse_pos
+            return
         self._game_state.mouse_pos = pygame.mouse.get_pos()
 
-    def update_sprite_groups(self, dt):
-        def update_and_draw(group, **kwargs):
+    def final_state(self) -> dict:
+        """What a replay must reproduce, json friendly so it can be compared with the recorded one."""
+        game_state = self._game_state
+        bat = game_state.bat_sprite
+        return {"frames": self.frame_count,
+                "level": game_state.level,
+                "sim_time": game_state.scheduler.now,
+                "bricks": len(game_state.tiles_group),
+                "balls": sorted([list(ball.pos) for ball in game_state.ball_sprite_group]),
+                "bat": list(bat.pos) if bat is not None else None,
+                "powers": len(game_state.powers_group),
+                "bullets": len(game_state.bullets_group)}
+
+    def draw_group(self, group, alpha: float=1.0):
+        """Draws the group (or a single sprite like the bat) at the interpolated positions."""
+        sprites = group.sprites() if isinstance(group, pygame.sprite.AbstractGroup) else [group]
+        if self._renderer is not None:
+            for sprite in sprites:
+                self._renderer.add(sprite, sprite.image, render_rect(sprite, alpha))
+            return
+        self._screen.blits([(sprite.image, render_rect(sprite, alpha)) for sprite in sprites], doreturn=False)
+
+    def draw_tiles(self):
+        """On the game screen the tiles are already part of the brick layer drawn by draw_ui,
+        we only copy the rects of the bricks that changed during this update."""
+        brick_layer = self._game_state.brick_layer
+        if brick_layer is None:
+            self.draw_group(self._game_state.tiles_group)
+            return
+        damaged = brick_layer.pop_damage()
+        if self._game_state.current_screen != "game":
+            self.draw_group(self._game_state.tiles_group)
+            return
+        if self._renderer is not None:
+            self._renderer.patch_background(brick_layer.surface, damaged)
+            return
+        for rect in damaged:
+            self._screen.blit(brick_layer.surface, rect, rect)
+
+    def moving_groups(self) -> list:
+        """Sprite groups in update and draw order, the tiles are handled separately."""
+        return [self._game_state.bat_sprite,
+                self._game_state.ball_sprite_group,
+                self._game_state.powers_group,
+                self._game_state.bullets_group]
+
+    def simulation_step(self, dt: float):
+        """One fixed tick of the game simulation, dt is always SIM_DT."""
+        game_state = self._game_state
+        profiler = game_state.profiler
+        profiling = profiler.enabled
+        game_state.scheduler.advance(dt * 1000)
+        if profiling:
+            profiler.mark("timers")
+        for name, group in zip(GROUP_NAMES, self.moving_groups()):
             if group is None:
-                return
-            if not self._game_state.is_paused:
-                group.update(**kwargs)
-            group.draw(self._screen)
-        
-        update_and_draw(self._game_state.tiles_group)
-        update_and_draw(self._game_state.bat_sprite, dt=dt)
-        update_and_draw(self._game_state.ball_sprite_group, dt=dt)
-        update_and_draw(self._game_state.powers_group, dt=dt)
-        update_and_draw(self._game_state.bullets_group, dt=dt)
+                continue
+            if group is game_state.ball_sprite_group:
+                game_state.physics.update_balls(group, dt)
+            else:
+                group.update(dt=dt)
+            if profiling:
+                profiler.mark(f"update_{name}")
+
+    def update_sprite_groups(self, dt):
+        """The frame time is added to the accumulator and the simulation runs as many fixed ticks as fit in it.
+        Whatever is left is the fraction of the next tick, the sprites are drawn interpolated by that fraction.
+        This way the game plays the same at 30, 60 or 144 FPS and when frames get skipped."""
+        if not self._game_state.is_paused:
+            self._accumulator += min(dt, MAX_FRAME_TIME)
+            while self._accumulator >= SIM_DT:
+                self.simulation_step(SIM_DT)
+                self._accumulator -= SIM_DT
+        profiler = self._game_state.profiler
+        profiling = profiler.enabled
+        self._game_state.events.dispatch()
+        if profiling:
+            profiler.mark("dispatch")
+        alpha = self._accumulator / SIM_DT
+        self.draw_tiles()
+        if profiling:
+            profiler.mark("draw_tiles")
+        for name, group in zip(GROUP_NAMES, self.moving_groups()):
+            if group is not None:
+                self.draw_group(group, alpha)
+                if profiling:
+                    profiler.mark(f"draw_{name}")
+        if profiler.show_overlay:
+            self.draw_overlay()
+            profiler.mark("overlay")
+
+    def draw_overlay(self):
+        panel = self._overlay.render(self._game_state.profiler, self._game_state.sound_manager.stats())
+        if self._renderer is not None:
+            self._renderer.add(self._overlay, panel, self._overlay.rect)
+            return
+        self._screen.blit(panel, self._overlay.rect)
+
+    def draw_full_frame(self, dt):
+        profiler = self._game_state.profiler
+        update_ui(self._game_state)
+        self._screen.fill((0, 0, 0))
+        draw_ui(game_state=self._game_state)
+        if profiler.enabled:
+            profiler.mark("draw_ui")
+        self.update_sprite_groups(dt)
+        pygame.display.update()
+        if profiler.enabled:
+            profiler.mark("display_update")
+
+    def draw_dirty_frame(self, dt):
+        """Same pixels as draw_full_frame, but the background is reused and only changed rects are updated."""
+        profiler = self._game_state.profiler
+        update_ui(self._game_state)
+        background_valid = self._renderer.begin_frame(self._game_state)
+        if background_valid:
+            draw_ui(game_state=self._game_state, draw=False)
+        else:
+            self._screen.fill((0, 0, 0))
+            draw_ui(game_state=self._game_state)
+            self._renderer.snapshot_background()
+        if profiler.enabled:
+            profiler.mark("draw_ui")
+        self.update_sprite_groups(dt)
+        self._renderer.present()
+        if profiler.enabled:
+            profiler.mark("display_update")
 
     def game_loop(self):
         """The main game loop."""
         clock = pygame.time.Clock()
+        started = time.perf_counter()
         while self._game_state.running:
-            dt = clock.tick(self._game_state.FPS) / 1000
-            self.event_loop()
-            self._screen.fill((0, 0, 0))
+            dt = clock.tick(0 if self.uncapped else self._game_state.FPS) / 1000
+            events = None
+            if self._player is not None:
+                frame = self._player.next_frame()
+                if frame is None:
+                    break
+                dt, events = frame
+            if self.max_frames is not None and self.frame_count >= self.max_frames:
+                break
+            self.frame_count += 1
+            profiler = self._game_state.profiler
+            profiling = profiler.enabled
+            if profiling:
+                profiler.begin_frame()
+            self.event_loop(events)
             self.calculate_mouse_pos()
-            draw_ui(game_state=self._game_state)
-            self.update_sprite_groups(dt)
-            pygame.display.update()
-            
+            if profiling:
+                profiler.mark("event_loop")
+            if self._renderer is None:
+                self.draw_full_frame(dt)
+            else:
+                self.draw_dirty_frame(dt)
+            self._game_state.sound_manager.update()
+            if profiling and profiler.enabled:
+                profiler.mark("audio")
+                profiler.end_frame()
+            if self._recorder is not None:
+                self._recorder.end_frame(dt, self._game_state.mouse_pos)
+
+        self.finish_session(time.perf_counter() - started)
+        if self._game_state.tracer is not None:
+            self._game_state.tracer.close()
+        if self._game_state.prefetcher is not None:
+            self._game_state.prefetcher.shutdown()
+        self._game_state.sound_manager.shutdown()
         pygame.quit()
+
+    def finish_session(self, wall_time: float):
+        """Saves the recording or checks the replay against it."""
+        if self._recorder is None and self._player is None:
+            return
+        stats = {"wall_time": wall_time, "mean_frame_ms": wall_time * 1000 / max(self.frame_count, 1)}
+        if self._recorder is not None:
+            self._recorder.save(self.final_state(), stats)
+        if self._player is not None:
+            self._player.compare(self.final_state(), stats)
@@ -1,9 +1,14 @@
+import random
 from typing import Any
 
 from pygame import Surface
 from pygame.sprite import Group
 import pymunk
 
+from src.event_bus import EventBus
+from src.scheduler import Scheduler
+from src.utils.frame_profiler import FrameProfiler
+
 """This module contains a class named GameState, this object is very useful because it maintains global variables.
 We created this so that we need not to pass too many values to constructor of different objects.
 all the objects will use important variables from this object."""
@@ -30,13 +35,23 @@ class GameState:
         self._enter_pressed = False
         self.space_pressed = False
         self.tiles_group = Group()
+        self.brick_layer = None
+        self.tile_grid = None
         self.bat_sprite = None
         self.ball_sprite_group = Group()
         self.powers_group = Group()
         self.bullets_group = Group()
         self.walls = {}
         self.level = 1
+        self.seed: int | None = None
+        self.rng = random.Random()
         self.space = pymunk.Space()
+        self.physics = None
+        self.events = EventBus()
+        self.scheduler = Scheduler()
+        self.profiler = FrameProfiler()
+        self.tracer = None
+        self.prefetcher = None
         self.is_paused = False
 
     @property
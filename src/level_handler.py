@@ -1,72 +1,87 @@
-import json
-import random
 from pygame.rect import Rect
 
 from src.game_state_management import GameState
 from src.sprite_engine.tiles import Tile
 from src.sprite_engine.player import Bat
-from src.sprite_engine.ball import Ball
+from src.sprite_engine.ball import Ball, ball_pool
+from src.sprite_engine.bullets import bullet_pool
+from src.sprite_engine.powers import power_pool
+from src.sprite_engine.pools import log_pool_stats
+from src.sprite_engine.brick_layer import BrickLayer
+from src.sprite_engine.tile_grid import TileGrid
 from src.utils.sound_utils import change_background_music
-from src.game_configs import POWERS
+from src.game_configs import POWERS, TILES_DICT, BULLETS, POOL_PREWARM
+from src.utils.asset_cache import asset_cache, load_image
+from src.utils.draw_utils import set_rect_background
+from src.utils.tracing import trace_span
+from src.level_pack import CompiledLevel, compile_level, level_pack
 
 class LevelManager:
     def __init__(self, game_state: GameState):
         self.game_state = game_state
         self.powers_list = list(POWERS.keys())
 
-    def load_json(self):
-        """Loads level json from assets/level. Make sure that level jsons file names follow this pattern
-        levelx.json ex: level1.json, level2.json andso on. Because we semi hardcoded the path hahahaha"""
-        level = self.game_state.level
-        path = f"assets/levels/level{level}.json"
-        with open(path) as fp:
-            level_json = json.load(fp)
-        return level_json
-    
+    def load_compiled(self) -> CompiledLevel:
+        """The current level from the compiled level pack of assets/levels, level jsons file names follow this
+        pattern levelx.json ex: level1.json, level2.json andso on. Check src/level_pack.py."""
+        return level_pack().get(self.game_state.level)
+
     def build_level_json(self, level_json: dict):
-        """Reading all the fields of the json, makes it little easy."""
-        self.num_rows = level_json['num_rows']
-        self.num_cols = level_json['num_cols']
-        self.double_hit_tiles = level_json['double_hit_tiles']
-        self.num_powers = level_json['num_powers']
-        self.background_music = level_json['background_music']
-        self.background_image = level_json['background_image']
-        self.matrix = level_json['matrix']
-        self.tile_offsets = level_json['tiles_offsets']
-        self.tile_width = level_json['tiles_dims']['width']
-        self.tile_height = level_json['tiles_dims']['height']
-        self.bat_placement = level_json.get("bat_placement", (0.45, 0.93))
-        self.ball_placement = level_json.get("ball_placement", (0.5, 0.92))
-        self.bat_dims = level_json.get("bat_dims", (0.09, 0.025))
-        self.ball_dims = level_json.get("ball_dims", (0.007, 0.007))
+        """For levels that are not in the pack, the json is validated and compiled first."""
+        self.build_level(compile_level(level_json))
+
+    def build_level(self, compiled: CompiledLevel):
+        """Reading all the fields of the compiled level, makes it little easy."""
+        self.compiled = compiled
+        self.num_rows = compiled.num_rows
+        self.num_cols = compiled.num_cols
+        self.num_powers = compiled.num_powers
+        self.background_music = compiled.background_music
+        self.background_image = compiled.background_image
+        self.tile_offsets = compiled.tiles_offsets
+        self.tile_width = compiled.tiles_dims['width']
+        self.tile_height = compiled.tiles_dims['height']
+        self.bat_placement = compiled.bat_placement
+        self.ball_placement = compiled.ball_placement
+        self.bat_dims = compiled.bat_dims
+        self.ball_dims = compiled.ball_dims
 
     def initialize_random_powers(self):
-        """We have several powers that will be assigned to random matrix cells. Not implemented yet.
-        Will implement it once i get the game physics going."""
-        self.powers = []
+        """We have several powers that will be assigned to random matrix cells. The cells come from the seeded
+        game_state.rng so a replay places the same powers."""
+        self.powers = set()
         for x in range(self.num_powers):
-            random_x = random.randrange(0, self.num_rows)
-            random_y = random.randrange(0, self.num_cols)
-            self.powers.append((random_x, random_y))
+            random_x = self.game_state.rng.randrange(0, self.num_rows)
+            random_y = self.game_state.rng.randrange(0, self.num_cols)
+            self.powers.add((random_x, random_y))
 
     def __load_power(self, idx1, idx2):
         if (idx1, idx2) in self.powers:
-            return random.choice(self.powers_list)
+            return self.game_state.rng.choice(self.powers_list)
         
+    def tile_dims(self) -> tuple:
+        w = self.tile_width * self.game_state.screen_width
+        h = self.tile_height * self.game_state.screen_height
+        return (w, h)
+
     def load_tiles(self):
         start_x = self.game_state.screen_width * self.tile_offsets['x']
         start_y = self.game_state.screen_height * self.tile_offsets['y']
-        w = self.tile_width * self.game_state.screen_width
-        h = self.tile_height * self.game_state.screen_height
+        w, h = self.tile_dims()
+        compiled = self.compiled
+        self.game_state.tile_grid = TileGrid((start_x, start_y), (w + w*0.08, h + h*0.08),
+                                             compiled.rows, compiled.cols)
         curr_x, curr_y = start_x, start_y
-        for idx, row in enumerate(self.matrix):
-            for idx2, cell in enumerate(row):
+        for idx in range(compiled.rows):
+            for idx2 in range(compiled.cols):
+                cell = compiled.cell(idx, idx2)
                 if cell:
                     power = self.__load_power(idx, idx2)
                     coords = (curr_x, curr_y, w, h)
-                    is_double_hit = (idx, idx2) in self.double_hit_tiles
+                    is_double_hit = compiled.is_double_hit(idx, idx2)
                     tile = Tile(cell, coords, self.game_state, is_double_hit, power)
                     self.game_state.tiles_group.add(tile)
+                    self.game_state.tile_grid.add(tile, idx, idx2)
                 curr_x += w + w*0.08
             curr_x = start_x
             curr_y += h + h*0.08
@@ -86,7 +101,7 @@ class LevelManager:
     def load_ball(self):
         coords = self.__load_player(self.ball_placement, self.ball_dims)
         coords = (coords[0], coords[1], coords[2])
-        ball = Ball(coords, self.game_state)
+        ball = ball_pool.acquire(coords, self.game_state)
         self.game_state.ball_sprite_group.add(ball)
 
     def load_side_walls(self):
@@ -102,18 +117,75 @@ class LevelManager:
              self.game_state.screen_width, 
              self.game_state.screen_height*0.02)
         
+    def preload_assets(self):
+        """Loads every image this level can use into the asset cache (and so the disk cache) without adding
+        any sprite to the game. Used to warm the caches, build_level must be called first."""
+        w, h = self.tile_dims()
+        for name in self.compiled.palette:
+            load_image(f"{TILES_DICT[name]}.png", (w, h))
+            load_image(f"{TILES_DICT[name]}_broken.png", (w, h))
+        for power_path in POWERS.values():
+            load_image(power_path, (int(w) * 0.6, int(h) * 0.6))
+        container = self.game_state.screen_uis['game'].containers[0]
+        if self.background_image:
+            set_rect_background(self.background_image, container.width, container.height)
+        bat = Bat(self.__load_player(self.bat_placement, self.bat_dims), self.game_state)
+        for frames in bat.bat_frames['bullets'].values():
+            bat_w, bat_h = frames[0].get_size()
+            load_image(BULLETS, (bat_w * 0.1, bat_h * 0.5))
+        coords = self.__load_player(self.ball_placement, self.ball_dims)
+        Ball((coords[0], coords[1], coords[2]), self.game_state)
+
+    def prewarm_pools(self):
+        """Fills the sprite pools with sprites sized for this level, so the first bullets, powers and multi balls
+        of the level reuse them instead of being built mid game. Power pool capacity follows num_powers.
+        Powers are sized from a tile rect like Tile.drop_power does, so they share its asset cache entry."""
+        bat_rect = self.game_state.bat_sprite.rect
+        bullet_coords = (bat_rect.x, bat_rect.y, bat_rect.w * 0.1, bat_rect.h * 0.5)
+        bullet_pool.prewarm(POOL_PREWARM['bullet'], self.game_state, bullet_coords)
+        tiles = self.game_state.tiles_group.sprites()
+        if tiles:
+            tile_rect = tiles[0].rect
+            power_coords = (0, 0, tile_rect.w * 0.6, tile_rect.h * 0.6)
+            power_pool.prewarm(min(self.num_powers, POOL_PREWARM['power']), self.game_state, power_coords,
+                               self.powers_list[0])
+        coords = self.__load_player(self.ball_placement, self.ball_dims)
+        ball_pool.prewarm(POOL_PREWARM['ball'], (coords[0], coords[1], coords[2]), self.game_state)
+
     def reset_bat_ball(self):
         self.load_bat()
         self.load_ball()
 
     def load_level(self):
-        level_json = self.load_json()
-        self.build_level_json(level_json)
-        change_background_music(self.background_music, 
-                                game_state=self.game_state, volume=0.5)
-        self.game_state.screen_uis['game'].containers[0].set_background_image(self.background_image)
-        self.initialize_random_powers()
-        self.load_tiles()
-        self.load_bat()
-        self.load_ball()
-        self.load_side_walls()
\ No newline at end of file
+        with trace_span(self.game_state, "load_level", level=self.game_state.level):
+            prefetcher = self.game_state.prefetcher
+            prefetched = None
+            if prefetcher is not None:
+                prefetched = prefetcher.take(self.game_state.level, self.game_state.tracer)
+            if prefetched is not None:
+                prefetched.install()
+                compiled = prefetched.compiled
+            else:
+                compiled = self.load_compiled()
+            self.build_level(compiled)
+            change_background_music(self.background_music, 
+                                    game_state=self.game_state, volume=0.5,
+                                    source=prefetched.music if prefetched is not None else None)
+            self.game_state.screen_uis['game'].containers[0].set_background_image(self.background_image)
+            self.initialize_random_powers()
+            self.game_state.brick_layer = None
+            self.load_tiles()
+            self.game_state.brick_layer = BrickLayer(self.game_state).build()
+            self.load_bat()
+            self.load_ball()
+            self.load_side_walls()
+            if self.game_state.physics is not None:
+                self.game_state.physics.load_level()
+            self.prewarm_pools()
+            asset_cache.log_stats()
+            log_pool_stats(ball_pool, bullet_pool, power_pool)
+            if prefetcher is not None:
+                container = self.game_state.screen_uis['game'].containers[0]
+                prefetcher.prefetch(self.game_state.level + 1,
+                                    (self.game_state.screen_width, self.game_state.screen_height),
+                                    (container.width, container.height))
\ No newline at end of file
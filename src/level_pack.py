@@ -0,0 +1,234 @@
+import json
+import mmap
+import os
+import re
+import struct
+
+from src.game_configs import LEVELS_PATH, LEVEL_PACK_PATH, TILES_DICT, POWERS
+from src.log_handle import get_logger
+
+logger = get_logger(__name__)
+
+"""Compiled levels. The json levels are validated once and packed into a single binary file, every level holds its
+bricks as an array of palette indexes (one byte per cell, 0 is empty), the double hit cells as a bitmap and the list
+of images and sounds it uses. The pack is memory mapped and indexed by level number, loading a level is one index
+lookup and a slice of the map, parsed levels are kept in memory.
+
+The pack remembers the mtime and size of every level json it was built from. level_pack() compares them with the
+files in LEVELS_PATH and rebuilds the pack when a json was added, removed or edited, so editing a level needs no
+extra step. `python main.py --compile-levels` builds it explicitly and reports invalid levels.
+
+File layout:
+    MAGIC | manifest length (uint32) | manifest json | level count (uint32) | index | records
+    index entry: level, offset, length (uint32 each)
+    record: meta length (uint32) | meta json | bricks (rows * cols bytes) | double hit bitmap (rows * cols bits)
+"""
+
+MAGIC = b"BRKL1"
+_U32 = struct.Struct("<I")
+_INDEX_ENTRY = struct.Struct("<III")
+LEVEL_FILE = re.compile(r"level(\d+)\.json$")
+REQUIRED_FIELDS = {"matrix": list, "num_powers": int, "num_rows": int, "num_cols": int, "double_hit_tiles": list,
+                   "tiles_offsets": dict, "tiles_dims": dict}
+DEFAULTS = {"background_music": None, "background_image": None,
+            "bat_placement": (0.45, 0.93), "ball_placement": (0.5, 0.92),
+            "bat_dims": (0.09, 0.025), "ball_dims": (0.007, 0.007)}
+
+
+class LevelError(ValueError):
+    """A level json that can not be compiled."""
+
+
+class CompiledLevel:
+    def __init__(self, meta: dict, bricks: bytes, double_hits: bytes):
+        self.meta = meta
+        self.rows = meta["rows"]
+        self.cols = meta["cols"]
+        self.palette: list[str] = meta["palette"]
+        self.bricks = bricks
+        self.double_hits = double_hits
+
+    def __getattr__(self, name: str):
+        """The json fields (num_powers, tiles_dims, background_image...) read straight from the meta."""
+        try:
+            return self.__dict__["meta"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def cell(self, row: int, col: int) -> str | None:
+        index = self.bricks[row * self.cols + col]
+        return self.palette[index - 1] if index else None
+
+    def is_double_hit(self, row: int, col: int) -> bool:
+        bit = row * self.cols + col
+        return bool(self.double_hits[bit >> 3] & (1 << (bit & 7)))
+
+    def assets(self) -> dict:
+        """Images and sounds the level uses, for the prefetcher and the cache warm up."""
+        return self.meta["assets"]
+
+
+def compile_level(level_json: dict, name: str="level") -> CompiledLevel:
+    """Validates a level json and builds the compiled level in memory."""
+    for field, kind in REQUIRED_FIELDS.items():
+        if field not in level_json:
+            raise LevelError(f"{name}: missing field {field}")
+        if not isinstance(level_json[field], kind):
+            raise LevelError(f"{name}: {field} should be a {kind.__name__}")
+    for field in ("x", "y"):
+        if not isinstance(level_json["tiles_offsets"].get(field), (int, float)):
+            raise LevelError(f"{name}: tiles_offsets.{field} should be a number")
+    for field in ("width", "height"):
+        if not isinstance(level_json["tiles_dims"].get(field), (int, float)):
+            raise LevelError(f"{name}: tiles_dims.{field} should be a number")
+    matrix = level_json["matrix"]
+    rows = len(matrix)
+    cols = max((len(row) for row in matrix), default=0)
+    palette: list[str] = []
+    bricks = bytearray(rows * cols)
+    for row_idx, row in enumerate(matrix):
+        for col_idx, cell in enumerate(row):
+            if not cell:
+                continue
+            if cell not in TILES_DICT:
+                raise LevelError(f"{name}: unknown tile {cell!r} at {row_idx}, {col_idx}")
+            if cell not in palette:
+                palette.append(cell)
+            bricks[row_idx * cols + col_idx] = palette.index(cell) + 1
+    if len(palette) > 255:
+        raise LevelError(f"{name}: more than 255 different tiles")
+    double_hits = bytearray((rows * cols + 7) // 8)
+    for cell in level_json["double_hit_tiles"]:
+        if len(cell) != 2 or not (0 <= cell[0] < rows and 0 <= cell[1] < len(matrix[cell[0]])):
+            raise LevelError(f"{name}: double hit tile {cell} is outside of the matrix")
+        bit = cell[0] * cols + cell[1]
+        double_hits[bit >> 3] |= 1 << (bit & 7)
+
+    meta = {field: level_json[field] for field in REQUIRED_FIELDS if field not in ("matrix", "double_hit_tiles")}
+    for field, default in DEFAULTS.items():
+        # lists like json gives them back, a level compiled in memory equals the one read from the pack
+        meta[field] = level_json.get(field, list(default) if isinstance(default, tuple) else default)
+    images = [f"{TILES_DICT[cell]}{suffix}.png" for cell in palette for suffix in ("", "_broken")]
+    images += list(POWERS.values())
+    if meta["background_image"]:
+        images.append(meta["background_image"])
+    sounds = [f"assets/sounds/{meta['background_music']}.mp3"] if meta["background_music"] else []
+    meta.update(rows=rows, cols=cols, palette=palette, assets={"images": images, "sounds": sounds})
+    return CompiledLevel(meta, bytes(bricks), bytes(double_hits))
+
+
+def _encode(level: CompiledLevel) -> bytes:
+    meta = json.dumps(level.meta, separators=(",", ":")).encode()
+    return _U32.pack(len(meta)) + meta + level.bricks + level.double_hits
+
+
+def _decode(data: bytes) -> CompiledLevel:
+    meta_len, = _U32.unpack_from(data, 0)
+    offset = _U32.size + meta_len
+    meta = json.loads(data[_U32.size:offset])
+    cells = meta["rows"] * meta["cols"]
+    bricks = data[offset:offset + cells]
+    double_hits = data[offset + cells:offset + cells + (cells + 7) // 8]
+    return CompiledLevel(meta, bricks, double_hits)
+
+
+def source_manifest(levels_path: str=LEVELS_PATH) -> dict[str, list]:
+    """{file name: [mtime_ns, size]} of the level jsons, what the pack is keyed on."""
+    manifest = {}
+    for entry in os.scandir(levels_path):
+        if LEVEL_FILE.match(entry.name):
+            stat = entry.stat()
+            manifest[entry.name] = [stat.st_mtime_ns, stat.st_size]
+    return manifest
+
+
+def compile_pack(levels_path: str=LEVELS_PATH, pack_path: str=LEVEL_PACK_PATH) -> dict[str, list]:
+    """Validates every level json and writes the pack, raises LevelError on the first invalid level."""
+    manifest = source_manifest(levels_path)
+    records = []
+    for file_name in manifest:
+        with open(os.path.join(levels_path, file_name)) as fp:
+            level_json = json.load(fp)
+        level = int(LEVEL_FILE.match(file_name).group(1))
+        records.append((level, _encode(compile_level(level_json, file_name))))
+    records.sort()
+    manifest_bytes = json.dumps(manifest, separators=(",", ":")).encode()
+    header = MAGIC + _U32.pack(len(manifest_bytes)) + manifest_bytes + _U32.pack(len(records))
+    offset = len(header) + _INDEX_ENTRY.size * len(records)
+    index = b""
+    for level, record in records:
+        index += _INDEX_ENTRY.pack(level, offset, len(record))
+        offset += len(record)
+    os.makedirs(os.path.dirname(pack_path) or ".", exist_ok=True)
+    tmp_path = f"{pack_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as fp:
+        fp.write(header + index)
+        for _, record in records:
+            fp.write(record)
+    os.replace(tmp_path, pack_path)
+    logger.info(f"Compiled {len(records)} levels into {pack_path}")
+    return manifest
+
+
+class LevelPack:
+    def __init__(self, pack_path: str):
+        with open(pack_path, "rb") as fp:
+            self._map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise LevelError(f"{pack_path} is not a level pack")
+        offset = len(MAGIC)
+        manifest_len, = _U32.unpack_from(self._map, offset)
+        offset += _U32.size
+        self.manifest = json.loads(self._map[offset:offset + manifest_len])
+        offset += manifest_len
+        count, = _U32.unpack_from(self._map, offset)
+        offset += _U32.size
+        self.index: dict[int, tuple[int, int]] = {}
+        for _ in range(count):
+            level, start, length = _INDEX_ENTRY.unpack_from(self._map, offset)
+            self.index[level] = (start, length)
+            offset += _INDEX_ENTRY.size
+        self._parsed: dict[int, CompiledLevel] = {}
+
+    def __contains__(self, level: int) -> bool:
+        return level in self.index
+
+    def levels(self) -> list[int]:
+        return sorted(self.index)
+
+    def get(self, level: int) -> CompiledLevel:
+        compiled = self._parsed.get(level)
+        if compiled is None:
+            if level not in self.index:
+                raise FileNotFoundError(f"There is no level {level} in {LEVELS_PATH}")
+            start, length = self.index[level]
+            compiled = self._parsed[level] = _decode(self._map[start:start + length])
+        return compiled
+
+    def close(self):
+        self._map.close()
+
+
+_pack: LevelPack | None = None
+
+
+def level_pack(levels_path: str=LEVELS_PATH, pack_path: str=LEVEL_PACK_PATH) -> LevelPack:
+    """The pack of the level jsons, rebuilt when one of them changed since it was compiled."""
+    global _pack
+    manifest = source_manifest(levels_path)
+    if _pack is not None and _pack.manifest == manifest:
+        return _pack
+    if _pack is not None:
+        _pack.close()
+        _pack = None
+    try:
+        pack = LevelPack(pack_path)
+        if pack.manifest == manifest:
+            _pack = pack
+            return _pack
+        pack.close()
+    except (OSError, ValueError, struct.error):
+        pass
+    compile_pack(levels_path, pack_path)
+    _pack = LevelPack(pack_path)
+    return _pack
@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from time import perf_counter
+
+import pygame
+
+from src.game_configs import POWERS, TILES_DICT, PREFETCH_WORKERS
+from src.level_pack import CompiledLevel, LevelPack, level_pack
+from src.log_handle import get_logger
+from src.utils.asset_cache import asset_cache, cache_key, SCALE, OPAQUE
+from src.utils.disk_cache import disk_cache
+
+logger = get_logger(__name__)
+
+"""Loads the next level while the current one is played. Clearing a level used to parse the json, decode and scale
+every brick image and the background inside the frame, a visible hitch between levels.
+
+LevelManager.load_level starts prefetch(level + 1) once the level is built. A worker takes the level from the level
+pack (src/level_pack.py), then decodes and scales the brick, power and background images (from the disk cache when it
+has them) and reads the music file into memory, on a small thread pool. Surfaces are converted to the display format
+only on the game thread: take() hands the finished level to load_level, which puts the surfaces in the asset cache so
+building the level only hits the cache.
+If the worker is not done yet take() returns None and the level loads the normal way, nothing waits for the worker.
+
+Every prefetch keeps its timings and state (pending, ready, used, missed) in stats, they are logged and the worker
+time shows up as a span in the trace.
+"""
+
+
+class PrefetchedLevel:
+    def __init__(self, level: int):
+        self.level = level
+        self.compiled: CompiledLevel | None = None
+        self.surfaces: dict[tuple, tuple[pygame.Surface, bool]] = {}
+        self.music: bytes | None = None
+        self.started = perf_counter()
+        self.level_done = 0.0
+        self.finished = 0.0
+
+    def install(self):
+        """Converts the surfaces to the display format and puts them in the asset cache, game thread only."""
+        for key, (surface, from_disk) in self.surfaces.items():
+            path, size, kind = key
+            if not from_disk:
+                disk_cache.store(path, size, kind, "RGB" if kind == OPAQUE else "RGBA", surface)
+            asset_cache.put(key, surface.convert() if kind == OPAQUE else surface.convert_alpha())
+
+
+def _decode(path: str, size: tuple, kind: str) -> tuple[pygame.Surface, bool]:
+    """Same pixels as AssetCache builds for scale and opaque, without the display conversion."""
+    surface = disk_cache.read(path, size, kind, "RGB" if kind == OPAQUE else "RGBA")
+    if surface is not None:
+        return surface, True
+    return pygame.transform.scale(pygame.image.load(path), size), False
+
+
+def level_images(compiled: CompiledLevel, screen_size: tuple, background_size: tuple) -> list[tuple]:
+    """Asset cache keys of the images that depend on the level, the sizes are computed like in LevelManager."""
+    w = compiled.tiles_dims['width'] * screen_size[0]
+    h = compiled.tiles_dims['height'] * screen_size[1]
+    keys = []
+    for name in compiled.palette:
+        keys.append(cache_key(f"{TILES_DICT[name]}.png", (w, h), SCALE))
+        keys.append(cache_key(f"{TILES_DICT[name]}_broken.png", (w, h), SCALE))
+    for power_path in POWERS.values():
+        keys.append(cache_key(power_path, (int(w) * 0.6, int(h) * 0.6), SCALE))
+    if compiled.background_image:
+        keys.append(cache_key(compiled.background_image, background_size, OPAQUE))
+    return keys
+
+
+class LevelPrefetcher:
+    def __init__(self, workers: int=PREFETCH_WORKERS):
+        self._levels = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch-level")
+        self._decoders = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch-decode")
+        self._jobs: dict[int, Future] = {}
+        self.stats: list[dict] = []
+
+    def prefetch(self, level: int, screen_size: tuple, background_size: tuple):
+        pack = level_pack()
+        if level in self._jobs or level not in pack:
+            return
+        self._jobs[level] = self._levels.submit(self.__load, level, pack, screen_size, background_size)
+
+    def __load(self, level: int, pack: LevelPack, screen_size: tuple, background_size: tuple) -> PrefetchedLevel:
+        prefetched = PrefetchedLevel(level)
+        prefetched.compiled = pack.get(level)
+        prefetched.level_done = perf_counter()
+        keys = [key for key in level_images(prefetched.compiled, screen_size, background_size)
+                if not asset_cache.contains(key)]
+        for key, surface in zip(keys, self._decoders.map(lambda key: _decode(*key), keys)):
+            prefetched.surfaces[key] = surface
+        for sound in prefetched.compiled.assets()["sounds"]:
+            with open(sound, "rb") as fp:
+                prefetched.music = fp.read()
+        prefetched.finished = perf_counter()
+        return prefetched
+
+    def take(self, level: int, tracer=None) -> PrefetchedLevel | None:
+        """The prefetched level if the worker is done with it, None otherwise. Never blocks."""
+        job = self._jobs.pop(level, None)
+        if job is None:
+            return None
+        if not job.done():
+            job.cancel()
+            self.__record(level, "missed")
+            return None
+        if job.exception() is not None:
+            logger.warning(f"Prefetching level {level} failed: {job.exception()}")
+            self.__record(level, "failed")
+            return None
+        prefetched = job.result()
+        if tracer is not None:
+            tracer.complete("prefetch_level", prefetched.started, prefetched.finished,
+                            {"level": level, "images": len(prefetched.surfaces)})
+        self.__record(level, "used", level_ms=(prefetched.level_done - prefetched.started) * 1000,
+                      total_ms=(prefetched.finished - prefetched.started) * 1000,
+                      images=len(prefetched.surfaces),
+                      from_disk=sum(from_disk for _, from_disk in prefetched.surfaces.values()))
+        return prefetched
+
+    def __record(self, level: int, state: str, **timings):
+        entry = {"level": level, "state": state, **timings}
+        self.stats.append(entry)
+        logger.info(f"Level prefetch: {entry}")
+
+    def state(self) -> dict[int, str]:
+        """pending or ready for every level being prefetched."""
+        return {level: "ready" if job.done() else "pending" for level, job in self._jobs.items()}
+
+    def shutdown(self):
+        self._levels.shutdown(wait=False, cancel_futures=True)
+        self._decoders.shutdown(wait=False, cancel_futures=True)
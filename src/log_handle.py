@@ -1,31 +1,120 @@
+import atexit
 import logging
+import os
+import queue
 import sys
+import time
+import warnings
+from logging.handlers import QueueHandler, QueueListener
+
+from src.game_configs import LOG_LEVELS, LOG_FILE
+
+"""Logging that never stalls a frame. Module loggers only put records on a queue, a listener thread writes them to
+stdout and to game.log. The listener starts with the first logger and is stopped at exit, which drains the queue.
+
+Levels are per module: the longest prefix of the logger name found in LOG_LEVELS wins, "" is the default.
+They can be overridden with the BREAKOUT_LOG_LEVELS environment variable, e.g.
+    BREAKOUT_LOG_LEVELS="src.sprite_engine=DEBUG,src.ui=WARNING"
+A call below the level of its module returns before building a record.
+
+Messages logged from the game loop can pass extra={"throttle": seconds}, the same message of the same logger is then
+kept at most once per period, the next one that gets through tells how many were dropped.
+"""
+
+LOG_FORMAT = "[%(asctime)s] [%(levelname)s] [%(name)s] - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_queue_handler: QueueHandler | None = None
+_listener: QueueListener | None = None
+
+
+def parse_levels(value: str) -> dict[str, str]:
+    """"a.b=DEBUG,c=WARNING" to {"a.b": "DEBUG", "c": "WARNING"}, a bare level sets the default.
+    Entries with a level logging does not know are ignored with a warning, the loggers do not exist yet."""
+    known = logging.getLevelNamesMapping()
+    levels = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, level = item.rpartition("=")
+        level = level.strip().upper()
+        if level not in known:
+            warnings.warn(f"Ignoring log level {item!r}, unknown level {level!r}", stacklevel=2)
+            continue
+        levels[name.strip()] = level
+    return levels
+
+
+def module_level(name: str, levels: dict[str, str]) -> int:
+    best = ""
+    for prefix in levels:
+        if (name == prefix or name.startswith(prefix + ".") or not prefix) and len(prefix) >= len(best):
+            best = prefix
+    return logging.getLevelName(levels.get(best, "INFO"))
+
+
+class ThrottleFilter(logging.Filter):
+    """Drops records with a throttle extra that repeat within their period. Runs on the game thread, a dict lookup."""
+
+    def __init__(self):
+        super().__init__()
+        self.last: dict[tuple, float] = {}
+        self.dropped: dict[tuple, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        period = getattr(record, "throttle", None)
+        if period is None:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        if now - self.last.get(key, -period) < period:
+            self.dropped[key] = self.dropped.get(key, 0) + 1
+            return False
+        self.last[key] = now
+        dropped = self.dropped.pop(key, 0)
+        if dropped:
+            record.msg = f"{record.msg} ({dropped} more in the last {period}s)"
+        return True
+
+
+def _start_listener() -> QueueHandler:
+    global _queue_handler, _listener
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.DEBUG)
+    console_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT))
+
+    file_handler = logging.FileHandler(LOG_FILE, mode="a")
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT))
+
+    _listener = QueueListener(_queue, console_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    _queue_handler = QueueHandler(_queue)
+    _queue_handler.addFilter(ThrottleFilter())
+    return _queue_handler
+
+
+def stop_logging():
+    """Writes out the queued records and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def get_logger(name: str) -> logging.Logger:
     """Returns a configured logger for the given module name."""
 
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
-
-    if not logger.hasHandlers():
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.DEBUG)
-        console_format = logging.Formatter(
-            "[%(asctime)s] [%(levelname)s] [%(name)s] - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        console_handler.setFormatter(console_format)
-
-        file_handler = logging.FileHandler("game.log", mode="a")
-        file_handler.setLevel(logging.INFO)
-        file_format = logging.Formatter(
-            "[%(asctime)s] [%(levelname)s] [%(name)s] - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        file_handler.setFormatter(file_format)
-
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+    levels = dict(LOG_LEVELS)
+    levels.update(parse_levels(os.environ.get("BREAKOUT_LOG_LEVELS", "")))
+    logger.setLevel(module_level(name, levels))
+
+    if not logger.handlers:
+        logger.addHandler(_queue_handler or _start_listener())
+        logger.propagate = False
 
     return logger
@@ -0,0 +1,97 @@
+import gzip
+import json
+
+import pygame
+
+from src.log_handle import get_logger
+
+logger = get_logger(__name__)
+
+"""Recording and replaying a game session. The recorder keeps, for every frame of GameRunner.game_loop, the frame time,
+the input events EventHandler handled and the mouse position when it moved. Together with the seed of the level
+random generator (power placement) and the settings the session ran with, that is all the simulation depends on:
+feeding it back frame by frame replays the session exactly, on any machine and at any speed.
+
+A replay file is gzipped json:
+    header       seed, level, resolution, physics, vectorised_balls
+    frames       [dt, events, mouse_pos], events is a list of [type, key] or [type], mouse_pos is null when unchanged
+    final_state  GameRunner.final_state() when the recording stopped
+    stats        wall clock of the recorded run, to compare frame times across builds
+
+A replay compares its own final state with the recorded one and logs the differences.
+"""
+
+KEY_EVENTS = (pygame.KEYDOWN, pygame.KEYUP)
+
+
+def encode_event(event: pygame.event.Event) -> list:
+    if event.type in KEY_EVENTS:
+        return [event.type, event.key]
+    return [event.type]
+
+
+def decode_event(data: list) -> pygame.event.Event:
+    if data[0] in KEY_EVENTS:
+        return pygame.event.Event(data[0], key=data[1])
+    return pygame.event.Event(data[0])
+
+
+class ReplayRecorder:
+    def __init__(self, path: str, header: dict):
+        self.path = path
+        self.header = header
+        self.frames: list[list] = []
+        self._events: list[list] = []
+        self._mouse_pos = None
+
+    def record_event(self, event: pygame.event.Event):
+        self._events.append(encode_event(event))
+
+    def end_frame(self, dt: float, mouse_pos: tuple):
+        mouse_pos = list(mouse_pos) if mouse_pos is not None else None
+        moved = mouse_pos if mouse_pos != self._mouse_pos else None
+        self._mouse_pos = mouse_pos
+        self.frames.append([dt, self._events, moved])
+        self._events = []
+
+    def save(self, final_state: dict, stats: dict):
+        data = {"header": self.header, "frames": self.frames, "final_state": final_state, "stats": stats}
+        with gzip.open(self.path, "wt") as fp:
+            json.dump(data, fp, separators=(",", ":"))
+        logger.info(f"Recorded {len(self.frames)} frames to {self.path}")
+
+
+class ReplayPlayer:
+    def __init__(self, data: dict):
+        self.header = data["header"]
+        self.frames = data["frames"]
+        self.final_state = data["final_state"]
+        self.stats = data.get("stats", {})
+        self._index = 0
+        self.mouse_pos = None
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayPlayer":
+        with gzip.open(path, "rt") as fp:
+            return cls(json.load(fp))
+
+    def next_frame(self) -> tuple[float, list] | None:
+        """dt and events of the next recorded frame, None once the recording is over. mouse_pos follows the frame."""
+        if self._index >= len(self.frames):
+            return None
+        dt, events, mouse_pos = self.frames[self._index]
+        self._index += 1
+        if mouse_pos is not None:
+            self.mouse_pos = tuple(mouse_pos)
+        return dt, [decode_event(event) for event in events]
+
+    def compare(self, final_state: dict, stats: dict) -> dict:
+        """Logs how the replayed run ended against the recording, returns the fields that differ."""
+        diff = {key: (value, final_state.get(key)) for key, value in self.final_state.items()
+                if final_state.get(key) != value}
+        if diff:
+            logger.warning(f"Replay diverged from the recording: {diff}")
+        else:
+            logger.info(f"Replay matched the recording after {len(self.frames)} frames")
+        logger.info(f"Recorded run {self.stats}, replayed run {stats}")
+        return diff
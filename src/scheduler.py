@@ -0,0 +1,92 @@
+import heapq
+from typing import Callable
+
+from src.log_handle import get_logger
+
+logger = get_logger(__name__)
+
+"""Game clock and timers. Everything that used to wait with pygame.time.delay or poll pygame.time.get_ticks reads
+the clock of the Scheduler on GameState instead, and delays are scheduled callbacks that never block the loop.
+
+The clock is game time in milliseconds, GameRunner advances it by one fixed tick at the start of every simulation
+step. Nothing advances it while the game is paused, so timers and the sticky/cool down checks are paused too, and a
+replay running the same ticks sees the same times.
+
+Timers are kept in a heap ordered by due time, advance pops and runs only the due ones, pending timers cost nothing.
+A repeating timer is pushed back with its next due time, if the clock jumped over several periods it runs once per
+period. Cancelling marks the timer, the heap drops it when it reaches the top.
+"""
+
+
+class Timer:
+    __slots__ = ("due", "interval", "callback", "args", "cancelled")
+
+    def __init__(self, due: float, interval: float | None, callback: Callable, args: tuple):
+        self.due = due
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    @property
+    def pending(self) -> bool:
+        return not self.cancelled
+
+
+class Scheduler:
+    def __init__(self):
+        self.now: float = 0
+        self._heap: list[tuple[float, int, Timer]] = []
+        self._seq = 0
+
+    def __push(self, timer: Timer):
+        heapq.heappush(self._heap, (timer.due, self._seq, timer))
+        self._seq += 1
+
+    def schedule(self, delay: float, callback: Callable, *args) -> Timer:
+        """Runs callback(*args) once, delay milliseconds of game time from now."""
+        timer = Timer(self.now + delay, None, callback, args)
+        self.__push(timer)
+        return timer
+
+    def repeat(self, interval: float, callback: Callable, *args) -> Timer:
+        """Runs callback(*args) every interval milliseconds of game time until cancelled."""
+        if interval <= 0:
+            raise ValueError(f"Repeat interval must be positive, got {interval}")
+        timer = Timer(self.now + interval, interval, callback, args)
+        self.__push(timer)
+        return timer
+
+    def cancel(self, timer: Timer | None):
+        if timer is not None:
+            timer.cancelled = True
+
+    def elapsed(self, since: float) -> float:
+        """Milliseconds of game time since an earlier reading of now."""
+        return self.now - since
+
+    def advance(self, ms: float) -> int:
+        """Moves the clock forward and runs the due timers in due order, returns how many ran."""
+        self.now += ms
+        heap = self._heap
+        ran = 0
+        while heap and heap[0][0] <= self.now:
+            _, _, timer = heapq.heappop(heap)
+            if timer.cancelled:
+                continue
+            if timer.interval is None:
+                timer.cancelled = True
+            else:
+                timer.due += timer.interval
+                self.__push(timer)
+            timer.callback(*timer.args)
+            ran += 1
+        return ran
+
+    def clear(self):
+        for _, _, timer in self._heap:
+            timer.cancelled = True
+        self._heap.clear()
+
+    def __len__(self) -> int:
+        return sum(1 for _, _, timer in self._heap if not timer.cancelled)
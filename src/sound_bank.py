@@ -0,0 +1,136 @@
+import io
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+
+import pygame
+
+from src.game_configs import AUDIO_BUDGET_BYTES
+from src.log_handle import get_logger
+
+logger = get_logger(__name__)
+
+"""Sound effects and the memory they take. A pygame Sound is the whole effect decoded to PCM, the decoded size is
+seconds * frequency * channels * sample size whatever the file format, so a few long effects can cost megabytes
+for the whole process.
+
+Short effects that play all the time (the hits) are resident: decoded once and kept. The others are kept as the
+compressed file bytes and decoded on demand on the loader thread, the decoded buffers live in an LRU limited by
+AUDIO_BUDGET_BYTES together with the resident ones. get() never blocks, it returns None while the effect is
+decoding, collect() moves the finished decodes to the LRU once per frame.
+"""
+
+
+def _sound_bytes(sound: pygame.mixer.Sound) -> int:
+    """Decoded size, computed from the mixer format so the buffer is not copied like get_raw would."""
+    frequency, size, channels = pygame.mixer.get_init()
+    return int(sound.get_length() * frequency) * channels * (abs(size) // 8)
+
+
+def _decode(source) -> tuple[pygame.mixer.Sound, int]:
+    sound = pygame.mixer.Sound(io.BytesIO(source) if isinstance(source, bytes) else source)
+    return sound, _sound_bytes(sound)
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as fp:
+        return fp.read()
+
+
+class SoundEntry:
+    __slots__ = ("name", "cool_down", "category", "priority", "resident", "loaded", "decoding")
+
+    def __init__(self, name: str, cool_down: float, category: str, priority: int, resident: bool):
+        self.name = name
+        self.cool_down = cool_down
+        self.category = category
+        self.priority = priority
+        self.resident = resident
+        self.loaded: Future | None = None
+        self.decoding: Future | None = None
+
+
+class SoundBank:
+    def __init__(self, loader: ThreadPoolExecutor, max_bytes: int=AUDIO_BUDGET_BYTES):
+        self._loader = loader
+        self.max_bytes = max_bytes
+        self.entries: dict[str, SoundEntry] = {}
+        self._decoded: OrderedDict[str, tuple[pygame.mixer.Sound, int]] = OrderedDict()
+        self.resident_bytes = 0
+        self.decoded_bytes = 0
+        self.decodes = 0
+        self.evictions = 0
+
+    def add(self, entry: SoundEntry, path: str):
+        """Resident entries are decoded right away, the others are only read."""
+        entry.loaded = self._loader.submit(_decode if entry.resident else _read, path)
+        entry.loaded.add_done_callback(lambda done: self.__log_failure(entry.name, done))
+        if entry.resident:
+            entry.loaded.add_done_callback(self.__count_resident)
+        self.entries[entry.name] = entry
+
+    @staticmethod
+    def __log_failure(name: str, future: Future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Failed to load sound {name}: {future.exception()}")
+
+    def __count_resident(self, future: Future):
+        if not future.cancelled() and future.exception() is None:
+            self.resident_bytes += future.result()[1]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def ready(self, name: str) -> bool:
+        """True once the effect is loaded (decoded or compressed), an effect that failed to load is never ready."""
+        entry = self.entries.get(name)
+        loaded = entry.loaded if entry is not None else None
+        return loaded is not None and loaded.done() and not loaded.cancelled() and loaded.exception() is None
+
+    def get(self, name: str) -> pygame.mixer.Sound | None:
+        """The decoded effect, None when it is not loaded yet or being decoded. Starts the decode on a miss."""
+        if not self.ready(name):
+            return None
+        entry = self.entries[name]
+        if entry.resident:
+            return entry.loaded.result()[0]
+        decoded = self._decoded.get(name)
+        if decoded is not None:
+            self._decoded.move_to_end(name)
+            return decoded[0]
+        if entry.decoding is None:
+            entry.decoding = self._loader.submit(_decode, entry.loaded.result())
+            entry.decoding.add_done_callback(lambda done: self.__log_failure(name, done))
+        return None
+
+    def decoding(self, name: str) -> bool:
+        entry = self.entries.get(name)
+        return entry is not None and entry.decoding is not None
+
+    def collect(self):
+        """Moves the finished decodes to the LRU and evicts the least recently played effects over the budget.
+        An effect that fails to decode stops being ready. Called once per frame on the game thread."""
+        for entry in self.entries.values():
+            if entry.decoding is None or not entry.decoding.done():
+                continue
+            future, entry.decoding = entry.decoding, None
+            if future.cancelled() or future.exception() is not None:
+                entry.loaded = future
+                continue
+            self._decoded[entry.name] = future.result()
+            self.decoded_bytes += future.result()[1]
+            self.decodes += 1
+        while self.resident_bytes + self.decoded_bytes > self.max_bytes and len(self._decoded) > 1:
+            _, (_, size) = self._decoded.popitem(last=False)
+            self.decoded_bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        compressed = sum(len(entry.loaded.result()) for entry in self.entries.values()
+                         if not entry.resident and self.ready(entry.name))
+        return {"resident_bytes": self.resident_bytes + self.decoded_bytes,
+                "pinned_bytes": self.resident_bytes,
+                "compressed_bytes": compressed,
+                "max_bytes": self.max_bytes,
+                "decoded": len(self._decoded),
+                "decodes": self.decodes,
+                "evictions": self.evictions}
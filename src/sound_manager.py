@@ -1,61 +1,145 @@
+import io
+from concurrent.futures import ThreadPoolExecutor, Future
+
 import pygame
 
-from src.game_state_management import GameState
+from src.game_configs import SOUND_MANIFEST, SOUND_LOADERS
+from src.audio_mixer import VoiceMixer
+from src.sound_bank import SoundBank, SoundEntry
+from src.scheduler import Scheduler
+from src.log_handle import get_logger
+
+logger = get_logger(__name__)
+
+"""Module to manage sounds. We load all kind of sounds here.
+
+Decoding the sound effects used to happen in __init__, before the first frame. Now every sound is decoded on a
+background thread behind a future, in the priority order of SOUND_MANIFEST (menu sounds first), and play_sound
+skips a sound that is not ready yet instead of waiting for it. Background music files are read on the same thread,
+update() starts the music on the game thread once the file is in memory.
+
+Sound effects go through the VoiceMixer (src/audio_mixer.py): play_sound queues the trigger, update() mixes the
+triggers of the frame on the channel pools of their category. The effects are kept by the SoundBank
+(src/sound_bank.py), resident or compressed and decoded on demand within the audio memory budget. A trigger of an
+effect that is being decoded waits in _deferred and is mixed on the frame its decode finishes."""
+
+SOUND_PATH = "assets/sounds/"
 
-"""Module to manage sounds. We load all kind of sounds here."""
 
 class SoundManager:
-    def __init__(self):
+    def __init__(self, scheduler: Scheduler | None=None, manifest: dict=SOUND_MANIFEST):
+        """The cool downs are measured on the scheduler clock when given, pygame.time.get_ticks otherwise."""
         pygame.mixer.pre_init()
-        self.sounds = {}
-        sound_path = "assets/sounds/"
-        self.__load_sound(f"{sound_path}option_select.wav", "button_hover", 100)
-        self.__load_sound(f"{sound_path}bricks_hit.mp3",'bricks_hit', 100)
-        self.__load_sound(f"{sound_path}bullet.mp3", 'bullet', 100)
-        self.__load_sound(f"{sound_path}paddle_hit.mp3", "paddle_hit", 100)
-        self.__load_sound(f"{sound_path}wall_hit.mp3", "wall_hit", 100)
-        self.__load_sound(f"{sound_path}game_start.mp3", 'power_gain', 100)
-        self.__load_sound(f"{sound_path}ball_dead.wav", 'ball_dead', 100)
+        self.scheduler = scheduler
+        self._loader = ThreadPoolExecutor(max_workers=SOUND_LOADERS, thread_name_prefix="sound-loader")
+        self._pending_music: tuple[Future, tuple] | None = None
+        self._deferred: set[str] = set()
+        self.mixer = VoiceMixer()
+        self.sounds = SoundBank(self._loader)
+        for name, entry in sorted(manifest.items(), key=lambda item: item[1]["load"]):
+            self.sounds.add(SoundEntry(name, entry["cool_down"], entry["category"], entry["priority"],
+                                       entry["resident"]),
+                            f"{SOUND_PATH}{entry['file']}")
         self.background_music = "background_menu"
 
-    def __load_sound(self, filepath: str,
-                    name: str,
-                    cool_down: float=0,
-                    volume: float=1.0):
-        """Private method that will load the sound from filepath and then updates the self.sounds dict with
-        sound, lastplayed and cool_down. We do that to keep some delay in playing a particular sound."""
-        sound = pygame.mixer.Sound(filepath)
-        sound.set_volume(volume) 
-        self.sounds[name] = {"sound": sound, 
-                             "last_played": 0, 
-                             "cool_down": cool_down}
-        
+    def ready(self, name: str) -> bool:
+        """True once the sound is loaded, a sound that failed to load is never ready."""
+        return self.sounds.ready(name)
+
+    def now(self) -> float:
+        return self.scheduler.now if self.scheduler is not None else pygame.time.get_ticks()
+
     def play_sound(self, name: str):
         """This is for playing sounds, not background music. We check if thhe sound is available in the dict and
-        it has been at least cool_down period since it was last played."""
-        if name not in self.sounds:
+        decoded, then the mixer merges it with the other triggers of the frame and applies the cool down."""
+        sound = self.sounds.get(name)
+        if sound is None:
+            if self.sounds.decoding(name):
+                self._deferred.add(name)
+            return
+        entry = self.sounds.entries[name]
+        self.mixer.request(name, sound, entry.category, entry.priority, entry.cool_down, self.now())
+
+    @staticmethod
+    def __read(path: str) -> bytes:
+        with open(path, "rb") as fp:
+            return fp.read()
+
+    def play_music(self, loop=True, start_time=49, volume=0.7, source: bytes | None=None):
+        """Plays background music using pygame.mixer.music, from source when the file is already in memory.
+        Otherwise the file is read on the loader thread and update() starts it."""
+        if source is None:
+            music_path = f"{SOUND_PATH}{self.background_music}.mp3"
+            self._pending_music = (self._loader.submit(self.__read, music_path), (loop, start_time, volume))
             return
-        sound = self.sounds[name]['sound']
-        last_played = self.sounds[name]['last_played']
-        cool_down = self.sounds[name]['cool_down']
-        current_time = pygame.time.get_ticks()
-        if current_time - last_played > cool_down:
-            sound.play()
-            self.sounds[name]['last_played'] = current_time
-
-    def play_music(self, loop=True, start_time=49, volume=0.7):
-        """Plays background music using pygame.mixer.music"""
-        music_path = f"assets/sounds/{self.background_music}.mp3"
+        self._pending_music = None
+        self.__start_music(source, loop, start_time, volume)
+
+    def __start_music(self, source: bytes, loop: bool, start_time: float, volume: float):
         try:
-            pygame.mixer.music.load(music_path)
+            pygame.mixer.music.load(io.BytesIO(source), "mp3")
             pygame.mixer.music.set_volume(volume)
             pygame.mixer.music.play(-1 if loop else 0, start_time)
         except pygame.error as e:
-            print(f"[ERROR] Failed to load background music: {e}")
+            logger.error(f"Failed to load background music: {e}")
+
+    def update(self):
+        """Called once per frame after the frame is drawn, mixes the sound effects triggered during the frame and
+        starts the background music when its file has been read."""
+        self.sounds.collect()
+        if self._deferred:
+            deferred, self._deferred = self._deferred, set()
+            for name in deferred:
+                self.play_sound(name)
+        self.mixer.flush(self.now())
+        if self._pending_music is None or not self._pending_music[0].done():
+            return
+        future, (loop, start_time, volume) = self._pending_music
+        self._pending_music = None
+        if future.exception() is not None:
+            logger.error(f"Failed to load background music: {future.exception()}")
+            return
+        self.__start_music(future.result(), loop, start_time, volume)
 
     def stop_music(self):
-        """Stops the background music."""
+        """Stops the background music, including music that is still being read."""
+        self._pending_music = None
         pygame.mixer.music.stop()
 
-        
-    
+    def stats(self) -> dict:
+        """Voice mixer counters and audio memory, shown by the performance overlay."""
+        return {**self.mixer.stats(), "memory": self.sounds.stats()}
+
+    def shutdown(self):
+        self.mixer.log_stats()
+        logger.info(f"Sound bank stats: {self.sounds.stats()}")
+        self._loader.shutdown(wait=False, cancel_futures=True)
+
+
+class NullSoundManager:
+    """Same interface as SoundManager but does nothing. Used by the headless mode where there is no sound card."""
+
+    def __init__(self):
+        self.sounds = {}
+        self.background_music = "background_menu"
+
+    def ready(self, name: str) -> bool:
+        return False
+
+    def stats(self) -> dict:
+        return {}
+
+    def play_sound(self, name: str):
+        pass
+
+    def play_music(self, loop=True, start_time=49, volume=0.7, source: bytes | None=None):
+        pass
+
+    def update(self):
+        pass
+
+    def stop_music(self):
+        pass
+
+    def shutdown(self):
+        pass
@@ -2,11 +2,19 @@ import math
 import pygame
 
 from src.game_state_management import GameState
-from src.game_configs import BALL_PATH, BALL_SPEED, MAX_ANGLE
+from src.game_configs import BALL_PATH, BALL_SPEED, MAX_ANGLE, SIMULATION_HZ, LOG_THROTTLE
 from src.log_handle import get_logger
+from src.utils.asset_cache import load_image, CIRCLE
+from src.sprite_engine.interpolation import Interpolated
+from src.sprite_engine.tile_grid import tile_candidates
+from src.sprite_engine.collision import sweep_circle_rect, reflect
+from src.sprite_engine.pools import Pooled, SpritePool
+from src.event_bus import BALL_HIT, BALL_LOST
 
 logger = get_logger(__name__)
 
+MAX_BOUNCES = 4
+
 class Velocity:
     def __init__(self, x: int, 
                  y: int, 
@@ -23,57 +31,58 @@ class Velocity:
         self.y = -self.speed * math.cos(bounce_angle)
 
 
-class Ball(pygame.sprite.Sprite):
+class Ball(Pooled, Interpolated, pygame.sprite.Sprite):
     def __init__(self,
                  coords: tuple,
                  game_state: GameState):
         super().__init__()
+        self.velocity = Velocity(BALL_SPEED * 0.6, -BALL_SPEED)
+        self.reset(coords, game_state)
+
+    def reset(self, coords: tuple, game_state: GameState):
+        """Reinitialises a pooled ball, a fresh ball is sticky and not on fire."""
         self.game_state = game_state
         self.coords = coords
         self.is_fireball = False
         self.is_sticky = True
         self.is_magnet = False
-        self.current_time = pygame.time.get_ticks()
+        self.current_time = game_state.scheduler.now
         self.sticky_time = 2000
-        self.velocity = Velocity(BALL_SPEED * 0.6, -BALL_SPEED)
+        velocity = self.velocity
+        velocity.x, velocity.y = BALL_SPEED * 0.6, -BALL_SPEED
+        velocity.speed, velocity.max_angle = BALL_SPEED, MAX_ANGLE
         self.sw = self.game_state.screen_width
         self.sh = self.game_state.screen_height
         self.load_frame()
         
     def load_frame(self):
         dims = (self.coords[2] * 2, self.coords[2] * 2)
-        BALL_RADIUS = self.coords[2]
-        image = pygame.image.load(BALL_PATH).convert_alpha()
-        image = pygame.transform.smoothscale(image, dims)
-        mask_surface = pygame.Surface(dims, pygame.SRCALPHA)
-        pygame.draw.circle(mask_surface, (255, 255, 255, 255), (BALL_RADIUS, BALL_RADIUS), BALL_RADIUS) 
-        image.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+        image = load_image(BALL_PATH, dims, CIRCLE)
         self.rect = image.get_rect(center=(self.coords[0], self.coords[1]))
-        self.prev_rect = self.rect.copy()
+        self.reset_position(*self.rect.topleft)
         self.image = image
 
     def modify_sticky(self):
         if not self.is_sticky:
             return
-        current_time = pygame.time.get_ticks()
-        if self.is_sticky and current_time - self.current_time > self.sticky_time:
-            logger.info("Made sticky false")
+        if self.game_state.scheduler.elapsed(self.current_time) > self.sticky_time:
+            logger.info("Made sticky false", extra={"throttle": LOG_THROTTLE})
             self.is_sticky = False
 
     def sticky_movement(self, bat_coords):
-        self.rect.x = bat_coords[0] + bat_coords[2] // 2
-        self.rect.y = bat_coords[1] - self.rect.h
+        self.set_position(bat_coords[0] + bat_coords[2] // 2,
+                          bat_coords[1] - self.rect.h)
 
     def bounds_check(self):
         if (self.rect.x <= self.sw * 0.01):
             self.velocity.x = abs(self.velocity.x)
-            self.game_state.sound_manager.play_sound("wall_hit")
+            self.game_state.events.emit(BALL_HIT, surface="wall")
         elif (self.rect.x >= self.sw * 0.98):
             self.velocity.x *= -1 if self.velocity.x > 0 else 1
-            self.game_state.sound_manager.play_sound("wall_hit")
+            self.game_state.events.emit(BALL_HIT, surface="wall")
         if (self.rect.y <= self.sh * 0.05):
             self.velocity.y = abs(self.velocity.y)
-            self.game_state.sound_manager.play_sound("wall_hit")
+            self.game_state.events.emit(BALL_HIT, surface="wall")
     
     def paddle_collision_check(self):
         bat_rect = self.game_state.bat_sprite.rect
@@ -81,26 +90,40 @@ class Ball(pygame.sprite.Sprite):
                 (self.rect.y >= self.game_state.screen_height):
             return
         hit_pos = (self.rect.centerx - bat_rect.centerx) / (bat_rect.w / 2)
-        self.game_state.sound_manager.play_sound("paddle_hit")
+        self.game_state.events.emit(BALL_HIT, surface="paddle")
         self.velocity.angle_modify(hit_pos=hit_pos)
     
-    def tiles_collision(self):
-        collided_bricks = pygame.sprite.spritecollide(self, self.game_state.tiles_group, dokill=False)
-        if not collided_bricks:
-            return  
-        brick = collided_bricks[0]
-        brick.hits_to_break -= 1
-        if self.is_fireball:
-            return
-        self.game_state.sound_manager.play_sound("bricks_hit")
-        if self.prev_rect.right <= brick.rect.left:
-            self.velocity.x *= -1
-        elif self.prev_rect.left >= brick.rect.right:
-            self.velocity.x *= -1
-        elif self.prev_rect.bottom <= brick.rect.top:
-            self.velocity.y *= -1
-        elif self.prev_rect.top >= brick.rect.bottom:
-            self.velocity.y *= -1
+    def tiles_collision(self, dx: float, dy: float):
+        """Moves the ball by (dx, dy) sweeping it against the bricks. On every contact (earliest time of impact first)
+        the brick gets damaged and the ball bounces on the face or corner it hit, then carries on with the rest of
+        the displacement, up to MAX_BOUNCES contacts per tick. A fire ball damages everything on its path and does
+        not bounce. Works at any speed, a fast ball can not tunnel through a brick."""
+        radius = self.rect.w / 2
+        cx, cy = self.pos[0] + radius, self.pos[1] + radius
+        ignored = set()
+        for _ in range(MAX_BOUNCES):
+            swept = pygame.Rect(min(cx, cx + dx) - radius - 1, min(cy, cy + dy) - radius - 1,
+                                abs(dx) + radius * 2 + 2, abs(dy) + radius * 2 + 2)
+            contact = None
+            for brick in tile_candidates(swept, self.game_state):
+                if brick in ignored or brick.hits_to_break <= 0:
+                    continue
+                hit = sweep_circle_rect(cx, cy, radius, dx, dy, brick.rect)
+                if hit is not None and (contact is None or hit[0] < contact[0]):
+                    contact = (hit[0], hit[1], hit[2], brick)
+            if contact is None:
+                break
+            t, nx, ny, brick = contact
+            brick.hits_to_break -= 1
+            if self.is_fireball:
+                ignored.add(brick)
+                continue
+            self.game_state.events.emit(BALL_HIT, surface="brick")
+            cx, cy = cx + dx * t, cy + dy * t
+            dx, dy = reflect(dx * (1 - t), dy * (1 - t), nx, ny)
+            self.velocity.x, self.velocity.y = reflect(self.velocity.x, self.velocity.y, nx, ny)
+            ignored = {brick}
+        self.set_position(cx + dx - radius, cy + dy - radius)
 
     def wall_collision(self):
         if self.rect.colliderect(self.game_state.walls['left']) or \
@@ -111,15 +134,15 @@ class Ball(pygame.sprite.Sprite):
             self.velocity.y *= -1
 
     def move_ball(self, dt):
+        """velocity is in pixels per simulation tick, dt * SIMULATION_HZ is 1 on the fixed tick."""
         bat = self.game_state.bat_sprite
-        bat_x, bat_y = bat.rect.x, bat.rect.y
+        bat_x, bat_y = bat.pos
         bat_w, bat_h = bat.rect.w, bat.rect.h
         if self.is_sticky or self.is_magnet:
             self.sticky_movement((bat_x, bat_y, bat_w, bat_h))
             return
-        self.prev_rect = self.rect.copy()
-        self.rect.x += self.velocity.x
-        self.rect.y += self.velocity.y
+        ticks = dt * SIMULATION_HZ
+        self.tiles_collision(self.velocity.x * ticks, self.velocity.y * ticks)
 
     def key_bindings(self):
         if self.game_state.space_pressed:
@@ -129,19 +152,23 @@ class Ball(pygame.sprite.Sprite):
     def check_ball_dead(self):
         if self.rect.y >= self.game_state.screen_height:
             self.kill()
+            self.game_state.events.emit(BALL_LOST)
 
     def debug_draw(self):
         pygame.draw.rect(self.game_state.screen,
                          (255, 0, 0), self.rect, 1)
 
     def update(self, dt: float|int):
+        self.save_position()
         self.modify_sticky()
         self.move_ball(dt)
         self.bounds_check()
         self.paddle_collision_check()
         self.key_bindings()
-        self.tiles_collision()
         self.check_ball_dead()
     
     def draw(self, screen: pygame.Surface):
-        screen.blit(self.image, self.rect)
\ No newline at end of file
+        screen.blit(self.image, self.rect)
+
+
+ball_pool = SpritePool(Ball, "ball")
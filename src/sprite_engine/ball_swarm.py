@@ -0,0 +1,178 @@
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.game_configs import SIMULATION_HZ, LOG_THROTTLE
+from src.event_bus import BALL_HIT, BALL_LOST
+from src.log_handle import get_logger
+
+logger = get_logger(__name__)
+
+"""Batched update of all the balls. Multi ball doubles the number of balls every time it is picked up and every
+Ball.update is a handful of python method calls, after a few pickups the frame rate collapses.
+
+BallSwarm is a drop in replacement of the ball sprite group. Its update copies the state of all the balls into numpy
+arrays (structure of arrays: positions, velocities, sticky/magnet flags, timers) and runs the whole Ball.update sequence
+for all of them at once: sticky timer, following the bat, moving, bounds check, paddle bounce, releasing with space and
+dying below the screen. Only balls whose swept area touches the brick field go through the python swept brick collision
+(Ball.tiles_collision), the rest never look at a brick. The Ball objects stay the interface for everything else
+(powers, drawing), they get their new state written back at the end of the tick.
+
+numpy is optional, without it (or with VECTORISED_BALLS off) the normal sprite group is used.
+"""
+
+
+def _pygame_round(values):
+    """pygame.Rect rounds half away from zero when a float is assigned, numpy rounds half to even."""
+    return np.sign(values) * np.floor(np.abs(values) + 0.5)
+
+
+class BallSwarm(pygame.sprite.Group):
+    def __init__(self, game_state, *sprites):
+        self.game_state = game_state
+        self._field_key = None
+        self._field = None
+        self._balls = None
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._balls = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self._balls = None
+
+    def invalidate(self):
+        """The arrays are the real state of the balls between ticks, call this after changing a ball position,
+        velocity or flags from outside of the swarm so they get copied again."""
+        self._balls = None
+
+    def __gather(self):
+        """Copies the state of the balls into the arrays, only when balls were added or removed."""
+        balls = self.sprites()
+        self._balls = balls
+        self.pos = np.array([ball.pos for ball in balls], dtype=float).reshape(-1, 2)
+        self.vel = np.array([(ball.velocity.x, ball.velocity.y) for ball in balls], dtype=float).reshape(-1, 2)
+        self.max_angle = np.array([ball.velocity.max_angle for ball in balls], dtype=float)
+        self.size = np.array([ball.rect.size for ball in balls], dtype=float).reshape(-1, 2)
+        self.sticky = np.array([ball.is_sticky for ball in balls], dtype=bool)
+        self.magnet = np.array([ball.is_magnet for ball in balls], dtype=bool)
+        self.created = np.array([ball.current_time for ball in balls], dtype=float)
+        self.sticky_time = np.array([ball.sticky_time for ball in balls], dtype=float)
+
+    def __brick_field(self) -> pygame.Rect | None:
+        """Bounding rect of all the bricks, recomputed only when bricks die or a level loads."""
+        tiles_group = self.game_state.tiles_group
+        key = (id(self.game_state.tile_grid), len(tiles_group))
+        if key != self._field_key:
+            rects = [tile.rect for tile in tiles_group]
+            self._field = rects[0].unionall(rects[1:]) if rects else None
+            self._field_key = key
+        return self._field
+
+    def update(self, dt: float):
+        if not self:
+            return
+        if self._balls is None:
+            self.__gather()
+        balls = self._balls
+        pos, vel, size = self.pos, self.vel, self.size
+        sticky, magnet = self.sticky, self.magnet
+        game_state = self.game_state
+        bat = game_state.bat_sprite
+        sw, sh = game_state.screen_width, game_state.screen_height
+        prev_pos = pos.copy()
+
+        # modify_sticky
+        released = sticky & (game_state.scheduler.now - self.created > self.sticky_time)
+        if released.any():
+            logger.info("Made sticky false for %d balls", int(released.sum()), extra={"throttle": LOG_THROTTLE})
+            sticky &= ~released
+
+        # move_ball, stuck balls follow the bat
+        follow = sticky | magnet
+        if follow.any():
+            bat_x, bat_y = bat.pos
+            pos[follow, 0] = bat_x + bat.rect.w // 2
+            pos[follow, 1] = bat_y - size[follow, 1]
+
+        free = ~follow
+        disp = vel * (dt * SIMULATION_HZ)
+        needs_bricks = np.zeros(len(balls), dtype=bool)
+        field = self.__brick_field()
+        if field is not None:
+            low = np.minimum(pos, pos + disp) - 1
+            high = np.maximum(pos, pos + disp) + size + 1
+            needs_bricks = free & (low[:, 0] < field.right) & (high[:, 0] > field.left) & \
+                (low[:, 1] < field.bottom) & (high[:, 1] > field.top)
+        moved = free & ~needs_bricks
+        pos[moved] += disp[moved]
+
+        for idx in np.flatnonzero(needs_bricks):
+            ball = balls[idx]
+            ball.pos = pos[idx].tolist()
+            ball.velocity.x, ball.velocity.y = vel[idx].tolist()
+            ball.tiles_collision(disp[idx, 0], disp[idx, 1])
+            pos[idx] = ball.pos
+            vel[idx] = (ball.velocity.x, ball.velocity.y)
+
+        rect_x = _pygame_round(pos[:, 0])
+        rect_y = _pygame_round(pos[:, 1])
+
+        # bounds_check
+        hit_left = rect_x <= sw * 0.01
+        hit_right = ~hit_left & (rect_x >= sw * 0.98)
+        hit_top = rect_y <= sh * 0.05
+        vel[hit_left, 0] = np.abs(vel[hit_left, 0])
+        vel[hit_right, 0] = -np.abs(vel[hit_right, 0])
+        vel[hit_top, 1] = np.abs(vel[hit_top, 1])
+        if (hit_left | hit_right | hit_top).any():
+            game_state.events.emit(BALL_HIT, surface="wall")
+
+        # paddle_collision_check, the speed is read from the ball since the speed powers change it
+        bat_rect = bat.rect
+        on_paddle = (rect_x < bat_rect.right) & (rect_x + size[:, 0] > bat_rect.left) & \
+            (rect_y < bat_rect.bottom) & (rect_y + size[:, 1] > bat_rect.top) & (rect_y < sh)
+        if on_paddle.any():
+            hit_idx = np.flatnonzero(on_paddle)
+            speed = np.array([balls[idx].velocity.speed for idx in hit_idx], dtype=float)
+            hit_pos = (rect_x[hit_idx] + size[hit_idx, 0] // 2 - bat_rect.centerx) / (bat_rect.w / 2)
+            angle = hit_pos * self.max_angle[hit_idx]
+            vel[hit_idx, 0] = speed * np.sin(angle)
+            vel[hit_idx, 1] = -speed * np.cos(angle)
+            game_state.events.emit(BALL_HIT, surface="paddle")
+
+        # key_bindings
+        if game_state.space_pressed:
+            released |= sticky | magnet
+            sticky[:] = False
+            magnet[:] = False
+
+        for idx in np.flatnonzero(released):
+            balls[idx].is_sticky = bool(sticky[idx])
+            balls[idx].is_magnet = bool(magnet[idx])
+
+        for ball, prev, new_pos, new_vel in zip(balls, prev_pos.tolist(), pos.tolist(), vel.tolist()):
+            ball.prev_pos = prev
+            ball.pos = new_pos
+            ball.rect.topleft = new_pos
+            velocity = ball.velocity
+            velocity.x, velocity.y = new_vel
+
+        # check_ball_dead, killing a ball makes the arrays gathered again next tick
+        for idx in np.flatnonzero(rect_y >= sh):
+            balls[idx].kill()
+            game_state.events.emit(BALL_LOST)
+
+
+def create_ball_group(game_state, vectorised: bool) -> pygame.sprite.Group:
+    """BallSwarm when asked for and numpy is installed, a plain sprite group otherwise."""
+    if vectorised and np is not None:
+        return BallSwarm(game_state)
+    if vectorised:
+        logger.warning("numpy is not installed, falling back to the per ball update")
+    return pygame.sprite.Group()
@@ -0,0 +1,64 @@
+import pygame
+
+from src.game_state_management import GameState
+
+"""Bricks never move, they only change when they get hit. Blitting every surviving tile every frame is wasted work,
+so we composite the game screen containers and the whole brick field once into an offscreen layer.
+Per frame the game screen costs one blit of the layer, no matter how many bricks the level has.
+
+When a brick breaks or changes its image, only the rect of that brick is redrawn in the layer (container background
+first, then whatever bricks overlap the rect). The patched rects are kept in damaged so the frame that is being drawn
+can copy them to the screen (or the dirty rect renderer background).
+"""
+
+
+class BrickLayer:
+    def __init__(self, game_state: GameState):
+        self.game_state = game_state
+        self.screen_ui = game_state.screen_uis["game"]
+        self.containers = self.screen_ui.containers
+        self.surface: pygame.Surface | None = None
+        self.revision = None
+        self.damaged: list[pygame.Rect] = []
+
+    def __compose(self, area: pygame.Rect | None = None):
+        """Draws background and bricks into the layer, limited to area if given."""
+        self.surface.set_clip(area)
+        self.surface.fill((0, 0, 0))
+        for container in self.containers:
+            container.draw(self.game_state, self.surface)
+        tiles = self.game_state.tiles_group.sprites()
+        if area is not None:
+            tiles = [tile for tile in tiles if area.colliderect(tile.rect)]
+        self.surface.blits([(tile.image, tile.rect) for tile in tiles], doreturn=False)
+        self.surface.set_clip(None)
+
+    def build(self):
+        """Builds the whole layer, called once the tiles of the level are loaded."""
+        size = self.game_state.screen.get_size()
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size).convert()
+        self.revision = self.screen_ui.revision()
+        self.__compose()
+        self.damaged = []
+        return self
+
+    def invalidate(self, rect: pygame.Rect):
+        """Redraws rect of the layer. Tiles call this when they break or change their image."""
+        if self.surface is None:
+            return
+        rect = pygame.Rect(rect).clip(self.surface.get_rect())
+        if not rect:
+            return
+        self.__compose(rect)
+        self.damaged.append(rect)
+
+    def pop_damage(self) -> list[pygame.Rect]:
+        damaged = self.damaged
+        self.damaged = []
+        return damaged
+
+    def draw(self, screen: pygame.Surface):
+        if self.revision != self.screen_ui.revision():
+            self.build()
+        screen.blit(self.surface, (0, 0))
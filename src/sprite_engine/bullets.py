@@ -1,26 +1,32 @@
 import pygame
 from src.game_state_management import GameState
 from src.game_configs import BULLETS, BULLET_SPEED
+from src.utils.asset_cache import load_image
+from src.sprite_engine.interpolation import Interpolated
+from src.sprite_engine.tile_grid import collide_tiles
+from src.sprite_engine.pools import Pooled, SpritePool
 
 
-class Bullet(pygame.sprite.Sprite):
+class Bullet(Pooled, Interpolated, pygame.sprite.Sprite):
     def __init__(self,
                  game_state: GameState,
                  coords: tuple):
         super().__init__()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(game_state, coords)
+
+    def reset(self, game_state: GameState, coords: tuple):
+        """Reinitialises a pooled bullet, the rect is reused."""
         self.game_state = game_state
         self.coords = coords
-        self.image = pygame.image.load(BULLETS).convert_alpha()
-        self.image = pygame.transform.scale(self.image,
-                                            (coords[2], coords[3]))
-        self.rect = self.image.get_rect()
-        self.rect.topleft = (coords[0], coords[1])
+        self.image = load_image(BULLETS, (coords[2], coords[3]))
+        self.rect.size = self.image.get_size()
+        self.reset_position(coords[0], coords[1])
     
     def check_tile_collision(self):
-        br_col = pygame.sprite.spritecollide(self, self.game_state.tiles_group, dokill=False)
+        br_col = [tile for tile in collide_tiles(self, self.game_state) if tile.hits_to_break >= 1]
         if br_col:
-            br = br_col[0]
-            br.hits_to_break -= 1
+            br_col[0].hits_to_break -= 1
             self.kill()
     
     def check_out_of_bounds(self):
@@ -28,12 +34,16 @@ class Bullet(pygame.sprite.Sprite):
             self.kill()
 
     def update(self, dt):
-        self.rect.y -= BULLET_SPEED * dt
+        self.save_position()
+        self.set_position(self.pos[0], self.pos[1] - BULLET_SPEED * dt)
         self.check_tile_collision()
         self.check_out_of_bounds()
 
     def draw(self, screen: pygame.Surface):
         screen.blit(self.image, self.rect)
 
+bullet_pool = SpritePool(Bullet, "bullet")
+
+
 def bullet_factory(game_state: GameState, coords: tuple):
-    game_state.bullets_group.add(Bullet(game_state, coords))
\ No newline at end of file
+    game_state.bullets_group.add(bullet_pool.acquire(game_state, coords))
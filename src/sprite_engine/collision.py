@@ -0,0 +1,97 @@
+import math
+
+"""Continuous collision of the ball (a circle) against bricks (axis aligned rects).
+
+A fast ball moves many pixels per tick, testing for overlap at the end of the tick lets it skip thin bricks and
+guess the wrong face. Instead we sweep the circle along its displacement: moving a circle of radius r against a rect
+is the same as moving its center (a point) against the rect grown by r with rounded corners. The ray from the center
+is tested against the two slabs of the grown rect, and when it enters through a corner region against the corner
+circle. We get the time of impact t in [0, 1] (fraction of the displacement) and the surface normal to bounce on.
+"""
+
+
+def _ray_circle(px: float, py: float, dx: float, dy: float, cx: float, cy: float, r: float) -> float | None:
+    """Earliest t in [0, 1] where the point p + d * t is at distance r from c."""
+    mx, my = px - cx, py - cy
+    a = dx * dx + dy * dy
+    b = mx * dx + my * dy
+    c = mx * mx + my * my - r * r
+    if a == 0:
+        return None
+    disc = b * b - a * c
+    if disc < 0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    if 0 <= t <= 1:
+        return t
+    return None
+
+
+def _overlap_normal(px: float, py: float, r: float, rect) -> tuple | None:
+    """If the circle already overlaps rect, the normal pushing it out, else None."""
+    closest_x = min(max(px, rect.left), rect.right)
+    closest_y = min(max(py, rect.top), rect.bottom)
+    nx, ny = px - closest_x, py - closest_y
+    dist_sq = nx * nx + ny * ny
+    if dist_sq >= r * r:
+        return None
+    if dist_sq > 0:
+        dist = math.sqrt(dist_sq)
+        return (nx / dist, ny / dist)
+    # center inside the rect, push out through the nearest face
+    faces = ((px - rect.left, (-1.0, 0.0)), (rect.right - px, (1.0, 0.0)),
+             (py - rect.top, (0.0, -1.0)), (rect.bottom - py, (0.0, 1.0)))
+    return min(faces, key=lambda face: face[0])[1]
+
+
+def sweep_circle_rect(px: float, py: float, r: float, dx: float, dy: float, rect) -> tuple | None:
+    """Sweeps a circle with center p and radius r by the displacement d against rect.
+    Returns (t, nx, ny) for the first contact or None. A circle that already overlaps the rect and moves into it
+    collides at t=0."""
+    normal = _overlap_normal(px, py, r, rect)
+    if normal is not None:
+        if dx * normal[0] + dy * normal[1] < 0:
+            return (0.0, normal[0], normal[1])
+        return None
+
+    left, right = rect.left - r, rect.right + r
+    top, bottom = rect.top - r, rect.bottom + r
+    t_enter, t_exit = 0.0, 1.0
+    normal = None
+    for p, d, low, high, axis_normal in ((px, dx, left, right, (1.0, 0.0)), (py, dy, top, bottom, (0.0, 1.0))):
+        if d == 0:
+            if p < low or p > high:
+                return None
+            continue
+        t_low, t_high = (low - p) / d, (high - p) / d
+        sign = -1.0
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+            sign = 1.0
+        if t_low > t_enter:
+            t_enter = t_low
+            normal = (axis_normal[0] * sign, axis_normal[1] * sign)
+        t_exit = min(t_exit, t_high)
+        if t_enter > t_exit:
+            return None
+
+    # normal stays None when the center starts inside the grown rect, it can only be in a corner region there
+    hit_x, hit_y = px + dx * t_enter, py + dy * t_enter
+    corner_x = rect.left if hit_x < rect.left else rect.right if hit_x > rect.right else None
+    corner_y = rect.top if hit_y < rect.top else rect.bottom if hit_y > rect.bottom else None
+    if corner_x is None or corner_y is None:
+        if normal is None:
+            return None
+        return (t_enter, normal[0], normal[1])
+
+    # entered the grown rect through a corner region, the real surface there is the rounded corner
+    t = _ray_circle(px, py, dx, dy, corner_x, corner_y, r)
+    if t is None:
+        return None
+    nx, ny = (px + dx * t - corner_x) / r, (py + dy * t - corner_y) / r
+    return (t, nx, ny)
+
+
+def reflect(vx: float, vy: float, nx: float, ny: float) -> tuple:
+    dot = vx * nx + vy * ny
+    return (vx - 2 * dot * nx, vy - 2 * dot * ny)
@@ -0,0 +1,36 @@
+import pygame
+
+"""The simulation runs on a fixed tick (SIMULATION_HZ), rendering runs at whatever rate the display gives us.
+Moving sprites keep their position as floats in pos and the position of the previous tick in prev_pos.
+When a frame is drawn between two ticks, the sprite is drawn at the interpolated position
+prev_pos + (pos - prev_pos) * alpha where alpha is how far we are into the next tick.
+rect always holds the simulation position, collisions never look at the interpolated one.
+"""
+
+
+class Interpolated:
+    """Mixin for sprites that move. Call set_position to move, save_position at the start of every tick."""
+
+    def set_position(self, x: float, y: float):
+        self.pos = [x, y]
+        self.rect.topleft = (x, y)
+
+    def reset_position(self, x: float, y: float):
+        """Teleports the sprite, no interpolation from where it was."""
+        self.set_position(x, y)
+        self.prev_pos = list(self.pos)
+
+    def save_position(self):
+        self.prev_pos = list(self.pos)
+
+    def render_rect(self, alpha: float) -> pygame.Rect:
+        x = self.prev_pos[0] + (self.pos[0] - self.prev_pos[0]) * alpha
+        y = self.prev_pos[1] + (self.pos[1] - self.prev_pos[1]) * alpha
+        return pygame.Rect(round(x), round(y), self.rect.w, self.rect.h)
+
+
+def render_rect(sprite, alpha: float) -> pygame.Rect:
+    """Where the sprite should be drawn this frame, sprites that do not move are drawn at their rect."""
+    if isinstance(sprite, Interpolated):
+        return sprite.render_rect(alpha)
+    return sprite.rect
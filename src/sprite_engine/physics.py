@@ -0,0 +1,243 @@
+import math
+
+import pygame
+import pymunk
+
+from src.game_configs import SIMULATION_HZ, PYMUNK_SUBSTEPS
+from src.log_handle import get_logger
+from src.event_bus import BALL_HIT
+
+logger = get_logger(__name__)
+
+"""Physics backends move the balls and collide them with the walls, the bat and the bricks. The backend is picked
+at startup (GameRunner(physics=...), main.py --physics) and lives in game_state.physics.
+
+hand: the collision code of the game, Ball.update with its swept brick collision, bounds check and paddle bounce.
+With vectorised balls the BallSwarm does the same for all the balls at once.
+
+pymunk: the balls are dynamic circles in game_state.space. The walls are static segments on the inner edges of
+game_state.walls, the bricks static boxes, the bat a kinematic box moved from where it was at the start of the tick
+to where it is now. The space uses the spatial hash broad phase with cells the size of a brick. Collision handlers
+do the game logic: a brick loses a hit when a ball starts touching it (a fire ball goes through it), the bat sends
+the ball off at the angle of the hit position like Ball.paddle_collision_check does. Ball speed is kept as it was
+before the step, the solver only changes the direction. The ball state in the Ball sprites stays the real one,
+it is copied into the space before the step and back after it.
+
+Both backends follow the same rules but do not play the same game: the hand backend bounces on the screen bounds
+used by Ball.bounds_check while pymunk bounces on the walls, pymunk damages a brick once per contact and its bat
+misses fewer balls. After a few bounces the balls are elsewhere, so from the same start the bricks broken, the bat
+hits and the balls lost differ (benchmarks/bench_physics.py only compares the time of runs with close hit counts).
+"""
+
+HAND = "hand"
+PYMUNK = "pymunk"
+
+BALL_TYPE = 1
+BRICK_TYPE = 2
+WALL_TYPE = 3
+BAT_TYPE = 4
+
+
+class HandRolledPhysics:
+    name = HAND
+
+    def __init__(self, game_state):
+        self.game_state = game_state
+
+    def load_level(self):
+        """Called once the bricks, the bat and the walls of a level are in place."""
+
+    def remove_tile(self, tile):
+        """Called when a brick dies."""
+
+    def update_balls(self, balls: pygame.sprite.AbstractGroup, dt: float):
+        """One simulation tick for all the balls."""
+        balls.update(dt=dt)
+
+
+class PymunkPhysics(HandRolledPhysics):
+    name = PYMUNK
+
+    def __init__(self, game_state, substeps: int = PYMUNK_SUBSTEPS):
+        super().__init__(game_state)
+        self.substeps = substeps
+        self._tiles: dict[pymunk.Shape, pygame.sprite.Sprite] = {}
+        self._tile_shapes: dict[pygame.sprite.Sprite, pymunk.Shape] = {}
+        self._ball_shapes: dict[pygame.sprite.Sprite, pymunk.Circle] = {}
+        self._balls: dict[pymunk.Shape, pygame.sprite.Sprite] = {}
+        self._bat = None
+        self._bat_key = None
+        self._paddle_hits = set()
+
+    def load_level(self):
+        """Builds a new space for the level, the old bodies and shapes are dropped with the old space."""
+        game_state = self.game_state
+        space = pymunk.Space()
+        grid = game_state.tile_grid
+        cell = max(grid.stride_x, grid.stride_y) if grid is not None else game_state.screen_width * 0.05
+        space.use_spatial_hash(cell, max(1000, len(game_state.tiles_group) * 10))
+        space.on_collision(BALL_TYPE, BRICK_TYPE, begin=self.__brick_hit)
+        space.on_collision(BALL_TYPE, BAT_TYPE, begin=self.__paddle_hit)
+        space.on_collision(BALL_TYPE, WALL_TYPE, begin=self.__wall_hit)
+        game_state.space = space
+        self._tiles.clear()
+        self._tile_shapes.clear()
+        self._ball_shapes.clear()
+        self._balls.clear()
+        self._bat = None
+        self._bat_key = None
+        self.__add_walls()
+        for tile in game_state.tiles_group:
+            self.__add_tile(tile)
+
+    def __add_walls(self):
+        walls = self.game_state.walls
+        edges = []
+        if 'left' in walls:
+            rect = walls['left']
+            edges.append(((rect.right, rect.top), (rect.right, rect.bottom)))
+        if 'right' in walls:
+            rect = walls['right']
+            edges.append(((rect.left, rect.top), (rect.left, rect.bottom)))
+        if 'top' in walls:
+            rect = walls['top']
+            edges.append(((rect.left, rect.bottom), (rect.right, rect.bottom)))
+        space = self.game_state.space
+        for start, end in edges:
+            segment = pymunk.Segment(space.static_body, start, end, 0)
+            segment.elasticity = 1.0
+            segment.collision_type = WALL_TYPE
+            space.add(segment)
+
+    def __add_tile(self, tile):
+        rect = tile.rect
+        space = self.game_state.space
+        shape = pymunk.Poly(space.static_body, [rect.topleft, rect.topright, rect.bottomright, rect.bottomleft])
+        shape.elasticity = 1.0
+        shape.collision_type = BRICK_TYPE
+        space.add(shape)
+        self._tiles[shape] = tile
+        self._tile_shapes[tile] = shape
+
+    def remove_tile(self, tile):
+        shape = self._tile_shapes.pop(tile, None)
+        if shape is None:
+            return
+        del self._tiles[shape]
+        self.game_state.space.remove(shape)
+
+    def __sync_bat(self, dt: float):
+        """Rebuilds the bat box when the bat changes size or is replaced. The kinematic body starts the step where
+        the bat was at the start of the tick and moves to where it is now."""
+        bat = self.game_state.bat_sprite
+        space = self.game_state.space
+        key = (id(bat), bat.rect.size)
+        if key != self._bat_key:
+            if self._bat is not None:
+                space.remove(self._bat.body, self._bat)
+            body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
+            self._bat = pymunk.Poly.create_box(body, bat.rect.size)
+            self._bat.collision_type = BAT_TYPE
+            space.add(body, self._bat)
+            self._bat_key = key
+        w, h = bat.rect.size
+        body = self._bat.body
+        body.position = (bat.prev_pos[0] + w / 2, bat.prev_pos[1] + h / 2)
+        body.velocity = ((bat.pos[0] - bat.prev_pos[0]) / dt, (bat.pos[1] - bat.prev_pos[1]) / dt)
+
+    def __sync_balls(self, free: list):
+        """Adds the balls that move freely to the space and removes the dead and stuck ones,
+        then copies the ball positions and velocities into their bodies."""
+        space = self.game_state.space
+        wanted = set(free)
+        for ball, shape in list(self._ball_shapes.items()):
+            if ball not in wanted or shape.radius != ball.rect.w / 2:
+                space.remove(shape.body, shape)
+                del self._ball_shapes[ball]
+                del self._balls[shape]
+        for ball in free:
+            shape = self._ball_shapes.get(ball)
+            if shape is None:
+                body = pymunk.Body(1, math.inf)
+                shape = pymunk.Circle(body, ball.rect.w / 2)
+                shape.elasticity = 1.0
+                shape.collision_type = BALL_TYPE
+                shape.filter = pymunk.ShapeFilter(group=BALL_TYPE)
+                space.add(body, shape)
+                self._ball_shapes[ball] = shape
+                self._balls[shape] = ball
+            radius = shape.radius
+            shape.body.position = (ball.pos[0] + radius, ball.pos[1] + radius)
+            shape.body.velocity = (ball.velocity.x * SIMULATION_HZ, ball.velocity.y * SIMULATION_HZ)
+
+    def __brick_hit(self, arbiter: pymunk.Arbiter, space: pymunk.Space, data):
+        ball_shape, brick_shape = arbiter.shapes
+        tile = self._tiles.get(brick_shape)
+        if tile is None or tile.hits_to_break <= 0:
+            arbiter.process_collision = False
+            return
+        tile.hits_to_break -= 1
+        if self._balls[ball_shape].is_fireball:
+            arbiter.process_collision = False
+            return
+        self.game_state.events.emit(BALL_HIT, surface="brick")
+
+    def __paddle_hit(self, arbiter: pymunk.Arbiter, space: pymunk.Space, data):
+        """Same bounce as Ball.paddle_collision_check, the angle depends on where the ball hits the bat."""
+        ball_shape, bat_shape = arbiter.shapes
+        ball = self._balls[ball_shape]
+        bat_rect = self.game_state.bat_sprite.rect
+        hit_pos = (ball_shape.body.position.x - bat_shape.body.position.x) / (bat_rect.w / 2)
+        ball.velocity.angle_modify(hit_pos=hit_pos)
+        ball_shape.body.velocity = (ball.velocity.x * SIMULATION_HZ, ball.velocity.y * SIMULATION_HZ)
+        self._paddle_hits.add(ball)
+        arbiter.process_collision = False
+        self.game_state.events.emit(BALL_HIT, surface="paddle")
+
+    def __wall_hit(self, arbiter: pymunk.Arbiter, space: pymunk.Space, data):
+        self.game_state.events.emit(BALL_HIT, surface="wall")
+
+    def update_balls(self, balls: pygame.sprite.AbstractGroup, dt: float):
+        """Ball.update split around a single step of the space: the sticky timers and the balls stuck to the bat
+        are handled per ball, the free balls all move in the step."""
+        game_state = self.game_state
+        bat = game_state.bat_sprite
+        sprites = balls.sprites()
+        free = []
+        for ball in sprites:
+            ball.save_position()
+            ball.modify_sticky()
+            if ball.is_sticky or ball.is_magnet:
+                ball.sticky_movement((bat.pos[0], bat.pos[1], bat.rect.w, bat.rect.h))
+            else:
+                free.append(ball)
+        self.__sync_bat(dt)
+        self.__sync_balls(free)
+        speeds = [math.hypot(ball.velocity.x, ball.velocity.y) for ball in free]
+        self._paddle_hits.clear()
+        step = dt / self.substeps
+        for _ in range(self.substeps):
+            game_state.space.step(step)
+        for ball, speed in zip(free, speeds):
+            body = self._ball_shapes[ball].body
+            radius = self._ball_shapes[ball].radius
+            ball.set_position(body.position.x - radius, body.position.y - radius)
+            if ball in self._paddle_hits:
+                continue
+            vx, vy = body.velocity
+            length = math.hypot(vx, vy)
+            if length > 0:
+                ball.velocity.x = vx / length * speed
+                ball.velocity.y = vy / length * speed
+        for ball in sprites:
+            ball.key_bindings()
+            ball.check_ball_dead()
+
+
+def create_physics(game_state, name: str) -> HandRolledPhysics:
+    match name:
+        case "hand":
+            return HandRolledPhysics(game_state)
+        case "pymunk":
+            return PymunkPhysics(game_state)
+    raise ValueError(f"Unknown physics backend: {name}")
@@ -4,10 +4,12 @@ from src.game_state_management import GameState
 from src.game_configs import NORMAL_BAT, MAGNET_BAT, BULLETS_BAT, BAT_MOVEMENT_SPEED
 from src.sprite_engine.bullets import bullet_factory
 from src.log_handle import get_logger
+from src.utils.asset_cache import load_image
+from src.sprite_engine.interpolation import Interpolated
 
 logger = get_logger(__name__)
 
-class Bat(pygame.sprite.Sprite):
+class Bat(Interpolated, pygame.sprite.Sprite):
     def __init__(self, 
                  coords: tuple,
                  game_state: GameState):
@@ -23,8 +25,8 @@ class Bat(pygame.sprite.Sprite):
                            "magnet":{"big":[], "small": [], "normal": []},
                            "bullets": {"big":[], "small": [], "normal": []}}
         self.load_frames()
-        self.current_time = pygame.time.get_ticks()
-        self.current_time_bullet = pygame.time.get_ticks()
+        self.current_time = game_state.scheduler.now
+        self.current_time_bullet = game_state.scheduler.now
         self.velocity_goal = 0
         self.bounds = (2, self.game_state.screen_width - 2)
         self.bullet_cool_down = 100
@@ -32,12 +34,7 @@ class Bat(pygame.sprite.Sprite):
 
 
     def __load_transform(self, bats: list[str], dims: tuple):
-        images = []
-        for bat in bats:
-            image = pygame.image.load(bat).convert_alpha()
-            image = pygame.transform.scale(image, dims)
-            images.append(image)
-        return images
+        return [load_image(bat, dims) for bat in bats]
     
 
     def __load_powered_bats(self, bats: list[str], bat_name):
@@ -64,11 +61,11 @@ class Bat(pygame.sprite.Sprite):
         self.curr_frames_len = len(self.current_bat_list)
         self.image = self.current_bat_list[self.curr_frame]
         self.rect = self.image.get_rect()
-        self.rect.topleft = (self.coords[0], self.coords[1])
+        self.reset_position(self.coords[0], self.coords[1])
 
 
     def change_frame_check(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game_state.scheduler.now
         if not ((current_time - self.current_time) >= self.frame_change_delay):
             return
         next_frame = self.curr_frame + 1
@@ -95,7 +92,7 @@ class Bat(pygame.sprite.Sprite):
     def move_bat(self, dt: float):
         if dt > 0.15:
             dt = 0.15
-        self.rect.x += self.velocity_goal * dt
+        self.set_position(self.pos[0] + self.velocity_goal * dt, self.pos[1])
 
 
     def create_bullets(self):
@@ -110,7 +107,7 @@ class Bat(pygame.sprite.Sprite):
 
 
     def check_cool_down(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game_state.scheduler.now
         if (current_time - self.current_time_bullet) > self.bullet_cool_down:
             self.shoot_bullets = True
             self.current_time_bullet = current_time
@@ -119,6 +116,7 @@ class Bat(pygame.sprite.Sprite):
         
 
     def update(self, dt: float):
+        self.save_position()
         self.change_frame_check()
         self.key_bindings()
         self.move_bat(dt)
@@ -130,9 +128,8 @@ class Bat(pygame.sprite.Sprite):
 
 
     def __modify_rect(self, frame):
-        prev_x, prev_y = self.rect.x, self.rect.y
         self.rect = frame.get_rect()
-        self.rect.topleft = (prev_x, prev_y)
+        self.rect.topleft = self.pos
 
 
     def __modify_bat(self, size):
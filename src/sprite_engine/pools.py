@@ -0,0 +1,99 @@
+import pygame
+
+from src.game_configs import POOL_MAX_FREE
+from src.log_handle import get_logger
+
+logger = get_logger(__name__)
+
+"""Free lists for the short lived sprites. Bullets are fired two at a time every 100ms, powers drop from every
+power brick and multi ball doubles the balls, all of them die moments later. Instead of building a new sprite
+(python object, rect, position lists) every time and letting the garbage collector clean up, dead sprites go back
+to their pool and the next acquire reinitialises one of them.
+
+A pooled sprite class needs a reset method taking the same arguments as its __init__ and should call release from
+its kill. acquire(*args) hands out a free sprite reset with args or builds a new one when the pool is empty.
+prewarm builds sprites up front at level load so the first bullets and powers do not allocate either.
+Never keep a reference to a sprite after killing it, it will be handed out again. A pool keeps at most max_free dead
+sprites, after a multi ball storm the extra balls are left to the garbage collector instead of being kept forever.
+"""
+
+
+class SpritePool:
+    def __init__(self, factory, name: str, max_free: int = POOL_MAX_FREE):
+        self.factory = factory
+        self.name = name
+        self.max_free = max_free
+        self.free: list[pygame.sprite.Sprite] = []
+        self.created = 0
+        self.reused = 0
+        self.in_use = 0
+        self.high_water = 0
+        self.dropped = 0
+
+    def acquire(self, *args) -> pygame.sprite.Sprite:
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            self.reused += 1
+        else:
+            sprite = self.factory(*args)
+            sprite.pool = self
+            self.created += 1
+        sprite.in_pool = False
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return sprite
+
+    def release(self, sprite: pygame.sprite.Sprite):
+        """Takes the sprite back, releasing twice (a sprite killed twice in the same tick) does nothing."""
+        if sprite.in_pool:
+            return
+        sprite.in_pool = True
+        self.in_use -= 1
+        if len(self.free) >= self.max_free:
+            sprite.pool = None
+            self.dropped += 1
+            return
+        self.free.append(sprite)
+
+    def prewarm(self, count: int, *args):
+        """Makes sure at least count sprites are free, built with args. Does not count towards high_water."""
+        missing = count - len(self.free)
+        if missing <= 0:
+            return
+        high_water = self.high_water
+        sprites = [self.acquire(*args) for _ in range(missing)]
+        for sprite in sprites:
+            self.release(sprite)
+        self.high_water = high_water
+
+    def stats(self) -> dict:
+        return {"created": self.created,
+                "reused": self.reused,
+                "in_use": self.in_use,
+                "free": len(self.free),
+                "dropped": self.dropped,
+                "high_water": self.high_water}
+
+
+class Pooled:
+    """Mixin for pooled sprites, kill sends the sprite back to the pool it came from.
+    Sprites built directly instead of through a pool are just killed."""
+    pool = None
+    in_pool = False
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
+
+
+def release_group(group: pygame.sprite.AbstractGroup):
+    """Use instead of group.empty() for pooled sprites, emptying the group would leak them out of the pool."""
+    for sprite in group.sprites():
+        sprite.kill()
+
+
+def log_pool_stats(*pools: SpritePool):
+    for pool in pools:
+        logger.info(f"{pool.name} pool stats: {pool.stats()}")
@@ -3,7 +3,11 @@ import pygame
 from src.game_state_management import GameState
 from src.game_configs import POWERS, POWER_FALL_SPEED, BALL_SPEED
 from src.log_handle import get_logger
-from src.sprite_engine.ball import Ball
+from src.event_bus import POWER_COLLECTED
+from src.sprite_engine.ball import ball_pool
+from src.utils.asset_cache import load_image
+from src.sprite_engine.interpolation import Interpolated
+from src.sprite_engine.pools import Pooled, SpritePool
 
 logger = get_logger(__name__)
 
@@ -24,8 +28,8 @@ class PowerHandler:
         new_balls = []
         for ball in self.game_state.ball_sprite_group:
             coords = (ball.rect.x, ball.rect.y, ball.rect.w / 2, ball.rect.h / 2)
-            b1 = Ball(coords, self.game_state)
-            b2 = Ball(coords, self.game_state)
+            b1 = ball_pool.acquire(coords, self.game_state)
+            b2 = ball_pool.acquire(coords, self.game_state)
             b1.velocity.x = -BALL_SPEED * 0.8
             b2.velocity.x = BALL_SPEED * 0.8
             b1.is_sticky = False
@@ -54,38 +58,48 @@ class PowerHandler:
                 self.__create_multi_balls()
 
 
-class Power(pygame.sprite.Sprite):
+class Power(Pooled, Interpolated, pygame.sprite.Sprite):
     def __init__(self,
                  game_state: GameState,
                  coords: tuple,
                  power_name: str):
         super().__init__()
+        self.power_handle = None
+        self.reset(game_state, coords, power_name)
+
+    def reset(self, game_state: GameState, coords: tuple, power_name: str):
+        """Reinitialises a pooled power, the PowerHandler is kept while the game state is the same."""
         self.game_state = game_state
         self.coords = coords
         self.power_name = power_name
         self.image_path = POWERS[power_name]
-        self.power_handle = PowerHandler(game_state)
+        if self.power_handle is None or self.power_handle.game_state is not game_state:
+            self.power_handle = PowerHandler(game_state)
+        else:
+            self.power_handle.orig_bat_size = game_state.bat_sprite.rect.w
         self.load_frames()
 
     def load_frames(self):
-        image = pygame.image.load(self.image_path).convert_alpha()
-        self.image = pygame.transform.scale(image, (self.coords[2], self.coords[3]))
+        self.image = load_image(self.image_path, (self.coords[2], self.coords[3]))
         self.rect = self.image.get_rect()
-        self.rect.topleft = (self.coords[0], self.coords[1])
+        self.reset_position(self.coords[0], self.coords[1])
     
     def collide_check(self):
         if not (self.rect.colliderect(self.game_state.bat_sprite.rect)):
             return
         self.power_handle.assign_power(self.power_name)
-        self.game_state.sound_manager.play_sound("power_gain")
+        self.game_state.events.emit(POWER_COLLECTED, power_name=self.power_name)
         self.kill()
 
     def update(self, dt):
+        self.save_position()
         self.collide_check()
-        self.rect.y += POWER_FALL_SPEED * dt
+        self.set_position(self.pos[0], self.pos[1] + POWER_FALL_SPEED * dt)
         if self.rect.y >= self.game_state.screen_height:
             self.kill()
 
     def draw(self, screen: pygame.Surface):
         screen.blit(self.image, self.rect)
 
+
+power_pool = SpritePool(Power, "power")
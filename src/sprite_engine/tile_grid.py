@@ -0,0 +1,77 @@
+import math
+
+import pygame
+
+"""Broad phase for brick collisions. The bricks of a level sit on a regular grid, LevelManager.load_tiles places
+them at tiles_offsets with a stride of the tile size + 8% gap. Instead of testing a rect against every brick with
+pygame.sprite.spritecollide, we map the rect to the grid cells it covers and only test the bricks in those cells.
+
+query(rect) returns the bricks colliding with rect in the same order spritecollide would (row by row, the order the
+tiles were added to tiles_group), so collision handling does not change. Tiles remove themselves when they die.
+"""
+
+
+class TileGrid:
+    def __init__(self, origin: tuple, stride: tuple, rows: int, cols: int):
+        self.origin_x, self.origin_y = origin
+        self.stride_x, self.stride_y = stride
+        self.rows = rows
+        self.cols = cols
+        self.cells: list[list] = [[None] * cols for _ in range(rows)]
+        self.count = 0
+
+    def add(self, tile, row: int, col: int):
+        self.cells[row][col] = tile
+        tile.grid_cell = (row, col)
+        self.count += 1
+
+    def remove(self, tile):
+        cell = getattr(tile, "grid_cell", None)
+        if cell is None:
+            return
+        row, col = cell
+        if self.cells[row][col] is tile:
+            self.cells[row][col] = None
+            self.count -= 1
+        tile.grid_cell = None
+
+    def cell_range(self, rect: pygame.Rect) -> tuple[range, range]:
+        """Rows and columns covered by rect. Tile rects are rounded to pixels, so we look one pixel further
+        on every side to never miss a tile that pokes out of its cell."""
+        first_col = math.floor((rect.left - 1 - self.origin_x) / self.stride_x)
+        last_col = math.floor((rect.right + 1 - self.origin_x) / self.stride_x)
+        first_row = math.floor((rect.top - 1 - self.origin_y) / self.stride_y)
+        last_row = math.floor((rect.bottom + 1 - self.origin_y) / self.stride_y)
+        rows = range(max(first_row, 0), min(last_row, self.rows - 1) + 1)
+        cols = range(max(first_col, 0), min(last_col, self.cols - 1) + 1)
+        return rows, cols
+
+    def candidates(self, rect: pygame.Rect) -> list:
+        """Every live tile in the cells covered by rect, without the exact rect test."""
+        rows, cols = self.cell_range(rect)
+        found = []
+        for row in rows:
+            cells = self.cells[row]
+            for col in cols:
+                tile = cells[col]
+                if tile is not None:
+                    found.append(tile)
+        return found
+
+    def query(self, rect: pygame.Rect) -> list:
+        """Tiles colliding with rect, drop-in replacement of spritecollide(sprite, tiles_group, dokill=False)."""
+        return [tile for tile in self.candidates(rect) if rect.colliderect(tile.rect)]
+
+
+def collide_tiles(sprite, game_state) -> list:
+    """Uses the grid when the level has one, falls back to spritecollide otherwise."""
+    if game_state.tile_grid is None:
+        return pygame.sprite.spritecollide(sprite, game_state.tiles_group, dokill=False)
+    return game_state.tile_grid.query(sprite.rect)
+
+
+def tile_candidates(rect: pygame.Rect, game_state) -> list:
+    """Bricks that may touch rect (a swept area), in tiles_group order."""
+    if game_state.tile_grid is None:
+        return [tile for tile in game_state.tiles_group if rect.colliderect(tile.rect)]
+    return game_state.tile_grid.candidates(rect)
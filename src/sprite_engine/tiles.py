@@ -2,7 +2,9 @@ from typing import Any
 import pygame
 from src.game_configs import TILES_DICT
 from src.game_state_management import GameState
-from src.sprite_engine.powers import Power
+from src.sprite_engine.powers import power_pool
+from src.utils.asset_cache import load_image
+from src.event_bus import BRICK_DAMAGED, BRICK_DESTROYED
 
 class Tile(pygame.sprite.Sprite):
     def __init__(self, 
@@ -17,9 +19,10 @@ class Tile(pygame.sprite.Sprite):
         self.image_name = image_name
         self.coords = coords
         self.is_broken = False
-        self.hits_to_break = 1 if not is_double_hit else 2
+        self._hits_to_break = 1 if not is_double_hit else 2
         self.power = power
         self.game_state = game_state
+        self.grid_cell = None
         self.load_frames()
 
     def load_frames(self):
@@ -29,10 +32,7 @@ class Tile(pygame.sprite.Sprite):
             if broken:
                 path += "_broken"
             path += ".png"
-            image = pygame.image.load(path).convert_alpha()
-            image = pygame.transform.scale(image, 
-                                            (self.coords[2], self.coords[3]))
-            return image
+            return load_image(path, (self.coords[2], self.coords[3]))
         
         self.normal_frame = load_transform(self.image_path)
         self.broken_frame = load_transform(self.image_path, True)
@@ -40,14 +40,42 @@ class Tile(pygame.sprite.Sprite):
         self.rect = self.image.get_rect()
         self.rect.topleft = (self.coords[0], self.coords[1])
 
-    def update(self):
-        if self.hits_to_break >= 1:
+    @property
+    def hits_to_break(self):
+        return self._hits_to_break
+
+    @hits_to_break.setter
+    def hits_to_break(self, val: int):
+        """A double hit tile shows its broken frame once it has a single hit left. Losing a hit is announced on the
+        event bus, the brick is killed by the brick_destroyed listener, nothing polls the bricks."""
+        was_alive = self._hits_to_break >= 1
+        self._hits_to_break = val
+        if val == 1 and self.image is not self.broken_frame:
+            self.image = self.broken_frame
+            self.invalidate()
+        self.game_state.events.emit(BRICK_DAMAGED, tile=self)
+        if was_alive and val < 1:
+            self.game_state.events.emit(BRICK_DESTROYED, tile=self)
+
+    def invalidate(self):
+        """Patches the pre-composited brick layer where this tile is."""
+        if self.game_state.brick_layer is not None:
+            self.game_state.brick_layer.invalidate(self.rect)
+
+    def kill(self):
+        super().kill()
+        if self.game_state.tile_grid is not None:
+            self.game_state.tile_grid.remove(self)
+        if self.game_state.physics is not None:
+            self.game_state.physics.remove_tile(self)
+        self.invalidate()
+
+    def drop_power(self):
+        if not self.power:
             return
-        if self.power:
-            coords = (self.rect.x, self.rect.y, self.rect.w * 0.6, self.rect.h * 0.6)
-            power_sprite = Power(self.game_state, coords, self.power)
-            self.game_state.powers_group.add(power_sprite)
-        self.kill()
+        coords = (self.rect.x, self.rect.y, self.rect.w * 0.6, self.rect.h * 0.6)
+        power_sprite = power_pool.acquire(self.game_state, coords, self.power)
+        self.game_state.powers_group.add(power_sprite)
 
     def draw(self, screen: pygame.Surface):
         screen.blit(self.image, self.rect)
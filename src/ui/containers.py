@@ -1,15 +1,19 @@
-from typing import Any
-
 import pygame
 
 from src.game_state_management import GameState
-from src.ui.elements import build_group
+from src.ui.elements import Button, build_buttons
+from src.ui.layout import ContainerLayout, ButtonLayout
 from src.utils import draw_utils
 
-"""The module dedicated to build containers. Containers are sections within a screen. 
+"""The module dedicated to build containers. Containers are sections within a screen.
 Containers can be of Rectangle and circle. They can be placed anywhere on the screen. We calculate their locations with offsets
 ex: if container's x is 0.5 then its x is located at 50% of the screen.
 
+The UI is retained: a container renders its background and its buttons into its own cached surface and draws that
+surface with a single blit. The cache is rebuilt only after invalidate(), which bumps revision. Anything that changes
+how a container looks (focus and hover of a button, a new background image) must call it. The dirty rect renderer and
+the brick layer compare the revisions to know when the UI changed.
+
 Ooops, I mislabelled margin as padding.
 """
 
@@ -17,6 +21,8 @@ Ooops, I mislabelled margin as padding.
 class BaseContainer:
     """A base class that sets backgroud_color, x and y coords"""
 
+    revision = 0
+
     def set_background_color(self, color: tuple | None):
         self.background_color = (0, 0, 0) if not color else color
         return self
@@ -29,11 +35,16 @@ class BaseContainer:
         self.y_coordinate = screen_height * y_offset
         return self
 
+    def invalidate(self):
+        """The cached surface is rendered again on the next draw."""
+        self.revision += 1
+
 
 class CircleContainer(BaseContainer):
     def set_background_image(self, img: str | None):
         img = draw_utils.set_circle_background(img, self.radius)
         self.background_image = img
+        self.invalidate()
 
     def set_size(self, radius_offset: float, screen_width: float):
         self.radius = screen_width * radius_offset
@@ -46,10 +57,10 @@ class CircleContainer(BaseContainer):
         self.y_coordinate += paddings.get("up", 0) - paddings.get("down", 0)
         return self
 
-    def set_groups(self, groups: list[dict], game_state: GameState): ...
+    def set_buttons(self, buttons: list[ButtonLayout], game_state: GameState): ...
 
-    def draw(self, game_state: GameState):
-        screen = game_state.screen
+    def draw(self, game_state: GameState, surface: pygame.Surface | None = None):
+        screen = game_state.screen if surface is None else surface
         pygame.draw.circle(
             screen,
             self.background_color,
@@ -63,12 +74,17 @@ class CircleContainer(BaseContainer):
 
 
 class RectangleContainer(BaseContainer):
+    def __init__(self):
+        self.elements: list[Button] = []
+        self.surface: pygame.Surface | None = None
+        self.rendered_revision = -1
+
     def set_background_image(self, img: str | None):
         if not img:
             self.background_image = None
-            return self
-        background_image = draw_utils.set_rect_background(img, self.width, self.height)
-        self.background_image = background_image
+        else:
+            self.background_image = draw_utils.set_rect_background(img, self.width, self.height)
+        self.invalidate()
         return self
 
     def set_size(
@@ -95,45 +111,54 @@ class RectangleContainer(BaseContainer):
         self.height -= up + down
         return self
 
-    def set_groups(self, groups: list[dict], game_state: GameState):
-        self.elements = []
-        for group in groups:
-            group["x_coord"] = self.x_coordinate + (self.width * group["x_offset"])
-            group["y_coord"] = self.y_coordinate + (self.height * group["y_offset"])
-            group["x_gap_val"] = self.width * group["x_gap"]
-            group["y_gap_val"] = self.height * group["y_gap"]
-            group["container_dims"] = {
-                "type": "rect",
-                "width": self.width,
-                "height": self.height,
-            }
-            self.elements.extend(build_group(group, game_state))
-
-    def draw(self, game_state: GameState):
-        screen = game_state.screen
-        pygame.draw.rect(
-            screen,
-            self.background_color,
-            (self.x_coordinate, self.y_coordinate, self.width, self.height),
-        )
+    def set_buttons(self, buttons: list[ButtonLayout], game_state: GameState):
+        container_dims = {
+            "type": "rect",
+            "x": self.x_coordinate,
+            "y": self.y_coordinate,
+            "width": self.width,
+            "height": self.height,
+        }
+        self.elements = build_buttons(buttons, container_dims, game_state)
+        self.invalidate()
+        return self
+
+    def render(self) -> pygame.Surface:
+        """The cached surface, rendered again only when the container was invalidated since the last render."""
+        if self.surface is not None and self.rendered_revision == self.revision:
+            return self.surface
+        size = (int(self.width), int(self.height))
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size).convert()
+        self.surface.fill(self.background_color)
         if self.background_image:
-            screen.blit(self.background_image, (self.x_coordinate, self.y_coordinate))
+            self.surface.blit(self.background_image, (0, 0))
+        offset = (self.x_coordinate, self.y_coordinate)
+        for button in self.elements:
+            button.draw(self.surface, offset)
+        self.rendered_revision = self.revision
+        return self.surface
+
+    def draw(self, game_state: GameState, surface: pygame.Surface | None = None):
+        """surface defaults to the screen, the brick layer draws the container into its own offscreen surface."""
+        screen = game_state.screen if surface is None else surface
+        screen.blit(self.render(), (self.x_coordinate, self.y_coordinate))
 
 
-def rectangle_builder(container: dict[str, Any], game_state: GameState):
+def rectangle_builder(layout: ContainerLayout, game_state: GameState):
     rect_obj = RectangleContainer()
-    rect_obj.set_background_color(container.get("background_color")).set_x_coords(
-        container.get("x_offset"), game_state.screen_width
-    ).set_y_coords(container.get("y_offset"), game_state.screen_height).set_size(
-        container.get("width_offset"),
-        container.get("height_offset"),
+    rect_obj.set_background_color(layout.background_color).set_x_coords(
+        layout.x_offset, game_state.screen_width
+    ).set_y_coords(layout.y_offset, game_state.screen_height).set_size(
+        layout.width_offset,
+        layout.height_offset,
         game_state.screen_width,
         game_state.screen_height,
     ).set_paddings(
-        container.get("padding", {})
+        layout.padding
     ).set_background_image(
-        container.get("background_image")
-    ).set_groups(
-        container.get("groups", []), game_state
+        layout.background_image
+    ).set_buttons(
+        layout.buttons, game_state
     )
     return rect_obj
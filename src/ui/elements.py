@@ -1,16 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import Any
 
 import pygame
 
 from src.game_state_management import GameState
-from src.utils import draw_utils
+from src.utils import draw_utils, text_cache
 from src.log_handle import get_logger
+from src.ui.layout import ButtonLayout
 
 logger = get_logger(__name__)
 
 """This module is dedicated for creating buttons and other elements.
-Elements are componenets within container. the location of elements is w.r.t to the container not the screen."""
+Elements are componenets within container. the location of elements is w.r.t to the container not the screen.
+Buttons are built from the compiled ButtonLayout (src/ui/layout.py) and keep their screen coords."""
 
 
 class Button(ABC):
@@ -33,8 +34,8 @@ class Button(ABC):
         self.text = text
         self.text_weight = text_weight
         self.text_size = text_size
-        self.font = pygame.font.Font(font, text_size)
-        self.font.set_bold(text_weight == "bold")
+        self.font_name = font
+        self.font = text_cache.get_font(font, text_size, text_weight == "bold")
         self.hover = hover
         self.background_color = background_color
         self.original_color = background_color
@@ -50,7 +51,9 @@ class Button(ABC):
         ...
             
     @abstractmethod
-    def draw(self): ...
+    def draw(self, surface: pygame.Surface | None = None, offset: tuple = (0, 0)):
+        """Draws the button on surface (the screen by default), offset is the topleft of surface on the screen.
+        The containers draw their buttons into their cached surface."""
 
 
 class RectangleButton(Button):
@@ -62,15 +65,18 @@ class RectangleButton(Button):
                                                                    self.coords_rect.w,
                                                                    self.coords_rect.h)
 
-    def draw(self):
-        pygame.draw.rect(self.screen, self.background_color, self.coords, 0)
-        text_surface = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=self.coords_rect.center)
-        self.screen.blit(text_surface, text_rect)
-        if not self.background_image_obj:
+    def draw(self, surface: pygame.Surface | None = None, offset: tuple = (0, 0)):
+        screen = self.screen if surface is None else surface
+        rect = self.coords_rect.move(-offset[0], -offset[1])
+        pygame.draw.rect(screen, self.background_color, rect, 0)
+        if self.background_image_obj is None:
             self.background_image_obj = self.draw_background_image()
-        else:
-            self.screen.blit(self.background_image_obj, self.coords_rect)
+        if self.background_image_obj is not None:
+            screen.blit(self.background_image_obj, rect)
+        text_surface = text_cache.render_text(self.text, self.text_color, self.font_name,
+                                              self.text_size, self.text_weight == "bold")
+        text_rect = text_surface.get_rect(center=rect.center)
+        screen.blit(text_surface, text_rect)
 
 
 class CircleButton(Button):
@@ -82,91 +88,72 @@ class CircleButton(Button):
                                                                    self.coords_rect.w,
                                                                    self.coords_rect.h)
     
-    def draw(self):
+    def draw(self, surface: pygame.Surface | None = None, offset: tuple = (0, 0)):
         """Draw implementation for circle"""
 
 
-def rectangle_build(group: dict, 
-                    value: dict, 
+def _button_args(layout: ButtonLayout, game_state: GameState) -> tuple:
+    return (layout.text,
+            layout.text_weight,
+            layout.text_size,
+            layout.font,
+            layout.text_color,
+            layout.hover,
+            layout.background_color,
+            layout.background_image,
+            game_state)
+
+
+def rectangle_build(layout: ButtonLayout,
+                    container_dims: dict,
                     game_state: GameState
                     ) -> RectangleButton:
     """Function to build rectangle"""
-    container_dims = group["container_dims"]
+    x, y = container_dims["x"], container_dims["y"]
     if container_dims["type"] == "rect":
         coords = (
-            group["x_coord"],
-            group["y_coord"],
-            container_dims["width"] * value["width_offset"],
-            container_dims["height"] * value["height_offset"],
+            x + container_dims["width"] * layout.x_offset,
+            y + container_dims["height"] * layout.y_offset,
+            container_dims["width"] * layout.width_offset,
+            container_dims["height"] * layout.height_offset,
         )
     elif container_dims["type"] == "circle":
         coords = (
-            group["x_coord"],
-            group["y_coord"],
-            container_dims["radius"] * 2 * value["width_offset"],
-            container_dims["radius"] * 2 * value["height_offset"],
+            x + container_dims["radius"] * 2 * layout.x_offset,
+            y + container_dims["radius"] * 2 * layout.y_offset,
+            container_dims["radius"] * 2 * layout.width_offset,
+            container_dims["radius"] * 2 * layout.height_offset,
         )
-    obj = RectangleButton(
-        coords,
-        value["text"],
-        group["text_weight"],
-        group["text_size"],
-        group["font"],
-        group.get("text_color", (255, 255, 255)),
-        group.get("hover", group["background_color"]),
-        group["background_color"],
-        value.get("background_image"),
-        game_state,
-    )
-    return obj
-
-def circle_build(group: dict, 
-                 value: dict, 
+    return RectangleButton(coords, *_button_args(layout, game_state))
+
+def circle_build(layout: ButtonLayout,
+                 container_dims: dict,
                  game_state: GameState) -> CircleButton:
     """Builds circle object"""
-    container_dims = group["container_dims"]
+    x, y = container_dims["x"], container_dims["y"]
     if container_dims["type"] == "rect":
-         coords = (
-            group["x_coord"],
-            group["y_coord"],
-            container_dims["width"] * value["radius"],
+        coords = (
+            x + container_dims["width"] * layout.x_offset,
+            y + container_dims["height"] * layout.y_offset,
+            container_dims["width"] * layout.radius,
         )
     elif container_dims["type"] == "circle":
         ...
-    
-    return CircleButton(
-        coords,
-        value.get("text"),
-        group["text_weight"],
-        group["text_size"],
-        group["font"],
-        group.get("text_color", (255, 255, 255)),
-        group.get("hover", group.get("background_color", (0, 0, 0))),
-        group.get("background_color", (0, 0, 0)),
-        value.get("background_image"),
-        game_state,
-    )
-
-def build_group(group: dict, game_state: GameState) -> list[Any]:
+    return CircleButton(coords, *_button_args(layout, game_state))
+
+def build_buttons(layouts: list[ButtonLayout], container_dims: dict, game_state: GameState) -> list[Button]:
     """
-    This function is called by container class, the group parameter is group key from the json. Container class adds
-    some key: values to the group before calling this function, container class will calculate the button class x and y coords
-    it will also add the type of container to the group. The container class adds group['container_dims'], container dims will
-    have buttons' x and y coords and container's width and height, in this function, we calculate the button's width and height
-    and creat the button object as per its type. We currently have RectangleButton and CircleButton. Remember. Groups key
-    will have all the common configs, the groups key will have elements key, elements key contains buttons. only
-    text, width_offset and height_offset are inside elements key, rest are under the groups only. elements is a list of dicts.
+    This function is called by container class with the compiled button layouts of the container. Container class
+    passes container_dims: the type of container, its x and y coords and its width and height (or radius). The
+    offsets and gaps of the groups are already resolved per button by the layout, here we only calculate the
+    button's screen coords and create the button object as per its type. We currently have RectangleButton and
+    CircleButton.
     """
-    elements = group.get("elements", [])
-    elements_objects = []
-    for element in elements:
-        match element:
-            case {"RectangleButton": value}:
-                obj = rectangle_build(group, value, game_state)
-            case {"CircleButton": value}:
-                obj = circle_build(group, value, game_state)
-
-        elements_objects.append(obj)
-        group["x_coord"] = group["x_coord"] + group["x_gap_val"]
-        group["y_coord"] = group["y_coord"] + group["y_gap_val"]
-    return elements_objects
+    buttons = []
+    for layout in layouts:
+        match layout.kind:
+            case "rect":
+                buttons.append(rectangle_build(layout, container_dims, game_state))
+            case "circle":
+                buttons.append(circle_build(layout, container_dims, game_state))
+    return buttons
@@ -0,0 +1,106 @@
+import json
+import os
+
+from src.log_handle import get_logger
+
+logger = get_logger(__name__)
+
+"""Compiled screen layouts. The screen jsons in assets/screens are parsed and validated once into layout objects,
+every default is filled in and the group offsets and gaps are resolved to per button offsets, so building the UI for a
+resolution is plain arithmetic on these objects (check src/ui/ui_build.py). Layouts are resolution independent, all
+the values are still offsets of the parent. compile_screens keeps the compiled layouts keyed by the mtime and size of
+the jsons, building the UI again (cache warm up, benchmarks, a resolution change) does not parse anything.
+Unlike the level pack the layouts are not persisted in .level_cache/: the screens are two small jsons that compile in
+about 0.1 ms, a cache file and its manifest check would save a few hundredths of a millisecond per start.
+"""
+
+SCREENS_PATH = "assets/screens/"
+
+
+class ButtonLayout:
+    __slots__ = ("kind", "text", "x_offset", "y_offset", "width_offset", "height_offset", "radius",
+                 "text_weight", "text_size", "font", "text_color", "hover", "background_color", "background_image")
+
+    def __init__(self, kind: str, group: dict, value: dict, idx: int):
+        """Buttons of a group are placed x_gap and y_gap apart, idx is the position of the button in the group."""
+        self.kind = kind
+        self.text = value.get("text")
+        self.x_offset = group["x_offset"] + group.get("x_gap", 0) * idx
+        self.y_offset = group["y_offset"] + group.get("y_gap", 0) * idx
+        self.width_offset = value.get("width_offset")
+        self.height_offset = value.get("height_offset")
+        self.radius = value.get("radius")
+        self.text_weight = group.get("text_weight")
+        self.text_size = group.get("text_size")
+        self.font = group.get("font")
+        self.text_color = tuple(group.get("text_color", (255, 255, 255)))
+        self.background_color = tuple(group.get("background_color", (0, 0, 0)))
+        self.hover = tuple(group.get("hover", self.background_color))
+        self.background_image = value.get("background_image")
+
+
+class ContainerLayout:
+    __slots__ = ("kind", "background_color", "background_image", "x_offset", "y_offset", "width_offset",
+                 "height_offset", "radius_offset", "padding", "buttons")
+
+    def __init__(self, kind: str, value: dict):
+        self.kind = kind
+        self.background_color = tuple(value["background_color"]) if value.get("background_color") else None
+        self.background_image = value.get("background_image")
+        self.x_offset = value.get("x_offset", 0)
+        self.y_offset = value.get("y_offset", 0)
+        self.width_offset = value.get("width_offset")
+        self.height_offset = value.get("height_offset")
+        self.radius_offset = value.get("radius_offset")
+        self.padding = {side: value.get("padding", {}).get(side, 0) for side in ("left", "right", "up", "down")}
+        self.buttons: list[ButtonLayout] = []
+        for group in value.get("groups", []):
+            for idx, element in enumerate(group.get("elements", [])):
+                match element:
+                    case {"RectangleButton": button}:
+                        self.buttons.append(ButtonLayout("rect", group, button, idx))
+                    case {"CircleButton": button}:
+                        self.buttons.append(ButtonLayout("circle", group, button, idx))
+                    case _:
+                        raise ValueError(f"Invalid element detected in configuration: {list(element)[0]}")
+
+
+class ScreenLayout:
+    __slots__ = ("name", "background_image", "containers")
+
+    def __init__(self, screen: dict):
+        self.name = screen.get("screen_name")
+        self.background_image = screen.get("background_image")
+        self.containers: list[ContainerLayout] = []
+        for content in screen.get("contents", []):
+            match content:
+                case {"RectangleContainer": value}:
+                    self.containers.append(ContainerLayout("rect", value))
+                case {"CircleContainer": value}:
+                    self.containers.append(ContainerLayout("circle", value))
+                case _:
+                    logger.error(f"Error! Invalid container: {str(list(content.keys())[0])}")
+                    raise ValueError("Invalid container detected in configuration...")
+
+
+_compiled: tuple[dict, dict[str, ScreenLayout]] | None = None
+
+
+def screens_manifest(path: str=SCREENS_PATH) -> dict[str, tuple]:
+    return {entry.name: (entry.stat().st_mtime_ns, entry.stat().st_size)
+            for entry in os.scandir(path) if entry.name.endswith(".json")}
+
+
+def compile_screens(path: str=SCREENS_PATH) -> dict[str, ScreenLayout]:
+    """Layouts of all the screens by screen name, compiled again only when a screen json changed."""
+    global _compiled
+    manifest = screens_manifest(path)
+    if _compiled is not None and _compiled[0] == manifest:
+        return _compiled[1]
+    layouts = {}
+    for file_name in sorted(manifest):
+        with open(os.path.join(path, file_name)) as fp:
+            layout = ScreenLayout(json.load(fp))
+        layouts[layout.name] = layout
+    _compiled = (manifest, layouts)
+    return layouts
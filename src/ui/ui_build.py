@@ -1,11 +1,8 @@
-import json
-import os
-
-from pygame import Surface, image, transform
-
 from src.game_state_management import GameState
 from src.log_handle import get_logger
 from src.ui.containers import rectangle_builder
+from src.ui.layout import ContainerLayout, compile_screens
+from src.utils.draw_utils import set_rect_background
 
 logger = get_logger(__name__)
 
@@ -28,6 +25,9 @@ There are few gui elements
 I tried to keep the UI design as simple as possible yet became very complicated
 ,  I predefined how my UIs would look like.
 
+The jsons are compiled once into layout objects (src/ui/layout.py), build_ui only turns the layouts into containers
+and buttons for the current resolution. Containers cache their rendered surface, check src/ui/containers.py.
+
 """
 
 
@@ -42,60 +42,40 @@ class ScreenUI:
 
     def set_backgroud_image(self, background_image: str):
         if background_image:
-            bg_image = image.load(background_image)
-            bg_image = transform.scale(
-                bg_image,
-                (self._game_state.screen_width, self._game_state.screen_height),
+            self.background_image = set_rect_background(
+                background_image,
+                self._game_state.screen_width,
+                self._game_state.screen_height,
             )
-            self.background_image = bg_image
             return self
         self.background_image = None
         return self
 
-    def set_contents(self, contents: list[dict]):
+    def set_contents(self, contents: list[ContainerLayout]):
         self.containers = []
         for content in contents:
-            match content:
-                case {"RectangleContainer": value}:
-                    self.containers.append(rectangle_builder(value, self._game_state))
-
-                case {"CircleContainer": value}:
+            match content.kind:
+                case "rect":
+                    self.containers.append(rectangle_builder(content, self._game_state))
+                case "circle":
                     ...
-                case _:
-                    logger.error(
-                        f"Error! Invalid container: {str(list(content.keys())[0])}"
-                    )
-                    raise ValueError("Invalid container detected in configuration...")
-
 
-def parse_jsons() -> dict:
-    """
-    Iterates all the jsons in /assets/screens and returns the list of dictionaries (we read json as dictionary)
-    """
-    path = "assets/screens/"
-    screens = os.listdir(path)
-    all_screens = []
-    for screen in screens:
-        if not screen.endswith(".json"):
-            continue
-        with open(f"{path}{screen}") as fp:
-            screen_json = json.load(fp)
-            all_screens.append(screen_json)
-    return all_screens
+    def revision(self) -> tuple:
+        """Changes whenever one of the containers has to be drawn again."""
+        return tuple(container.revision for container in self.containers)
 
 
 def build_ui(game_state: GameState):
     """We build the UI objects. We build individual components for the UI and add them in ui_components list
     UI_components list will be set up as instance variable of game_state object."""
-    all_screens = parse_jsons()
     screens = {}
-    for screen in all_screens:
+    for name, layout in compile_screens().items():
         screen_obj = ScreenUI(game_state)
-        screen_obj.set_screen_name(screen.get("screen_name")).set_backgroud_image(
-            screen.get("background_image")
-        ).set_screen_name(screen.get("screen_name")).set_contents(
-            screen.get("contents")
+        screen_obj.set_screen_name(name).set_backgroud_image(
+            layout.background_image
+        ).set_contents(
+            layout.containers
         )
-        screens[screen.get("screen_name")] = screen_obj
+        screens[name] = screen_obj
     game_state.screen_uis = screens
     game_state.current_screen = "main_menu"
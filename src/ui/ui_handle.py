@@ -1,11 +1,12 @@
-from pygame.time import delay as gamedelay
-
 from typing import Any
 from src.game_state_management import GameState
 from src.ui.elements import Button
 from src.utils.draw_utils import draw_text
 from src.log_handle import get_logger
 from src.level_handler import LevelManager
+from src.sprite_engine.pools import release_group
+from src.event_bus import BRICK_DESTROYED, BALL_LOST, LEVEL_CLEARED
+from src.game_configs import BALL_RESPAWN_DELAY
 
 logger = get_logger(__name__)
 
@@ -18,6 +19,7 @@ class MainMenu():
         self.current_focus = 0
         self.button_pressed = False
         self.mouse_pos = game_state.mouse_pos
+        self.applied_focus = None
     
     def __inc_index(self):
         """When down is pressed, we move the focus to the next button, so that next button changes its background color"""
@@ -33,29 +35,30 @@ class MainMenu():
             return
         self.current_focus -= 1
 
-    def __mouse_hover_check(self, button, idx):
+    def __mouse_hover_check(self, buttons: list[Button]):
         """We assume the button is hovered if the mouse is not static it goes to the row of the button."""
         mouse_pos = self.game_state.mouse_pos
         if mouse_pos == self.mouse_pos:
             return
+        self.mouse_pos = mouse_pos
         _, mouse_y = mouse_pos
-        if mouse_y >= button.coords[1] and \
-                  mouse_y < button.coords[1] + button.coords[-1]:
-                self.current_focus = idx
-                # self.game_state.sound_manager.play_sound("button_hover")
+        for idx, button in enumerate(buttons):
+            if mouse_y >= button.coords[1] and \
+                      mouse_y < button.coords[1] + button.coords[-1]:
+                    self.current_focus = idx
+                    # self.game_state.sound_manager.play_sound("button_hover")
 
-    
     def __key_hover_check(self):
         """We handle up and down button presses, based on the up and down, we move the hover focus up and down.
         If current focus is out of bounds, we bring them to the bounds (if x>len(matrix) 
         then x=0, if x < 0 then x = len(matrix) -1)"""
         if self.game_state.up_pressed:
-            logger.info("Up button pressed")
+            logger.debug("Up button pressed")
             self.game_state.up_pressed = False
             self.__dec_index()
             self.game_state.sound_manager.play_sound("button_hover")
         elif self.game_state.down_pressed:
-            logger.info("down button pressed")
+            logger.debug("down button pressed")
             self.game_state.down_pressed = False
             self.__inc_index()
             self.game_state.sound_manager.play_sound("button_hover")
@@ -71,40 +74,65 @@ class MainMenu():
                 self.game_state.current_screen = "game"
                 self.game_state.game_handle.load_game_screen()
 
-    def handle_buttons(self, buttons: list[Button]):
-        """We do everything with this method. We call hover check methods, button functionality method, etc"""
+    def __apply_focus(self, container: Any):
+        """Only the focused button shows its hover color, the container is drawn again with the new colors."""
+        for idx, button in enumerate(container.elements):
+            button.background_color = button.hover if idx == self.current_focus else button.original_color
+        container.invalidate()
+        self.applied_focus = (container, self.current_focus)
+
+    def handle_buttons(self, container: Any):
+        """We do everything with this method, once per frame. We call hover check methods, button functionality
+        method, etc. The buttons are drawn by the container, which is invalidated only when the focus moves."""
+        buttons = container.elements
         self.button_len = len(buttons)
-        for idx, button in enumerate(buttons):
-            if idx == self.current_focus:
-                button.background_color = button.hover
-            else:
-                button.background_color = button.original_color
-            self.__mouse_hover_check(button, idx)
-            self.__key_hover_check()
-            button.draw()
-            self.button_functionality(button)
+        self.__mouse_hover_check(buttons)
+        self.__key_hover_check()
         if self.current_focus >= self.button_len or self.current_focus < 0:
             return
+        if self.applied_focus != (container, self.current_focus):
+            self.__apply_focus(container)
         hover_text = buttons[self.current_focus].text
         self.button_functionality(hover_text)
     
-    def handle_main_menu(self, buttons: list[Button]):
-        self.handle_buttons(buttons)
+    def handle_main_menu(self, container: Any):
+        self.handle_buttons(container)
 
 class GameScreen:
     def __init__(self, game_state: GameState):
         self.game_state = game_state
+        self.level = None
+        self.respawn_timer = None
+        game_state.events.subscribe(BRICK_DESTROYED, self.on_brick_destroyed)
+        game_state.events.subscribe(BALL_LOST, self.on_ball_lost)
+        game_state.events.subscribe(LEVEL_CLEARED, self.on_level_cleared)
 
     def load_game_screen(self):
         logger.info("Loaded the game....")
         self.level = LevelManager(game_state=self.game_state)
         self.level.load_level()
     
-    def monitor_ball_dead(self):
-        if not self.game_state.ball_sprite_group:
-            self.game_state.sound_manager.play_sound("ball_dead")
-            gamedelay(2000)
-            self.level.reset_bat_ball()
+    def on_brick_destroyed(self, tile):
+        """Drops the power of the brick and removes it, the last brick clears the level."""
+        if not tile.alive():
+            return
+        tile.drop_power()
+        tile.kill()
+        if not self.game_state.tiles_group:
+            self.game_state.events.emit(LEVEL_CLEARED, level=self.game_state.level)
+
+    def on_ball_lost(self):
+        """The bat and ball come back two seconds after the last ball is lost, the game keeps running meanwhile."""
+        if self.level is None or self.game_state.ball_sprite_group:
+            return
+        if self.respawn_timer is not None and self.respawn_timer.pending:
+            return
+        self.game_state.sound_manager.play_sound("ball_dead")
+        self.respawn_timer = self.game_state.scheduler.schedule(BALL_RESPAWN_DELAY, self.respawn)
+
+    def respawn(self):
+        self.respawn_timer = None
+        self.level.reset_bat_ball()
     
     def draw_level_number(self):
         level = self.game_state.level
@@ -117,13 +145,16 @@ class GameScreen:
                                  self.game_state.screen_height//2), 
                                  self.game_state.screen)
     
-    def monitor_level_clear(self):
-        if not self.game_state.tiles_group:
-            self.game_state.level += 1
-            self.game_state.ball_sprite_group.empty()
-            self.game_state.bullets_group.empty()
-            self.game_state.bat_sprite = None
-            self.level.load_level()
+    def on_level_cleared(self, level: int):
+        if level != self.game_state.level:
+            return
+        self.game_state.level += 1
+        self.game_state.scheduler.cancel(self.respawn_timer)
+        self.respawn_timer = None
+        release_group(self.game_state.ball_sprite_group)
+        release_group(self.game_state.bullets_group)
+        self.game_state.bat_sprite = None
+        self.level.load_level()
 
 def initialize_ui_handles(game_state: GameState):
     """
@@ -135,25 +166,39 @@ def initialize_ui_handles(game_state: GameState):
 
 def handle_ui(game_state: GameState, 
               container: Any, 
-              screen_name:str) -> Any:
+              screen_name:str,
+              draw: bool=True) -> Any:
     """Game state has a current_screen object, that points to the screen that should be rendered. 
-    We check the current screen and return the appropriate screen object"""
+    We check the current screen and return the appropriate screen object.
+    With draw=False only the game logic runs, the dirty rect renderer uses it when the background is already on
+    the display. The main menu logic runs in update_ui, its buttons are part of the container surface."""
     match screen_name:
         case "main_menu":
-            handler = game_state.main_menu_handle
-            handler.handle_main_menu(container.elements)
             return
         case "game":
             handler = game_state.game_handle
-            handler.draw_level_number()
-            handler.monitor_ball_dead()
-            handler.monitor_level_clear()
-            handler.draw_pause()
+            if draw:
+                handler.draw_level_number()
+                handler.draw_pause()
+
+def update_ui(game_state: GameState):
+    """Runs the logic of the current screen before the frame is drawn, so that a container invalidated by a focus
+    change is drawn again in the same frame."""
+    if game_state.current_screen != "main_menu":
+        return
+    for container in game_state.screen_uis["main_menu"].containers:
+        if getattr(container, "elements", None):
+            game_state.main_menu_handle.handle_main_menu(container)
 
-def draw_ui(game_state: GameState):
-    """Draws the screen containers and buttons, it will only draw current screen"""
+def draw_ui(game_state: GameState, draw: bool=True):
+    """Draws the screen containers and buttons, it will only draw current screen.
+    The game screen containers are part of the brick layer once a level is loaded."""
     curr_screen_name = game_state.current_screen
     curr_screen = game_state.screen_uis[curr_screen_name]
+    brick_layer = game_state.brick_layer if curr_screen_name == "game" else None
+    if draw and brick_layer is not None:
+        brick_layer.draw(game_state.screen)
     for container in curr_screen.containers:
-        container.draw(game_state)
-        handle_ui(game_state, container, curr_screen_name)
+        if draw and brick_layer is None:
+            container.draw(game_state)
+        handle_ui(game_state, container, curr_screen_name, draw)
@@ -0,0 +1,151 @@
+from collections import OrderedDict
+
+import pygame
+
+from src.game_configs import ASSET_CACHE_MAX_BYTES
+from src.log_handle import get_logger
+from src.utils.disk_cache import disk_cache
+
+logger = get_logger(__name__)
+
+"""Process wide cache for loaded and scaled surfaces. Sprites are created all the time (bullets every 100ms,
+balls on multi ball, powers when a brick dies, tiles on every level load) but they only use a handful of images
+at a handful of sizes. Instead of decoding the png again for every sprite, we keep the result keyed by
+(path, target size, transform kind) and hand out the same surface.
+
+Surfaces returned by the cache are shared, never draw on them. Copy them first if you need to modify one.
+The cache has a memory cap, when it is full the least recently used surface gets evicted.
+Scaled surfaces that are not in memory are looked up in the on disk cache (src/utils/disk_cache.py) before
+the source image is decoded and scaled.
+
+Kinds: scale, smoothscale, circle (smoothscale masked to a circle, the ball) keep per pixel alpha,
+opaque is for backgrounds, it is scaled and converted without alpha.
+"""
+
+SCALE = "scale"
+SMOOTHSCALE = "smoothscale"
+CIRCLE = "circle"
+OPAQUE = "opaque"
+RAW = "raw"
+RAW_OPAQUE = "raw_opaque"
+
+
+def _normalize_size(size: tuple | None) -> tuple | None:
+    """pygame truncates float sizes when scaling, we do the same so that 40.2 and 40.7 share the entry."""
+    if size is None:
+        return None
+    return (int(size[0]), int(size[1]))
+
+
+def cache_key(path: str, size: tuple | None = None, kind: str = SCALE) -> tuple:
+    """(path, size, kind) the way AssetCache.get stores it."""
+    size = _normalize_size(size)
+    if size is None and kind not in (RAW, RAW_OPAQUE):
+        kind = RAW_OPAQUE if kind == OPAQUE else RAW
+    return (path, size, kind)
+
+
+def _surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class AssetCache:
+    """LRU cache of surfaces keyed by (path, size, kind)."""
+
+    def __init__(self, max_bytes: int = ASSET_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+
+    def __load_source(self, path: str, kind: str) -> pygame.Surface:
+        """The decoded image is cached as well, the different sizes of the same file share one decode."""
+        return self.get(path, None, RAW_OPAQUE if kind == OPAQUE else RAW)
+
+    def __transform(self, path: str, size: tuple, kind: str) -> pygame.Surface:
+        match kind:
+            case "raw":
+                return pygame.image.load(path).convert_alpha()
+            case "raw_opaque":
+                return pygame.image.load(path).convert()
+        pixel_format = "RGB" if kind == OPAQUE else "RGBA"
+        surface = disk_cache.load(path, size, kind, pixel_format)
+        if surface is None:
+            surface = self.__scale(path, size, kind)
+            disk_cache.store(path, size, kind, pixel_format, surface)
+        return surface
+
+    def __scale(self, path: str, size: tuple, kind: str) -> pygame.Surface:
+        source = self.__load_source(path, kind)
+        match kind:
+            case "scale" | "opaque":
+                return pygame.transform.scale(source, size)
+            case "smoothscale":
+                return pygame.transform.smoothscale(source, size)
+            case "circle":
+                image = pygame.transform.smoothscale(source, size)
+                radius = size[0] / 2
+                mask_surface = pygame.Surface(size, pygame.SRCALPHA)
+                pygame.draw.circle(mask_surface, (255, 255, 255, 255), (radius, radius), radius)
+                image.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+                return image
+        raise ValueError(f"Unknown transform kind: {kind}")
+
+    def __evict(self):
+        while self.current_bytes > self.max_bytes and len(self._surfaces) > 1:
+            _, surface = self._surfaces.popitem(last=False)
+            self.current_bytes -= _surface_bytes(surface)
+            self.evictions += 1
+
+    def get(self, path: str, size: tuple | None = None, kind: str = SCALE) -> pygame.Surface:
+        """Returns the surface for path scaled to size with the given transform kind.
+        size None means the image as it is in the file."""
+        key = cache_key(path, size, kind)
+        path, size, kind = key
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = self.__transform(path, size, kind)
+        self.put(key, surface)
+        return surface
+
+    def put(self, key: tuple, surface: pygame.Surface):
+        """Adds an already built surface to the cache."""
+        if key in self._surfaces:
+            self.current_bytes -= _surface_bytes(self._surfaces.pop(key))
+        self._surfaces[key] = surface
+        self.current_bytes += _surface_bytes(surface)
+        self.__evict()
+
+    def contains(self, key: tuple) -> bool:
+        """Does not count as a hit or touch the LRU order."""
+        return key in self._surfaces
+
+    def clear(self):
+        self._surfaces.clear()
+        self.current_bytes = 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._surfaces),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "disk": disk_cache.stats()}
+
+    def log_stats(self):
+        logger.info(f"Asset cache stats: {self.stats()}")
+
+
+asset_cache = AssetCache()
+
+
+def load_image(path: str, size: tuple | None = None, kind: str = SCALE) -> pygame.Surface:
+    """Shortcut to the process wide cache, this is what the sprites use."""
+    return asset_cache.get(path, size, kind)
@@ -0,0 +1,113 @@
+import pygame
+
+from src.game_state_management import GameState
+
+"""Dirty rectangle rendering. Instead of clearing the whole screen and pushing every pixel to the display each frame,
+we keep a copy of the background (screen fill + UI, everything that is drawn before the sprites) and remember where
+every sprite was drawn in the previous frame. Only the rects of sprites that moved, changed image, appeared or
+disappeared are restored from the background, redrawn and passed to pygame.display.update.
+
+The background is reused on every screen. It is rebuilt whenever background_key changes (screen switch, level change,
+pause, or a container that was invalidated: focus or hover of a button, background image change). A main menu that
+nobody touches costs no blit at all. Bricks that break are patched into the background with patch_background.
+"""
+
+
+def background_key(game_state: GameState) -> tuple:
+    """Everything the pre sprite part of the frame depends on. If this changes, the background must be redrawn."""
+    screen_ui = game_state.screen_uis[game_state.current_screen]
+    return (game_state.current_screen, game_state.level, game_state.is_paused, screen_ui.revision())
+
+
+def merge_rects(rects: list[pygame.Rect]) -> list[pygame.Rect]:
+    """Unions overlapping rects so that no pixel gets restored and redrawn twice."""
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        idx = rect.collidelist(merged)
+        while idx != -1:
+            rect.union_ip(merged.pop(idx))
+            idx = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectRenderer:
+    def __init__(self, screen: pygame.Surface):
+        self.screen = screen
+        self.background: pygame.Surface | None = None
+        self.key = None
+        self.previous: dict = {}
+        self.current: dict = {}
+        self.damaged: list[pygame.Rect] = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Forces a full redraw on the next frame."""
+        self.key = None
+
+    def begin_frame(self, game_state: GameState) -> bool:
+        """Returns True if the stored background is still valid and the UI must not be drawn this frame."""
+        self.current = {}
+        key = background_key(game_state)
+        self.full_redraw = key != self.key
+        self.key = key
+        return not self.full_redraw
+
+    def snapshot_background(self):
+        """Called after the UI is drawn on a full redraw frame, before any sprite is drawn."""
+        if self.background is None or self.background.get_size() != self.screen.get_size():
+            self.background = self.screen.copy()
+        else:
+            self.background.blit(self.screen, (0, 0))
+
+    def patch_background(self, source: pygame.Surface, rects: list[pygame.Rect]):
+        """Copies rects of source into the stored background and the screen, the brick layer uses it
+        when bricks break. The rects are redrawn and updated with the sprite rects of this frame."""
+        for rect in rects:
+            if self.background is not None:
+                self.background.blit(source, rect, rect)
+            self.screen.blit(source, rect, rect)
+            self.damaged.append(pygame.Rect(rect))
+
+    def add(self, sprite, image: pygame.Surface, rect: pygame.Rect):
+        """Queues the sprite for this frame, in draw order."""
+        self.current[sprite] = (image, tuple(rect))
+
+    def __dirty_rects(self) -> list[pygame.Rect]:
+        dirty = self.damaged
+        self.damaged = []
+        for sprite, (image, rect) in self.previous.items():
+            if self.current.get(sprite) != (image, rect):
+                dirty.append(pygame.Rect(rect))
+        for sprite, (image, rect) in self.current.items():
+            if self.previous.get(sprite) != (image, rect):
+                dirty.append(pygame.Rect(rect))
+        screen_rect = self.screen.get_rect()
+        return merge_rects([rect.clip(screen_rect) for rect in dirty if rect.colliderect(screen_rect)])
+
+    def render(self) -> list[pygame.Rect] | None:
+        """Draws the queued sprites. Returns the rects that changed, None means the whole screen changed."""
+        screen = self.screen
+        drawn = list(self.current.values())
+        if self.full_redraw:
+            screen.blits([(image, rect) for image, rect in drawn], doreturn=False)
+            self.damaged = []
+            self.previous = self.current
+            return None
+        dirty = self.__dirty_rects()
+        for area in dirty:
+            screen.set_clip(area)
+            screen.blit(self.background, area, area)
+            screen.blits([(image, rect) for image, rect in drawn if area.colliderect(rect)], doreturn=False)
+        screen.set_clip(None)
+        self.previous = self.current
+        return dirty
+
+    def present(self):
+        dirty = self.render()
+        if dirty is None:
+            pygame.display.update()
+            return
+        if dirty:
+            pygame.display.update(dirty)
@@ -0,0 +1,116 @@
+import hashlib
+import os
+import struct
+
+import pygame
+
+from src.game_configs import DISK_CACHE_ENABLED, DISK_CACHE_PATH
+from src.log_handle import get_logger
+
+logger = get_logger(__name__)
+
+"""Persistent cache of already scaled and converted surfaces. Scaling the big pngs and jpgs to the resolution of the
+monitor is repeated on every launch and every level load. Since the monitor rarely changes, we store the result on disk
+as raw pixels and read it back on the next launch, reading raw pixels is much cheaper than decode + scale.
+
+Every entry is keyed by the hash of the source file, the target size, the transform kind and the pixel format
+(stored byte format and the bit depth of the display). Editing an asset changes its hash, so stale entries are
+simply never read again. Run `python main.py --warm-cache` once to fill the cache for the current resolution.
+
+File layout: MAGIC | width, height (uint32) | format length (uint8) | format | pixels
+"""
+
+MAGIC = b"BRKC1"
+_HEADER = struct.Struct("<IIB")
+_source_hashes: dict[tuple, str] = {}
+
+
+def source_hash(path: str) -> str:
+    """sha1 of the source file, remembered per (path, mtime, size) so a file is read once per process."""
+    stat = os.stat(path)
+    memo_key = (path, stat.st_mtime_ns, stat.st_size)
+    digest = _source_hashes.get(memo_key)
+    if digest is None:
+        with open(path, "rb") as fp:
+            digest = hashlib.sha1(fp.read()).hexdigest()
+        _source_hashes[memo_key] = digest
+    return digest
+
+
+class DiskCache:
+    def __init__(self, path: str = DISK_CACHE_PATH, enabled: bool = DISK_CACHE_ENABLED):
+        self.path = path
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def __entry_path(self, path: str, size: tuple, kind: str, pixel_format: str) -> str:
+        depth = pygame.display.get_surface().get_bitsize() if pygame.display.get_surface() else 0
+        key = f"{source_hash(path)}|{size[0]}x{size[1]}|{kind}|{pixel_format}|{depth}"
+        name = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.path, f"{name}.bin")
+
+    def load(self, path: str, size: tuple, kind: str, pixel_format: str) -> pygame.Surface | None:
+        """Returns the cached surface converted to the display format, None if it is not cached."""
+        surface = self.read(path, size, kind, pixel_format)
+        if surface is None:
+            return None
+        return surface.convert_alpha() if pixel_format == "RGBA" else surface.convert()
+
+    def read(self, path: str, size: tuple, kind: str, pixel_format: str) -> pygame.Surface | None:
+        """Like load but the surface is not converted, safe to call from a worker thread."""
+        if not self.enabled:
+            return None
+        entry = self.__entry_path(path, size, kind, pixel_format)
+        try:
+            with open(entry, "rb") as fp:
+                data = fp.read()
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            if not data.startswith(MAGIC):
+                raise ValueError("not a disk cache entry")
+            offset = len(MAGIC)
+            width, height, format_len = _HEADER.unpack_from(data, offset)
+            offset += _HEADER.size
+            stored_format = data[offset:offset + format_len].decode()
+            offset += format_len
+            surface = pygame.image.frombytes(data[offset:], (width, height), stored_format)
+        except (struct.error, ValueError, pygame.error) as e:
+            self.__discard(entry, path, e)
+            return None
+        self.hits += 1
+        return surface
+
+    def __discard(self, entry: str, path: str, error: Exception):
+        """A truncated or corrupt entry, or one written by another pygame version, is a miss and gets deleted so
+        the next store rebuilds it."""
+        self.misses += 1
+        logger.warning(f"Discarding bad disk cache entry for {path}: {error}")
+        try:
+            os.remove(entry)
+        except OSError:
+            pass
+
+    def store(self, path: str, size: tuple, kind: str, pixel_format: str, surface: pygame.Surface):
+        if not self.enabled:
+            return
+        entry = self.__entry_path(path, size, kind, pixel_format)
+        encoded_format = pixel_format.encode()
+        header = MAGIC + _HEADER.pack(surface.get_width(), surface.get_height(), len(encoded_format)) + encoded_format
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            tmp_entry = f"{entry}.{os.getpid()}.tmp"
+            with open(tmp_entry, "wb") as fp:
+                fp.write(header)
+                fp.write(pygame.image.tobytes(surface, pixel_format))
+            os.replace(tmp_entry, entry)
+        except OSError as e:
+            logger.warning(f"Could not write disk cache entry for {path}: {e}")
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+disk_cache = DiskCache()
@@ -1,20 +1,22 @@
 import pygame
 
+from src.utils import text_cache
+from src.utils.asset_cache import load_image, OPAQUE
+
 def set_circle_background(background_image: str,
                           radius: float|int):
-    img = pygame.image.load(background_image).convert_alpha()
-    img = pygame.transform.scale(img, (radius * 2, radius * 2))
-    return img
+    return load_image(background_image, (radius * 2, radius * 2))
 
 def set_rect_background(img: str, width: int, height: int):
-    background_image = pygame.image.load(img)
-    background_image = pygame.transform.scale(
-        background_image, (width, height)
-    )
-    return background_image
+    """Backgrounds come scaled from the asset cache, which reads them from the disk cache when it can."""
+    return load_image(img, (width, height), OPAQUE)
 
 def draw_text(text: str, center: tuple, screen: pygame.Surface):
-    font = pygame.font.Font(None, 24)  # Use default font, size 50
-    text_surface = font.render(text, True, (255, 255, 255))
+    """The rendered text comes from the text cache, the same string is rasterised only once."""
+    text_surface = text_cache.render_text(text, (255, 255, 255), None, 24)
     text_rect = text_surface.get_rect(topleft=center)
-    screen.blit(text_surface, text_rect)
\ No newline at end of file
+    screen.blit(text_surface, text_rect)
+
+def draw_dynamic_text(text: str, topleft: tuple, screen: pygame.Surface, color: tuple=(255, 255, 255), size: int=24):
+    """For text that changes every frame (counters, fps), drawn glyph by glyph from the glyph atlas."""
+    return text_cache.get_atlas(color, None, size).draw(screen, text, topleft)
\ No newline at end of file
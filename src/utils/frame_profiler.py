@@ -0,0 +1,87 @@
+from array import array
+from time import perf_counter
+
+from src.game_configs import PROFILER_HISTORY
+
+"""Frame time per phase of GameRunner.game_loop. The loop calls begin_frame, then mark(phase) after each phase, the time
+since the previous mark is added to that phase, and end_frame stores the frame in ring buffers of the last
+PROFILER_HISTORY frames. A phase marked several times in a frame (one update per simulation tick) is summed.
+
+Nothing is timed while enabled is False, the loop checks the flag before every mark so the cost of an idle profiler is
+one attribute read per phase. It is enabled while the overlay is shown (src/utils/game_profiling.py reads the
+percentiles and the frame history) or while a tracer is attached, which gets every phase and frame as a span.
+"""
+
+
+class FrameProfiler:
+    def __init__(self, history: int=PROFILER_HISTORY):
+        self.enabled = False
+        self.show_overlay = False
+        self.tracer = None
+        self.history = history
+        self.frames = array("d", bytes(8 * history))
+        self.phases: dict[str, array] = {}
+        self.index = 0
+        self.count = 0
+        self._current: dict[str, float] = {}
+        self._start = 0.0
+        self._last = 0.0
+
+    def attach_tracer(self, tracer):
+        self.tracer = tracer
+        self.enabled = self.show_overlay or tracer is not None
+
+    def toggle(self):
+        """Shows or hides the overlay, the buffers start over."""
+        self.show_overlay = not self.show_overlay
+        self.enabled = self.show_overlay or self.tracer is not None
+        self.index = 0
+        self.count = 0
+        self.phases.clear()
+
+    def begin_frame(self):
+        self._current.clear()
+        self._start = self._last = perf_counter()
+
+    def mark(self, phase: str):
+        now = perf_counter()
+        self._current[phase] = self._current.get(phase, 0.0) + now - self._last
+        if self.tracer is not None:
+            self.tracer.complete(phase, self._last, now)
+        self._last = now
+
+    def end_frame(self):
+        idx = self.index
+        self.frames[idx] = (self._last - self._start) * 1000
+        if self.tracer is not None:
+            self.tracer.complete("frame", self._start, self._last)
+        for phase, elapsed in self._current.items():
+            samples = self.phases.get(phase)
+            if samples is None:
+                samples = self.phases[phase] = array("d", bytes(8 * self.history))
+            samples[idx] = elapsed * 1000
+        for phase, samples in self.phases.items():
+            if phase not in self._current:
+                samples[idx] = 0.0
+        self.index = (idx + 1) % self.history
+        self.count = min(self.count + 1, self.history)
+
+    def recent_frames(self) -> list[float]:
+        """Frame times in ms, oldest first."""
+        if self.count < self.history:
+            return self.frames[:self.count].tolist()
+        return self.frames[self.index:].tolist() + self.frames[:self.index].tolist()
+
+    def percentiles(self, samples: array, points: tuple=(50, 95, 99)) -> tuple:
+        if not self.count:
+            return tuple(0.0 for _ in points)
+        ordered = sorted(samples[:self.count])
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, int(len(ordered) * point / 100))] for point in points)
+
+    def summary(self) -> dict[str, tuple]:
+        """p50, p95, p99 in ms of the frame and of every phase, over the frames in the buffers."""
+        result = {"frame": self.percentiles(self.frames)}
+        for phase, samples in self.phases.items():
+            result[phase] = self.percentiles(samples)
+        return result
@@ -1,18 +1,94 @@
-import psutil
+import pygame
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from src.utils import text_cache
+from src.utils.frame_profiler import FrameProfiler
+
+"""Live performance overlay, toggled with F3. Shows the rolling p50/p95/p99 of the frame and of every phase timed by
+the FrameProfiler, a graph of the recent frame times, and memory and CPU when psutil is installed.
+The psutil process is created once and CPU/memory are sampled at most every STATS_INTERVAL ms, cpu_percent compares
+with the previous call so calling it every frame only measures noise. The voice mixer counters are shown when the game
+has sound."""
+
+STATS_INTERVAL = 1000
+TEXT_SIZE = 18
+LINE_HEIGHT = 16
+GRAPH_HEIGHT = 60
+PANEL_WIDTH = 360
+BUDGET_MS = 1000 / 60
+
+_process = psutil.Process() if psutil is not None else None
+
 
 def log_memory_usage():
-    process = psutil.Process()
-    mem_usage = process.memory_info().rss / (1024 * 1024)  # Convert to MB
+    if _process is None:
+        return "Memory Usage: n/a"
+    mem_usage = _process.memory_info().rss / (1024 * 1024)  # Convert to MB
     return f"Memory Usage: {mem_usage:.2f} MB"
 
+
 def log_cpu_usage():
+    if psutil is None:
+        return "CPU Usage: n/a"
     return f"CPU Usage: {psutil.cpu_percent()}%"
 
-def draw_performance_overlay(screen, font, clock):
-    process = psutil.Process()
-    mem_usage = process.memory_info().rss / (1024 * 1024)  # MB
-    cpu_usage = psutil.cpu_percent()
-    fps = clock.get_fps()  # Get current FPS
-    text = f"FPS: {fps:.2f} | CPU: {cpu_usage}% | Mem: {mem_usage:.2f}MB"
-    text_surf = font.render(text, True, (255, 255, 255))
-    screen.blit(text_surf, (800, 800))  # Draw in top-left corner
\ No newline at end of file
+
+class PerformanceOverlay:
+    def __init__(self, screen_width: int):
+        self.rect = pygame.Rect(screen_width - PANEL_WIDTH - 10, 10, PANEL_WIDTH, 0)
+        self.process_stats = ""
+        self.last_stats = -STATS_INTERVAL
+
+    def __sample_process(self):
+        now = pygame.time.get_ticks()
+        if now - self.last_stats < STATS_INTERVAL:
+            return
+        self.last_stats = now
+        if _process is None:
+            self.process_stats = "psutil not installed"
+            return
+        mem_usage = _process.memory_info().rss / (1024 * 1024)
+        self.process_stats = f"CPU: {_process.cpu_percent():.0f}% Mem: {mem_usage:.1f}MB"
+
+    def __draw_graph(self, panel: pygame.Surface, frames: list[float], top: int):
+        """One bar per frame, the line is the 60 FPS budget, bars over it are red."""
+        if not frames:
+            return
+        scale = GRAPH_HEIGHT / max(BUDGET_MS * 2, max(frames))
+        bottom = top + GRAPH_HEIGHT
+        x_step = PANEL_WIDTH / len(frames)
+        for idx, frame in enumerate(frames):
+            color = (220, 60, 60) if frame > BUDGET_MS else (80, 200, 80)
+            x = int(idx * x_step)
+            pygame.draw.line(panel, color, (x, bottom), (x, bottom - int(frame * scale)))
+        budget_y = bottom - int(BUDGET_MS * scale)
+        pygame.draw.line(panel, (255, 255, 255), (0, budget_y), (PANEL_WIDTH, budget_y))
+
+    def render(self, profiler: FrameProfiler, audio: dict | None=None) -> pygame.Surface:
+        """A new panel every frame, the dirty rect renderer redraws it because the surface changed."""
+        self.__sample_process()
+        summary = profiler.summary()
+        lines = [f"{'ms':<16}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for phase, (p50, p95, p99) in summary.items():
+            lines.append(f"{phase:<16}{p50:7.2f}{p95:7.2f}{p99:7.2f}")
+        lines.append(self.process_stats)
+        if audio:
+            lines.append(f"Voices: {audio['played']} merged {audio['merged']} stolen {audio['stolen']} "
+                         f"dropped {audio['dropped']}")
+            lines.append(f"Audio: {audio['memory']['resident_bytes'] / (1024 * 1024):.2f}MB decoded "
+                         f"{audio['memory']['compressed_bytes'] / (1024 * 1024):.2f}MB compressed")
+        height = GRAPH_HEIGHT + 8 + LINE_HEIGHT * len(lines)
+        panel = pygame.Surface((PANEL_WIDTH, height))
+        panel.set_alpha(200)
+        self.__draw_graph(panel, profiler.recent_frames(), 0)
+        atlas = text_cache.get_atlas((255, 255, 255), None, TEXT_SIZE)
+        y = GRAPH_HEIGHT + 4
+        for line in lines:
+            atlas.draw(panel, line, (4, y))
+            y += LINE_HEIGHT
+        self.rect.h = height
+        return panel
@@ -1,7 +1,23 @@
 from src.game_state_management import GameState
+from src.event_bus import BALL_HIT, POWER_COLLECTED
 
 
-def change_background_music(music: str, game_state: GameState, start_time=0, volume=0.5):
+def change_background_music(music: str, game_state: GameState, start_time=0, volume=0.5, source: bytes | None=None):
+    """source is the music file already read into memory, the level prefetcher reads it on a worker thread."""
     game_state.sound_manager.stop_music()
     game_state.sound_manager.background_music = music
-    game_state.sound_manager.play_music(start_time=start_time, volume=volume)
\ No newline at end of file
+    game_state.sound_manager.play_music(start_time=start_time, volume=volume, source=source)
+
+HIT_SOUNDS = {"wall": "wall_hit", "paddle": "paddle_hit", "brick": "bricks_hit"}
+
+
+def subscribe_sounds(game_state: GameState):
+    """The collision code only emits events, the sound effects are played by these listeners."""
+    def ball_hit(surface: str):
+        game_state.sound_manager.play_sound(HIT_SOUNDS[surface])
+
+    def power_collected(power_name: str):
+        game_state.sound_manager.play_sound("power_gain")
+
+    game_state.events.subscribe(BALL_HIT, ball_hit)
+    game_state.events.subscribe(POWER_COLLECTED, power_collected)
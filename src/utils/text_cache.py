@@ -0,0 +1,120 @@
+from collections import OrderedDict
+
+import pygame
+
+from src.game_configs import TEXT_CACHE_MAX_ENTRIES
+
+"""Text rendering without rasterising the same string every frame.
+
+1. get_font: pygame.font.Font objects are cached by (font, size, bold), creating a font opens and parses the font file.
+2. render_text: rendered surfaces are cached by (text, font, size, bold, color, antialias) with LRU eviction.
+   Good for strings that rarely change, labels, level number, PAUSED.
+3. GlyphAtlas: for strings that change every frame (counters, fps) caching whole strings only fills the cache.
+   The atlas renders every glyph once into a single surface and a string is drawn as one blits call of glyph rects.
+
+Surfaces returned by render_text are shared, never draw on them.
+"""
+
+ATLAS_CHARSET = " 0123456789.,:;%/|-+()[]abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+_fonts: dict[tuple, pygame.font.Font] = {}
+_rendered: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+_atlases: dict[tuple, "GlyphAtlas"] = {}
+
+
+def get_font(font: str | None, size: int, bold: bool = False) -> pygame.font.Font:
+    key = (font, size, bold)
+    font_obj = _fonts.get(key)
+    if font_obj is None:
+        font_obj = pygame.font.Font(font, size)
+        font_obj.set_bold(bold)
+        _fonts[key] = font_obj
+    return font_obj
+
+
+def render_text(text: str,
+                color: tuple,
+                font: str | None = None,
+                size: int = 24,
+                bold: bool = False,
+                antialias: bool = True) -> pygame.Surface:
+    key = (text, font, size, bold, tuple(color), antialias)
+    surface = _rendered.get(key)
+    if surface is not None:
+        _rendered.move_to_end(key)
+        return surface
+    surface = get_font(font, size, bold).render(text, antialias, color)
+    _rendered[key] = surface
+    if len(_rendered) > TEXT_CACHE_MAX_ENTRIES:
+        _rendered.popitem(last=False)
+    return surface
+
+
+class GlyphAtlas:
+    """All the glyphs of charset rendered side by side into one surface."""
+
+    def __init__(self, font_obj: pygame.font.Font, color: tuple, antialias: bool = True,
+                 charset: str = ATLAS_CHARSET):
+        self.font_obj = font_obj
+        self.color = color
+        self.antialias = antialias
+        glyphs = [(char, font_obj.render(char, antialias, color)) for char in charset]
+        width = sum(glyph.get_width() for _, glyph in glyphs)
+        height = max(glyph.get_height() for _, glyph in glyphs)
+        self.height = height
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.rects: dict[str, pygame.Rect] = {}
+        x = 0
+        for char, glyph in glyphs:
+            # BLEND_RGBA_MAX copies the glyph as it is, a normal alpha blit would darken the antialiased edges
+            self.surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.rects[char] = pygame.Rect(x, 0, glyph.get_width(), height)
+            x += glyph.get_width()
+
+    def __add_glyph(self, char: str) -> pygame.Rect:
+        """Characters outside of the charset are appended to the atlas the first time they are used."""
+        glyph = self.font_obj.render(char, self.antialias, self.color)
+        old = self.surface
+        x = old.get_width()
+        height = max(self.height, glyph.get_height())
+        self.surface = pygame.Surface((x + glyph.get_width(), height), pygame.SRCALPHA)
+        self.surface.blit(old, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        self.surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        self.height = height
+        rect = pygame.Rect(x, 0, glyph.get_width(), height)
+        self.rects[char] = rect
+        return rect
+
+    def size(self, text: str) -> tuple:
+        return (sum(self.rects[char].w if char in self.rects else 0 for char in text), self.height)
+
+    def draw(self, surface: pygame.Surface, text: str, topleft: tuple) -> pygame.Rect:
+        x, y = topleft
+        blits = []
+        for char in text:
+            rect = self.rects.get(char)
+            if rect is None:
+                rect = self.__add_glyph(char)
+            blits.append((self.surface, (x, y), rect))
+            x += rect.w
+        surface.blits(blits, doreturn=False)
+        return pygame.Rect(topleft[0], y, x - topleft[0], self.height)
+
+
+def get_atlas(color: tuple,
+              font: str | None = None,
+              size: int = 24,
+              bold: bool = False,
+              antialias: bool = True) -> GlyphAtlas:
+    key = (font, size, bold, tuple(color), antialias)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = GlyphAtlas(get_font(font, size, bold), color, antialias)
+        _atlases[key] = atlas
+    return atlas
+
+
+def clear():
+    _fonts.clear()
+    _rendered.clear()
+    _atlases.clear()
@@ -0,0 +1,113 @@
+import json
+import os
+import queue
+import threading
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+from src.event_bus import BRICK_DESTROYED, POWER_COLLECTED, BALL_LOST, LEVEL_CLEARED
+from src.game_configs import TRACE_FLUSH_EVENTS
+from src.log_handle import get_logger
+
+logger = get_logger(__name__)
+
+"""Chrome trace event export (chrome://tracing, https://ui.perfetto.dev). A session traced with --trace PATH has one
+span per frame, the phases timed by the FrameProfiler nested inside it, level loads, and instant events for bricks
+breaking, powers collected, balls lost and levels cleared.
+
+The game thread only appends tuples to a list. Every TRACE_FLUSH_EVENTS events the list is handed to a writer thread,
+which formats the json and writes it, so tracing costs the frame a list append per span. The file is a json array,
+close writes the closing bracket. A trace cut short by a crash is still accepted by the viewers.
+"""
+
+GAME_EVENTS = (BRICK_DESTROYED, POWER_COLLECTED, BALL_LOST, LEVEL_CLEARED)
+
+
+class Tracer:
+    def __init__(self, path: str, flush_events: int=TRACE_FLUSH_EVENTS):
+        self.path = path
+        self.flush_events = flush_events
+        self.origin = perf_counter()
+        self.pid = os.getpid()
+        self._buffer: list[tuple] = []
+        self._queue: queue.Queue = queue.Queue()
+        self._fp = open(path, "w")
+        self._fp.write("[")
+        self._first = True
+        self._writer = threading.Thread(target=self.__write_loop, name="trace-writer", daemon=True)
+        self._writer.start()
+
+    def complete(self, name: str, start: float, end: float, args: dict | None=None):
+        """A span from start to end, both perf_counter readings."""
+        self._buffer.append(("X", name, start, end - start, args))
+        if len(self._buffer) >= self.flush_events:
+            self.flush()
+
+    def instant(self, name: str, args: dict | None=None):
+        self._buffer.append(("i", name, perf_counter(), 0.0, args))
+        if len(self._buffer) >= self.flush_events:
+            self.flush()
+
+    @contextmanager
+    def span(self, name: str, **args):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, start, perf_counter(), args or None)
+
+    def subscribe(self, events):
+        """Instant events for the game events, they are recorded when the bus dispatches them."""
+        for event_type in GAME_EVENTS:
+            events.subscribe(event_type, lambda event_type=event_type, **payload:
+                             self.instant(event_type, self.__describe(payload)))
+
+    @staticmethod
+    def __describe(payload: dict) -> dict | None:
+        """json friendly args, sprites are replaced by their position."""
+        args = {}
+        for key, value in payload.items():
+            rect = getattr(value, "rect", None)
+            args[key] = list(rect.topleft) if rect is not None else value
+        return args or None
+
+    def flush(self):
+        if self._buffer:
+            self._queue.put(self._buffer)
+            self._buffer = []
+
+    def __format(self, record: tuple) -> str:
+        phase, name, start, duration, args = record
+        event = {"name": name, "ph": phase, "pid": self.pid, "tid": 0, "ts": (start - self.origin) * 1e6}
+        if phase == "X":
+            event["dur"] = duration * 1e6
+        else:
+            event["s"] = "t"
+        if args:
+            event["args"] = args
+        return json.dumps(event, separators=(",", ":"), default=str)
+
+    def __write_loop(self):
+        while True:
+            records = self._queue.get()
+            if records is None:
+                return
+            lines = [self.__format(record) for record in records]
+            prefix = "\n" if self._first else ",\n"
+            self._first = False
+            self._fp.write(prefix + ",\n".join(lines))
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+        self._fp.write("\n]\n")
+        self._fp.close()
+        logger.info(f"Trace written to {self.path}")
+
+
+def trace_span(game_state, name: str, **args):
+    """tracer.span when the session is traced, a no op context otherwise."""
+    if game_state.tracer is None:
+        return nullcontext()
+    return game_state.tracer.span(name, **args)
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# assets are loaded from paths relative to the repository root
+os.chdir(ROOT)
+
+from src.game_run import GameRunner  # noqa: E402
+from src.level_handler import LevelManager  # noqa: E402
+from src.level_pack import compile_level  # noqa: E402
+
+
+def level_json(matrix: list[list[str]], double_hit_tiles: list | None=None) -> dict:
+    rows, cols = len(matrix), max(len(row) for row in matrix)
+    return {"matrix": matrix,
+            "num_powers": 0, "num_cols": cols, "num_rows": rows,
+            "double_hit_tiles": double_hit_tiles or [], "background_music": None, "background_image": None,
+            "tiles_offsets": {"x": 0.4, "y": 0.3},
+            "tiles_dims": {"width": 0.1, "height": 0.04}}
+
+
+def load_level_json(runner: GameRunner, level: dict):
+    """start_game for a level that is not a file in assets/levels."""
+    game_state = runner._game_state
+    game_state.current_screen = "game"
+    handle = game_state.game_handle
+    handle.level = LevelManager(game_state)
+    handle.level.load_compiled = lambda: compile_level(level)
+    handle.level.load_level()
+
+
+@pytest.fixture
+def runner() -> GameRunner:
+    return GameRunner(headless=True, resolution=(1280, 720), seed=1, prefetch=False)
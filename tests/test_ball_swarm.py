@@ -0,0 +1,59 @@
+import math
+
+import pytest
+
+from src.event_bus import BALL_HIT, BALL_LOST
+from src.game_run import GameRunner, SIM_DT
+from src.sprite_engine.ball import ball_pool
+
+BALLS = 16
+TICKS = 600
+
+
+def play(vectorised: bool) -> tuple[list, dict]:
+    """Plays level 1 with BALLS balls leaving the bat at spread out angles and the bat standing still, returns the
+    ball positions after every tick and the brick hits and lost balls."""
+    runner = GameRunner(headless=True, resolution=(1280, 720), seed=1, prefetch=False, physics="hand",
+                        vectorised_balls=vectorised)
+    game_state = runner._game_state
+    runner.start_game(1)
+    group = game_state.ball_sprite_group
+    first = next(iter(group))
+    for _ in range(BALLS - 1):
+        group.add(ball_pool.acquire((first.rect.centerx, first.rect.centery, first.rect.w / 2), game_state))
+    for idx, ball in enumerate(group):
+        angle = math.radians(-60 + 120 * idx / (BALLS - 1))
+        ball.is_sticky = False
+        ball.velocity.x = ball.velocity.speed * math.sin(angle)
+        ball.velocity.y = -ball.velocity.speed * math.cos(angle)
+    if vectorised:
+        group.invalidate()
+
+    counts = {"brick": 0, "lost": 0}
+
+    def on_hit(surface: str):
+        # the swarm sends one wall and one paddle hit per tick whatever the number of balls, bricks are per ball
+        if surface == "brick":
+            counts["brick"] += 1
+
+    def on_lost():
+        counts["lost"] += 1
+    game_state.events.subscribe(BALL_HIT, on_hit)
+    game_state.events.subscribe(BALL_LOST, on_lost)
+    positions = []
+    for _ in range(TICKS):
+        runner.simulation_step(SIM_DT)
+        game_state.events.dispatch()
+        positions.append([tuple(ball.pos) for ball in game_state.ball_sprite_group])
+    return positions, counts
+
+
+def test_vectorised_balls_play_like_the_sprite_group():
+    plain_positions, plain_counts = play(vectorised=False)
+    swarm_positions, swarm_counts = play(vectorised=True)
+    assert plain_counts["brick"] > 0 and plain_counts["lost"] > 0
+    assert swarm_counts == plain_counts
+    for tick, (plain, swarm) in enumerate(zip(plain_positions, swarm_positions)):
+        assert len(swarm) == len(plain), f"tick {tick}"
+        for plain_pos, swarm_pos in zip(plain, swarm):
+            assert swarm_pos == pytest.approx(plain_pos, abs=1e-6), f"tick {tick}"
@@ -0,0 +1,119 @@
+import math
+import random
+
+import pygame
+import pytest
+
+from src.event_bus import BALL_HIT
+from src.sprite_engine.collision import sweep_circle_rect, reflect
+from conftest import level_json, load_level_json
+
+RECT = pygame.Rect(100, 100, 60, 20)
+STEPS = 1000
+
+
+def gap(px: float, py: float, r: float, rect) -> float:
+    """Distance from the circle to the rect, negative when they overlap."""
+    closest_x = min(max(px, rect.left), rect.right)
+    closest_y = min(max(py, rect.top), rect.bottom)
+    return math.hypot(px - closest_x, py - closest_y) - r
+
+
+def sampled(px: float, py: float, r: float, dx: float, dy: float, rect) -> tuple[float | None, float]:
+    """Brute force: the first sampled t where the circle overlaps rect and the smallest gap along the path."""
+    smallest = math.inf
+    for step in range(STEPS + 1):
+        t = step / STEPS
+        current = gap(px + dx * t, py + dy * t, r, rect)
+        if current < 0:
+            return t, current
+        smallest = min(smallest, current)
+    return None, smallest
+
+
+def test_sweep_matches_sampled_overlap():
+    rng = random.Random(7)
+    checked = hits = 0
+    while checked < 600:
+        px, py = rng.uniform(40, 220), rng.uniform(40, 180)
+        r = rng.uniform(2, 12)
+        dx, dy = rng.uniform(-150, 150), rng.uniform(-150, 150)
+        if gap(px, py, r, RECT) <= 0:
+            continue
+        checked += 1
+        first, smallest = sampled(px, py, r, dx, dy, RECT)
+        hit = sweep_circle_rect(px, py, r, dx, dy, RECT)
+        if hit is None:
+            assert first is None, (px, py, r, dx, dy)
+            continue
+        t, nx, ny = hit
+        hits += 1
+        cx, cy = px + dx * t, py + dy * t
+        assert gap(cx, cy, r, RECT) == pytest.approx(0, abs=1e-6)
+        if first is None:
+            # grazed the rect between two samples
+            assert smallest < 0.25
+        else:
+            assert first - 1 / STEPS <= t <= first
+        # the normal points from the touched point of the rect to the center, against the motion
+        closest_x = min(max(cx, RECT.left), RECT.right)
+        closest_y = min(max(cy, RECT.top), RECT.bottom)
+        assert (nx, ny) == pytest.approx(((cx - closest_x) / r, (cy - closest_y) / r), abs=1e-6)
+        assert dx * nx + dy * ny < 0
+    assert hits > 50
+
+
+@pytest.mark.parametrize("start, move, normal", [
+    ((80, 110), (30, 0), (-1, 0)),
+    ((180, 110), (-30, 0), (1, 0)),
+    ((130, 80), (0, 30), (0, -1)),
+    ((130, 140), (0, -30), (0, 1)),
+])
+def test_face_normals(start, move, normal):
+    t, nx, ny = sweep_circle_rect(*start, 5, *move, RECT)
+    assert (nx, ny) == pytest.approx(normal)
+    assert t == pytest.approx(15 / 30)
+
+
+def test_corner_normal():
+    # heading straight at the top left corner along the diagonal
+    px, py = RECT.left - 20, RECT.top - 20
+    t, nx, ny = sweep_circle_rect(px, py, 5, 20, 20, RECT)
+    assert (nx, ny) == pytest.approx((-math.sqrt(0.5), -math.sqrt(0.5)))
+    assert t == pytest.approx((20 * math.sqrt(2) - 5) / (20 * math.sqrt(2)))
+
+
+def test_start_overlapping():
+    # the circle pokes 2 pixels into the top face
+    assert sweep_circle_rect(130, RECT.top - 3, 5, 0, 10, RECT) == pytest.approx((0, 0, -1))
+    assert sweep_circle_rect(130, RECT.top - 3, 5, 0, -10, RECT) is None
+    # center inside the rect, pushed out through the nearest face
+    assert sweep_circle_rect(130, RECT.bottom - 2, 5, 0, -10, RECT) == pytest.approx((0, 0, 1))
+
+
+def test_reflect():
+    assert reflect(3, 4, 0, -1) == pytest.approx((3, -4))
+    assert reflect(3, 4, -1, 0) == pytest.approx((-3, 4))
+    vx, vy = reflect(3, 4, -math.sqrt(0.5), -math.sqrt(0.5))
+    assert (vx, vy) == pytest.approx((-4, -3))
+
+
+def test_fast_ball_does_not_tunnel(runner):
+    # a second brick far away keeps the level from being cleared
+    load_level_json(runner, level_json([["blue", "", "", "blue"]]))
+    game_state = runner._game_state
+    brick = game_state.tiles_group.sprites()[0]
+    ball = next(iter(game_state.ball_sprite_group))
+    game_state.events.clear()
+    hits = []
+    game_state.events.subscribe(BALL_HIT, lambda surface: hits.append(surface))
+    radius = ball.rect.w / 2
+    ball.set_position(brick.rect.centerx - radius, brick.rect.bottom + 40)
+    ball.velocity.x, ball.velocity.y = 0, -1
+    # one tick long enough to jump over the whole brick
+    ball.tiles_collision(0, -(40 + brick.rect.h + radius * 4 + 100))
+    game_state.events.dispatch()
+    assert brick.hits_to_break == 0
+    assert hits == ["brick"]
+    assert ball.velocity.y > 0
+    assert ball.pos[1] > brick.rect.bottom
@@ -0,0 +1,83 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import src.level_pack as level_pack_module
+from src.level_pack import LevelError, LevelPack, compile_level, compile_pack, level_pack
+from conftest import level_json
+
+
+@pytest.fixture
+def levels(tmp_path, monkeypatch):
+    """A levels directory with a copy of level 1 and a small level 2, and no pack loaded yet."""
+    monkeypatch.setattr(level_pack_module, "_pack", None)
+    levels_path = tmp_path / "levels"
+    levels_path.mkdir()
+    shutil.copy("assets/levels/level1.json", levels_path / "level1.json")
+    write_level(levels_path / "level2.json", level_json([["blue", "red", ""], ["", "green", "blue"]], [[0, 1]]))
+    return levels_path
+
+
+def write_level(path, level: dict):
+    with open(path, "w") as fp:
+        json.dump(level, fp)
+
+
+def test_pack_round_trip(levels, tmp_path):
+    pack_path = str(tmp_path / "levels.pack")
+    manifest = compile_pack(str(levels), pack_path)
+    pack = LevelPack(pack_path)
+    assert pack.manifest == manifest
+    assert pack.levels() == [1, 2]
+    for level in pack.levels():
+        with open(levels / f"level{level}.json") as fp:
+            expected = compile_level(json.load(fp))
+        packed = pack.get(level)
+        assert packed.meta == expected.meta
+        assert bytes(packed.bricks) == expected.bricks
+        assert bytes(packed.double_hits) == expected.double_hits
+        assert packed.assets() == expected.assets()
+    level2 = pack.get(2)
+    assert [[level2.cell(row, col) for col in range(3)] for row in range(2)] == [["blue", "red", None],
+                                                                                [None, "green", "blue"]]
+    with pytest.raises(FileNotFoundError):
+        pack.get(3)
+    pack.close()
+
+
+def test_edited_json_rebuilds_the_pack(levels, tmp_path):
+    pack_path = str(tmp_path / "levels.pack")
+    pack = level_pack(str(levels), pack_path)
+    assert pack.get(2).cell(0, 0) == "blue"
+    assert level_pack(str(levels), pack_path) is pack
+
+    path = levels / "level2.json"
+    write_level(path, level_json([["red", "red", ""], ["", "green", "blue"]], [[0, 1]]))
+    stat = os.stat(path)
+    # same size, only the mtime tells the edit apart
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    rebuilt = level_pack(str(levels), pack_path)
+    assert rebuilt is not pack
+    assert rebuilt.get(2).cell(0, 0) == "red"
+    assert LevelPack(pack_path).manifest == level_pack_module.source_manifest(str(levels))
+
+
+def test_double_hit_bits(levels, tmp_path):
+    cells = [[0, 0], [1, 2], [2, 4]]
+    write_level(levels / "level3.json", level_json([["blue"] * 5 for _ in range(3)], cells))
+    pack_path = str(tmp_path / "levels.pack")
+    compile_pack(str(levels), pack_path)
+    level = LevelPack(pack_path).get(3)
+    assert len(level.double_hits) == 2
+    found = [[row, col] for row in range(3) for col in range(5) if level.is_double_hit(row, col)]
+    assert found == cells
+
+
+def test_unknown_tile(levels, tmp_path):
+    with pytest.raises(LevelError, match="unknown tile 'plaid' at 1, 0"):
+        compile_level(level_json([["blue"], ["plaid"]]))
+    write_level(levels / "level3.json", level_json([["plaid"]]))
+    with pytest.raises(LevelError, match="level3.json"):
+        compile_pack(str(levels), str(tmp_path / "levels.pack"))